@@ -0,0 +1,52 @@
+# ./benchmarks/bench_adapter_registry.py
+"""Per-call adapter overhead: build-and-close per call vs. the pooled registry.
+
+No network traffic is made; only client construction/teardown is measured.
+
+    python benchmarks/bench_adapter_registry.py --calls 500
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import click
+
+from langops.llm.registry import aclose_adapters, build_adapter, get_adapter
+
+PROVIDER = "anthropic"
+MODEL = "claude-sonnet-4-20250514"
+API_KEY = "bench-not-a-real-key"
+
+
+async def _per_call(calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        adapter = build_adapter(PROVIDER, MODEL, api_key=API_KEY)
+        await adapter.aclose()
+    return time.perf_counter() - start
+
+
+async def _pooled(calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        get_adapter(PROVIDER, MODEL, api_key=API_KEY)
+    elapsed = time.perf_counter() - start
+    await aclose_adapters()
+    return elapsed
+
+
+@click.command()
+@click.option("--calls", default=500, show_default=True, help="Calls per mode")
+def main(calls: int) -> None:
+    per_call = asyncio.run(_per_call(calls))
+    pooled = asyncio.run(_pooled(calls))
+    click.echo(f"calls={calls}")
+    click.echo(f"per-call construction: {per_call / calls * 1e6:10.1f} us/call")
+    click.echo(f"pooled registry:       {pooled / calls * 1e6:10.1f} us/call")
+    click.echo(f"speed-up:              {per_call / max(pooled, 1e-9):10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# ./benchmarks/bench_segmentation.py
+"""Segmentation throughput per backend: in-process vs. the process pool.
+
+Uses a synthetic corpus; the stanza backend needs its English model installed.
+
+    python benchmarks/bench_segmentation.py --docs 200 --backend regex nltk
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+
+import click
+
+from langops.tasks.doc_sentence_splitter import SegmentationService, get_segmenter
+
+WORDS = (
+    "the market grew 2.5 percent in Q3 while Dr. Smith noted demand for energy "
+    "remained strong across the U.S. and Europe despite higher rates"
+).split()
+
+
+def _corpus(docs: int, sentences: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+
+    def sentence() -> str:
+        return " ".join(rng.choices(WORDS, k=rng.randint(8, 24))).capitalize() + "."
+
+    return [" ".join(sentence() for _ in range(sentences)) for _ in range(docs)]
+
+
+def _inline(backend: str, texts: list[str]) -> tuple[float, int]:
+    segmenter = get_segmenter(backend)
+    start = time.perf_counter()
+    n = sum(len(segmenter.split(t)) for t in texts)
+    return time.perf_counter() - start, n
+
+
+async def _pooled(
+    backend: str, texts: list[str], workers: int | None, chunk_chars: int
+) -> tuple[float, int]:
+    with SegmentationService(backend, workers, chunk_chars, inline_chars=0) as svc:
+        await svc.split("Warm up the pool.")
+        start = time.perf_counter()
+        results = await svc.split_many(texts)
+        elapsed = time.perf_counter() - start
+    return elapsed, sum(map(len, results))
+
+
+@click.command()
+@click.option("--docs", default=200, show_default=True)
+@click.option("--sentences", default=500, show_default=True, help="Per document")
+@click.option("--backend", "backends", multiple=True, default=["regex", "nltk"])
+@click.option("--workers", type=int, default=None, help="Pool size [cpu count]")
+@click.option("--chunk-chars", default=200_000, show_default=True)
+def main(
+    docs: int,
+    sentences: int,
+    backends: tuple[str, ...],
+    workers: int | None,
+    chunk_chars: int,
+) -> None:
+    texts = _corpus(docs, sentences)
+    mb = sum(map(len, texts)) / 1e6
+    click.echo(f"{docs} docs, {mb:.1f} MB")
+    for backend in backends:
+        for mode in ("inline", "pool"):
+            if mode == "inline":
+                elapsed, n = _inline(backend, texts)
+            else:
+                elapsed, n = asyncio.run(_pooled(backend, texts, workers, chunk_chars))
+            click.echo(
+                f"{backend:7s} {mode:6s} {elapsed:7.2f}s "
+                f"{mb / elapsed:7.2f} MB/s {n / elapsed:10.0f} sentences/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
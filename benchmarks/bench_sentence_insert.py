@@ -0,0 +1,94 @@
+# ./benchmarks/bench_sentence_insert.py
+"""Sentence persistence: per-row create()+flush vs. bulk_insert_sentences().
+
+Runs against a throw-away SQLite file with a synthetic corpus.
+
+    python benchmarks/bench_sentence_insert.py --docs 4 --sentences 5000
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import click
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from langops.persistence.models.document import DocumentEntity, DocumentType
+from langops.persistence.models.sentence import SentenceType
+from langops.persistence.repository.sentence_repo import SentenceRepository
+
+WORDS = "market growth energy report demand policy rate quarter price supply".split()
+
+
+def _corpus(n: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choices(WORDS, k=rng.randint(6, 18))).capitalize() + "."
+        for _ in range(n)
+    ]
+
+
+async def _run(mode: str, docs: int, sentences: int, chunk_size: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'b.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        Session = async_sessionmaker(engine, class_=AsyncSession)
+        repo = SentenceRepository()
+
+        doc_ids = []
+        async with Session() as session:
+            for i in range(docs):
+                doc = DocumentEntity(
+                    title=f"doc{i}", content="-", doc_type=DocumentType.OTHER
+                )
+                session.add(doc)
+                await session.flush()
+                doc_ids.append(doc.id)
+            await session.commit()
+
+        start = time.perf_counter()
+        for i, doc_id in enumerate(doc_ids):
+            texts = _corpus(sentences, seed=i)
+            async with Session() as session:
+                if mode == "per-row":
+                    for text in texts:
+                        entity = repo.entity(
+                            sentence_type=SentenceType.OTHER,
+                            text=text,
+                            text_hash=repo.compute_hash(text),
+                            doc_id=doc_id,
+                        )
+                        await repo.create(session, entity)
+                else:
+                    await repo.bulk_insert_sentences(
+                        session, doc_id, texts, chunk_size=chunk_size
+                    )
+                await session.commit()
+        elapsed = time.perf_counter() - start
+        await engine.dispose()
+        return elapsed
+
+
+@click.command()
+@click.option("--docs", default=4, show_default=True)
+@click.option("--sentences", default=5000, show_default=True, help="Per document")
+@click.option("--chunk-size", default=500, show_default=True)
+def main(docs: int, sentences: int, chunk_size: int) -> None:
+    total = docs * sentences
+    for mode in ("per-row", "bulk"):
+        elapsed = asyncio.run(_run(mode, docs, sentences, chunk_size))
+        click.echo(
+            f"{mode:8s} {total} sentences in {elapsed:7.2f}s "
+            f"({total / elapsed:10.0f} rows/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# ./benchmarks/bench_unprocessed_scan.py
+"""Streaming the unprocessed-sentence backlog with keyset pagination.
+
+Fills a throw-away SQLite file with --rows sentences, marks every other one
+as analysed, then streams the rest with iter_unprocessed(). Reports time per
+page at the head and tail of the scan and the peak Python memory.
+
+    python benchmarks/bench_unprocessed_scan.py --rows 1000000 --page-size 1000
+"""
+
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import click
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from langops.persistence.models.document import DocumentEntity, DocumentType
+from langops.persistence.models.sentence import SentimentLabel
+from langops.persistence.repository.sentence_repo import SentenceRepository
+from langops.persistence.repository.sentence_sentiment_repo import (
+    SentenceSentimentRepository,
+)
+
+
+async def _fill(Session, rows: int) -> None:
+    sentences, sentiments = SentenceRepository(), SentenceSentimentRepository()
+    async with Session() as session:
+        doc = DocumentEntity(title="bench", content="-", doc_type=DocumentType.OTHER)
+        session.add(doc)
+        await session.flush()
+        batch = 50_000
+        for start in range(1, rows + 1, batch):
+            ids = range(start, min(start + batch, rows + 1))
+            await sentences.insert_many(
+                session,
+                [
+                    {"id": i, "doc_id": doc.id, "text": f"s{i}", "text_hash": str(i)}
+                    for i in ids
+                ],
+                chunk_size=batch,
+            )
+            await sentiments.insert_many(
+                session,
+                [
+                    {"sentence_id": i, "sentiment": SentimentLabel.NEUTRAL}
+                    for i in ids
+                    if i % 2 == 0
+                ],
+                chunk_size=batch,
+            )
+        await session.commit()
+
+
+async def _run(rows: int, page_size: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'b.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        Session = async_sessionmaker(engine, class_=AsyncSession)
+
+        start = time.perf_counter()
+        await _fill(Session, rows)
+        click.echo(f"filled {rows} rows in {time.perf_counter() - start:.1f}s")
+
+        page_times: list[float] = []
+        streamed = 0
+        tracemalloc.start()
+        start = time.perf_counter()
+        async with Session() as session:
+            pages = SentenceSentimentRepository.iter_unprocessed(session, page_size)
+            tick = time.perf_counter()
+            async for page in pages:
+                streamed += len(page)
+                now = time.perf_counter()
+                page_times.append(now - tick)
+                tick = now
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        await engine.dispose()
+
+    head = sum(page_times[:10]) / min(10, len(page_times))
+    tail = sum(page_times[-10:]) / min(10, len(page_times))
+    click.echo(
+        f"streamed {streamed} rows in {len(page_times)} pages, {elapsed:.2f}s "
+        f"({streamed / elapsed:.0f} rows/s)"
+    )
+    click.echo(f"page latency head {head * 1e3:.1f} ms, tail {tail * 1e3:.1f} ms")
+    click.echo(f"peak traced memory {peak / 1e6:.1f} MB")
+
+
+@click.command()
+@click.option("--rows", default=200_000, show_default=True)
+@click.option("--page-size", default=1000, show_default=True)
+def main(rows: int, page_size: int) -> None:
+    asyncio.run(_run(rows, page_size))
+
+
+if __name__ == "__main__":
+    main()
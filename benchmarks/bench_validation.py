@@ -0,0 +1,50 @@
+# ./benchmarks/bench_validation.py
+"""Structured-output validation: the old guard + client path vs. one cached pass.
+
+The old path parsed the JSON, validated it, re-serialized it in the guard
+and then parsed and validated it again in LLMClient.
+
+    python benchmarks/bench_validation.py --n 50000
+"""
+
+from __future__ import annotations
+
+import json
+import time
+
+import click
+
+from langops.llm.validation import get_validator
+from langops.persistence.models.sentence import SentenceSentimentResponseModel
+
+MODEL = SentenceSentimentResponseModel
+TEXT = '{"sentiment": "positive", "sentiment_confidence": 0.93}'
+
+
+def _old(text: str) -> object:
+    # guard_output: parse, validate, re-serialize
+    obj = MODEL(**json.loads(text))
+    text = obj.model_dump_json()
+    # LLMClient._extract_json_dict + model(**parsed)
+    return MODEL(**json.loads(text))
+
+
+def _run(label: str, fn, payload, n: int) -> None:
+    start = time.perf_counter()
+    for _ in range(n):
+        fn(payload)
+    elapsed = time.perf_counter() - start
+    click.echo(f"{label:22s} {n} in {elapsed:6.3f}s ({n / elapsed:10.0f} /s)")
+
+
+@click.command()
+@click.option("--n", default=50_000, show_default=True)
+def main(n: int) -> None:
+    validator = get_validator(MODEL)
+    _run("old guard + client", _old, TEXT, n)
+    _run("cached, JSON text", validator.validate, TEXT, n)
+    _run("cached, tool-use dict", validator.validate, json.loads(TEXT), n)
+
+
+if __name__ == "__main__":
+    main()
@@ -25,14 +25,41 @@ class Settings(BaseSettings):
         alias="LANGFUSE_SECRET_KEY", default=None
     )
 
+    # Telemetry sinks (Mongo/Langfuse hooks write in the background)
+    telemetry_queue_size: int = Field(alias="TELEMETRY_QUEUE_SIZE", default=10_000)
+    telemetry_batch_size: int = Field(alias="TELEMETRY_BATCH_SIZE", default=100)
+    telemetry_flush_interval: float = Field(
+        alias="TELEMETRY_FLUSH_INTERVAL", default=1.0
+    )
+    # block | drop | spill
+    telemetry_overflow: str = Field(alias="TELEMETRY_OVERFLOW", default="block")
+    telemetry_spill_dir: str = Field(
+        alias="TELEMETRY_SPILL_DIR", default="./cache/telemetry"
+    )
+
     # NoSQL - MongoDB
     mongo_uri: str = Field(alias="MONGO_URI_DEV")
     mongo_db: str = Field(alias="MONGO_DB_LLM_DEV")
+    # write concern of the audit writer: w is a node count or "majority"
+    mongo_write_w: str = Field(alias="MONGO_WRITE_W", default="1")
+    mongo_write_journal: bool = Field(alias="MONGO_WRITE_JOURNAL", default=False)
 
     # SQL - SQLite (for dev)
     database_url: str = Field(
         alias="DATABASE_URL", default="sqlite+aiosqlite:///./app.db"
     )
+    # SQLite writes go through one group-committing writer connection
+    sqlite_write_behind: bool = Field(alias="SQLITE_WRITE_BEHIND", default=True)
+    write_batch_rows: int = Field(alias="WRITE_BATCH_ROWS", default=500)
+    write_batch_ms: float = Field(alias="WRITE_BATCH_MS", default=20.0)
+
+    # LLM response cache (enabled per profile via `llm_cache`)
+    llm_cache_dir: str = Field(alias="LLM_CACHE_DIR", default="./cache/llm")
+    llm_cache_max_entries: int = Field(alias="LLM_CACHE_MAX_ENTRIES", default=1024)
+    llm_cache_size_limit_mb: int = Field(alias="LLM_CACHE_SIZE_LIMIT_MB", default=512)
+    llm_cache_ttl_seconds: Optional[float] = Field(
+        alias="LLM_CACHE_TTL_SECONDS", default=7 * 24 * 3600
+    )
 
 
 settings = Settings()
@@ -1,11 +1,18 @@
 # llm/hooks/__init__.py
 from __future__ import annotations
 
-from .guard import guard_output
-from .langfuse import langfuse_track
-from .log import log_request
-from .mongo import mongo_insert
-from .persist import persist_sql
+import importlib
+from typing import Any
+
+# hook -> defining module; imported on first access so a profile only pays
+# for the SDKs (Langfuse, Motor, ...) of the hooks it uses
+_HOOKS = {
+    "log_request": ".log",
+    "mongo_insert": ".mongo",
+    "langfuse_track": ".langfuse",
+    "guard_output": ".guard",
+    "persist_sql": ".persist",
+}
 
 __all__ = [
     "log_request",
@@ -14,3 +21,15 @@ __all__ = [
     "guard_output",
     "persist_sql",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _HOOKS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
+
+
+def __dir__() -> list[str]:
+    # lets profile validation check hook names without importing them
+    return sorted(set(globals()) | set(__all__))
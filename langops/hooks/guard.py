@@ -4,11 +4,12 @@ from __future__ import annotations
 import json
 from typing import Any
 
-from guardrails import Guard
 from loguru import logger
-from pydantic import BaseModel
+from pydantic import ValidationError
 
 from langops.hooks.payload import LLMHookPayload
+from langops.hooks.runner import hook_spec
+from langops.llm.validation import get_validator, response_content
 
 
 # TODO: Make this adaptor agnostic!
@@ -32,56 +33,49 @@ def _set_text(response: dict[str, Any], text: str, kind: str) -> None:
         response["content"] = text
 
 
+@hook_spec(mutates=True)
 async def guard_output(payload: LLMHookPayload) -> None:
+    """Ensure the payload holds a validated instance of its output model.
+
+    LLMClient validates (and if needed repairs) every response in one pass,
+    so its payloads return immediately. Other payloads go through the same
+    cached validator, for JSON text as well as tool-use dict content.
+    """
     if not payload.response_llm:
         return
 
     response = payload.response_llm
-    raw_text, kind = _extract_text(response)
-    if not raw_text:
-        return
-
     output_model = payload.llm_output_model
 
-    if (
-        output_model
-        and isinstance(output_model, type)
-        and issubclass(output_model, BaseModel)
-    ):
-        # 1) Try JSON parse + Pydantic validation first
+    if output_model is None:
+        # No model provided: only normalize valid JSON
+        raw_text, kind = _extract_text(response)
+        if not raw_text:
+            return
         try:
             data = json.loads(raw_text)
-            obj = output_model(**data)  # validate against schema
-            repaired = obj.model_dump_json()
-            _set_text(response, repaired, kind)
-            logger.info("Pydantic validation succeeded")
-            return
-        except Exception:
-            pass
-
-        # 2) Use Guardrails to repair to the model schema
-        guard = Guard.for_pydantic(output_model)
-        result = guard.parse(raw_text, reask_on_fail=False)
-        validated = result.validated_output
-
-        if isinstance(validated, BaseModel):
-            repaired = validated.model_dump_json()
-        elif isinstance(validated, (dict, list)):
-            repaired = json.dumps(validated, ensure_ascii=False)
-        elif isinstance(validated, str) and validated.strip().startswith("{"):
-            repaired = validated
-        else:
-            logger.warning("Guardrails returned non-JSON; leaving original text")
+        except ValueError:
             return
+        _set_text(response, json.dumps(data, ensure_ascii=False), kind)
+        logger.info("Response normalized to JSON")
+        return
 
-        _set_text(response, repaired, kind)
-        logger.info("Guardrails repair applied")
+    if isinstance(payload.response_llm_instance, output_model):
         return
 
-    # No model provided: only normalize valid JSON
     try:
-        data = json.loads(raw_text)
-        _set_text(response, json.dumps(data, ensure_ascii=False), kind)
-        logger.info("Response normalized to JSON")
-    except Exception:
+        instance, repaired = get_validator(output_model).validate_or_repair(
+            response_content(response)
+        )
+    except (ValidationError, TypeError) as e:
+        logger.warning(f"Guard could not validate {output_model.__name__}: {e}")
         return
+
+    payload.response_llm_instance = instance
+    if repaired:
+        repaired_json = instance.model_dump_json()
+        raw_text, kind = _extract_text(response)
+        if raw_text is not None:
+            _set_text(response, repaired_json, kind)
+        else:
+            response["content"] = instance.model_dump(mode="json")
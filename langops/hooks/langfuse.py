@@ -2,25 +2,44 @@
 from __future__ import annotations
 
 import json
-import time
+from functools import lru_cache
+from typing import Any
 
 from config import settings
 from langfuse import Langfuse
 from loguru import logger
 
 from langops.hooks.payload import LLMHookPayload
+from langops.hooks.runner import hook_spec
+from langops.hooks.sink import get_sink
+
+
+@lru_cache
+def get_langfuse_client() -> Langfuse:
+    # The SDK queues events and ships them from its own thread in batches of
+    # flush_at (or every flush_interval s); it flushes on interpreter exit.
+    return Langfuse(
+        host=settings.langfuse_host,
+        public_key=settings.langfuse_public_key,
+        secret_key=settings.langfuse_secret_key,
+        flush_at=settings.telemetry_batch_size,
+        flush_interval=settings.telemetry_flush_interval,
+    )
+
+
+async def _write_batch(events: list[dict[str, Any]]) -> None:
+    lf = get_langfuse_client()
+    for event in events:
+        # Create or link trace
+        lf.trace(**event["trace"])
+        # Create generation
+        lf.generation(**event["generation"])
+    logger.debug(f"Langfuse: queued {len(events)} trace(s)")
 
 
+@hook_spec(mutates=False)
 async def langfuse_track(payload: LLMHookPayload) -> None:
     try:
-        start_time = time.time()
-
-        lf = Langfuse(
-            host=settings.langfuse_host,
-            public_key=settings.langfuse_public_key,
-            secret_key=settings.langfuse_secret_key,
-        )
-
         input_text = payload.prompt
         operation_name = payload.operation_name
         response = payload.response_llm or {}
@@ -43,14 +62,38 @@ async def langfuse_track(payload: LLMHookPayload) -> None:
         output_tokens = (
             usage.get("output_tokens") or usage.get("completion_tokens") or 0
         )
+        # prompt-cache tokens, when the adapter reports them
+        cache_usage = {
+            key: usage[key]
+            for key in ("cache_creation_input_tokens", "cache_read_input_tokens")
+            if usage.get(key)
+        }
+
+        # Timing of the provider call itself, captured by LLMClient
+        start_time = payload.request_started_at
+        end_time = payload.request_ended_at
+        latency = (
+            (end_time - start_time).total_seconds() if start_time and end_time else None
+        )
 
         # Metadata
-        end_time = time.time()
         metadata = {
             "provider": payload.llm_provider,
             "model": payload.llm_model,
-            "latency_seconds": end_time - start_time,
-            "usage": {"input_tokens": input_tokens, "output_tokens": output_tokens},
+            "latency_seconds": latency,
+            "ttft_seconds": (
+                (payload.first_token_at - start_time).total_seconds()
+                if start_time and payload.first_token_at
+                else None
+            ),
+            "cache_hit": payload.cache_hit,
+            "usage": {
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                # a stream cut after the parsed object reports an estimate
+                "output_tokens_estimated": bool(usage.get("output_tokens_estimated")),
+                **cache_usage,
+            },
         }
 
         model = (payload.llm_model or "").strip().lower()
@@ -58,35 +101,40 @@ async def langfuse_track(payload: LLMHookPayload) -> None:
         trace_id = response["id"]
         logger.debug(f"Langfuse trace_id: {trace_id}")
 
-        # Create or link trace
-        lf.trace(
-            trace_id=trace_id,
-            name=operation_name,
-            input=input_text,
-            output=output_text,
-            usage={"input_tokens": input_tokens, "output_tokens": output_tokens},
-            metadata=metadata,
-        )
-
-        # Create generation
-        lf.generation(
-            trace_id=trace_id,
-            name=operation_name,
-            model=model,
-            input=input_text,
-            output=output_text,
-            usage_details={
-                "input": input_tokens,
-                "output": output_tokens,
+        event = {
+            "trace": {
+                "trace_id": trace_id,
+                "name": operation_name,
+                "input": input_text,
+                "output": output_text,
+                "usage": {
+                    "input_tokens": input_tokens,
+                    "output_tokens": output_tokens,
+                },
+                "metadata": metadata,
             },
-            status_message=response.get("stop_reason"),
-            start_time=start_time,
-            end_time=end_time,
-            input_tokens=input_tokens,
-            output_tokens=output_tokens,
-        )
+            "generation": {
+                "trace_id": trace_id,
+                "name": operation_name,
+                "model": model,
+                "input": input_text,
+                "output": output_text,
+                "usage_details": {
+                    "input": input_tokens,
+                    "output": output_tokens,
+                    **cache_usage,
+                },
+                "status_message": response.get("stop_reason"),
+                "start_time": start_time,
+                "completion_start_time": payload.first_token_at,
+                "end_time": end_time,
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+            },
+        }
 
-        lf.flush()
+        # emitted and flushed off the request path by the background sink
+        await get_sink("langfuse", _write_batch).put(event)
 
     except Exception as e:
         logger.error(f"Langfuse tracking failed: {e}")
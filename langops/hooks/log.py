@@ -4,8 +4,10 @@ from __future__ import annotations
 from loguru import logger
 
 from langops.hooks.payload import LLMHookPayload
+from langops.hooks.runner import hook_spec
 
 
+@hook_spec(mutates=False)
 async def log_request(payload: LLMHookPayload) -> None:
     """Log LLM request and response."""
     if not payload.response_llm:
@@ -1,54 +1,33 @@
 # ./llm/hooks/mongo.py
 from __future__ import annotations
 
-from datetime import datetime
-from functools import lru_cache
+import copy
+from datetime import datetime, timezone
 
-from config import settings
 from loguru import logger
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from pymongo import WriteConcern
 
 from langops.hooks.payload import LLMHookPayload
+from langops.hooks.runner import hook_spec
+from langops.hooks.sink import get_sink
+from langops.llm.db import get_db, get_mongo_client, write_audit_batch
 
-
-@lru_cache
-def get_mongo_client() -> AsyncIOMotorClient:
-    connection_string = settings.mongo_uri or "mongodb://localhost:27017"
-
-    client = AsyncIOMotorClient(
-        connection_string,
-        maxPoolSize=10,
-        minPoolSize=1,
-        serverSelectionTimeoutMS=5000,
-    )
-
-    return client
-
-
-def get_db(database_name: str | None = None) -> AsyncIOMotorDatabase:
-    db_name = database_name or settings.mongo_db or "llm_logs"
-    client = get_mongo_client()
-    return client[db_name]
+__all__ = ["get_db", "get_mongo_client", "mongo_insert"]
 
 
+@hook_spec(mutates=False)
 async def mongo_insert(payload: LLMHookPayload) -> None:
     if not payload.mongo_coll_name or not payload.response_llm:
         logger.debug("MongoDB hook skipped: missing collection name or response")
         return
 
     try:
-        db = get_db()
-        collection = db.get_collection(
-            payload.mongo_coll_name, write_concern=WriteConcern(w=1)
-        )
-
         doc = {
-            "timestamp": datetime.utcnow(),
+            "created_at": datetime.now(timezone.utc),
             "prompt": payload.prompt,
             "messages": payload.messages,
             "temperature": payload.temperature,
-            "response": payload.response_llm,
+            # snapshot: later hooks (guard) may rewrite the response in place
+            "response": copy.deepcopy(payload.response_llm),
             "operation": payload.operation_name,
             "llm_provider": payload.llm_provider,
             "llm_model": payload.llm_model,
@@ -60,8 +39,8 @@ async def mongo_insert(payload: LLMHookPayload) -> None:
         if payload.ref_id:
             doc["ref_id"] = payload.ref_id
 
-        await collection.insert_one(doc)
-        logger.debug(f"MongoDB: logged to {payload.mongo_coll_name}")
+        # written off the request path by the background sink
+        await get_sink("mongo", write_audit_batch).put((payload.mongo_coll_name, doc))
 
     except Exception as e:
         logger.error(f"MongoDB hook error: {e}")
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Any
 
 from pydantic import BaseModel, Field
@@ -32,6 +33,14 @@ class LLMHookPayload(BaseModel):
     response_llm: dict[str, Any] | None = None
     response_llm_parsed: dict[str, Any] | None = None
     response_llm_instance: BaseLLMResponseModel | None = None
+    cache_hit: bool = False
+    # wall-clock bounds of the provider call (adapter.send / batch job)
+    request_started_at: datetime | None = None
+    request_ended_at: datetime | None = None
+    # first streamed token, set when the client streams the response
+    first_token_at: datetime | None = None
+    # seconds spent per hook, filled by hooks.runner.fire_hooks
+    hook_timings: dict[str, float] = Field(default_factory=dict)
 
     class Config:
         arbitrary_types_allowed = True
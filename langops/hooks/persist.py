@@ -5,30 +5,31 @@ from __future__ import annotations
 from loguru import logger
 
 from langops.hooks.payload import LLMHookPayload
-from langops.persistence.session import get_async_session
+from langops.hooks.runner import hook_spec
+from langops.persistence.writer import run_write
 
 
+@hook_spec(mutates=False)
 async def persist_sql(payload: LLMHookPayload) -> None:
     if not payload.repo or not payload.text or not payload.response_llm:
         logger.debug("Persist hook skipped: missing required data")
         return
 
-    try:
-        async with get_async_session() as session:
-            await session.begin()
-
-            repo = payload.repo()
+    repo = payload.repo()
 
-            if payload.llm_output_model and repo:
-                await repo.upsert(
-                    session=session,
-                    sentence_id=payload.ref_id,
-                    text=payload.text,
-                    response_llm_instance=payload.response_llm_instance,
-                    persist_override=payload.persist_override,
-                )
+    async def _upsert(session) -> None:
+        await repo.upsert(
+            session=session,
+            sentence_id=payload.ref_id,
+            text=payload.text,
+            response_llm_instance=payload.response_llm_instance,
+            persist_override=payload.persist_override,
+        )
 
-            await session.commit()
+    try:
+        if payload.llm_output_model and repo:
+            # group-committed with concurrent calls on SQLite
+            await run_write(_upsert)
     except Exception as e:
         logger.exception(f"Error in persist hook: {e}")
         raise
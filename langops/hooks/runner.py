@@ -0,0 +1,108 @@
+# ./hooks/runner.py
+from __future__ import annotations
+
+import asyncio
+import inspect
+import time
+from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+import anyio
+from loguru import logger
+
+from langops.hooks.payload import LLMHookPayload
+
+Hook = Callable[[LLMHookPayload], Awaitable[None]]
+F = TypeVar("F", bound=Callable[..., Any])
+
+_TIMING_WINDOW = 1000
+_timings: dict[str, deque[float]] = defaultdict(lambda: deque(maxlen=_TIMING_WINDOW))
+
+
+def hook_spec(*, mutates: bool) -> Callable[[F], F]:
+    """Declare whether a hook mutates the payload or only observes it.
+
+    Observers next to each other in a hookset run concurrently; a mutating hook
+    is a barrier that waits for everything before it and runs alone.
+    """
+
+    def decorator(fn: F) -> F:
+        fn.__hook_mutates__ = mutates
+        return fn
+
+    return decorator
+
+
+def mutates_payload(hook: Hook) -> bool:
+    # undeclared hooks are assumed to mutate, i.e. keep the old serial ordering
+    return getattr(hook, "__hook_mutates__", True)
+
+
+def hook_name(hook: Hook) -> str:
+    return getattr(hook, "__name__", repr(hook))
+
+
+def plan_stages(hooks: list[Hook]) -> list[list[Hook]]:
+    """Group a hookset into stages that run one after another.
+
+    e.g. [mongo, langfuse, guard(mutates), persist] -> [[mongo, langfuse],
+    [guard], [persist]]
+    """
+    stages: list[list[Hook]] = []
+    observers: list[Hook] = []
+    for hook in hooks:
+        if mutates_payload(hook):
+            if observers:
+                stages.append(observers)
+                observers = []
+            stages.append([hook])
+        else:
+            observers.append(hook)
+    if observers:
+        stages.append(observers)
+    return stages
+
+
+async def _timed(hook: Hook, payload: LLMHookPayload) -> None:
+    name = hook_name(hook)
+    start = time.perf_counter()
+    try:
+        if inspect.iscoroutinefunction(hook):
+            await hook(payload)
+        else:
+            await anyio.to_thread.run_sync(hook, payload)
+    finally:
+        elapsed = time.perf_counter() - start
+        payload.hook_timings[name] = elapsed
+        _timings[name].append(elapsed)
+
+
+async def fire_hooks(hooks: list[Hook], payload: LLMHookPayload) -> None:
+    for stage in plan_stages(hooks):
+        if len(stage) == 1:
+            await _timed(stage[0], payload)
+        else:
+            await asyncio.gather(*(_timed(hook, payload) for hook in stage))
+
+    logger.debug(
+        "Hook timings: "
+        + ", ".join(f"{k}={v * 1000:.1f}ms" for k, v in payload.hook_timings.items())
+    )
+
+
+def hook_timing_summary() -> dict[str, dict[str, float]]:
+    """Latency per hook over the last calls: count, mean, p95 and max in ms."""
+    summary: dict[str, dict[str, float]] = {}
+    for name, samples in _timings.items():
+        if not samples:
+            continue
+        ordered = sorted(samples)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        summary[name] = {
+            "count": len(ordered),
+            "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2),
+            "p95_ms": round(p95 * 1000, 2),
+            "max_ms": round(ordered[-1] * 1000, 2),
+        }
+    return summary
@@ -0,0 +1,215 @@
+# ./hooks/sink.py
+from __future__ import annotations
+
+import asyncio
+import atexit
+import json
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from config import settings
+from loguru import logger
+
+Writer = Callable[[list[Any]], Awaitable[None]]
+
+OVERFLOW_POLICIES = ("block", "drop", "spill")
+
+_STOP = object()
+
+
+@dataclass
+class SinkStats:
+    enqueued: int = 0
+    written: int = 0
+    dropped: int = 0
+    spilled: int = 0
+    failed_batches: int = 0
+
+
+class BackgroundSink:
+    """Bounded queue drained by a background task that writes in batches.
+
+    Telemetry hooks put() records and return immediately; the drainer groups up
+    to ``max_batch`` records (or whatever arrived within ``flush_interval``
+    seconds) into one writer call. When the queue is full the overflow policy
+    decides: "block" applies backpressure to the caller, "drop" discards the
+    record, "spill" appends it to a JSONL file under ``spill_dir``. Whatever
+    the policy, records left over at shutdown are spilled, never dropped.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        writer: Writer,
+        *,
+        max_queue: int = 10_000,
+        max_batch: int = 100,
+        flush_interval: float = 1.0,
+        overflow: str = "block",
+        spill_dir: str | Path | None = None,
+    ) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.name = name
+        self.writer = writer
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.spill_path = Path(spill_dir or ".") / f"{name}.spill.jsonl"
+        self.stats = SinkStats()
+        self._queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=max_queue)
+        self._task: asyncio.Task | None = None
+        # batch taken off the queue but not yet written
+        self._inflight: list[Any] = []
+        self._closed = False
+
+    def _ensure_started(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f"sink:{self.name}")
+
+    async def put(self, item: Any) -> None:
+        if self._closed:
+            self._spill([item])
+            return
+        self._ensure_started()
+
+        if self.overflow == "block":
+            await self._queue.put(item)
+            self.stats.enqueued += 1
+            return
+        try:
+            self._queue.put_nowait(item)
+            self.stats.enqueued += 1
+        except asyncio.QueueFull:
+            self._spill_or_drop([item])
+
+    def _spill_or_drop(self, items: list[Any]) -> None:
+        if self.overflow != "spill":
+            self.stats.dropped += len(items)
+            logger.warning(f"Sink {self.name}: dropped {len(items)} record(s)")
+            return
+        self._spill(items)
+
+    def _spill(self, items: list[Any]) -> None:
+        if not items:
+            return
+        self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.spill_path.open("a", encoding="utf-8") as f:
+            for item in items:
+                f.write(json.dumps(item, ensure_ascii=False, default=str) + "\n")
+        self.stats.spilled += len(items)
+
+    async def _write(self, batch: list[Any]) -> None:
+        try:
+            await self.writer(batch)
+            self.stats.written += len(batch)
+        except Exception as e:
+            self.stats.failed_batches += 1
+            logger.error(f"Sink {self.name}: write of {len(batch)} failed: {e}")
+            if self.overflow == "spill":
+                self._spill_or_drop(batch)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+            batch = self._inflight = [item]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._write(batch)
+            self._inflight = []
+
+    def spill_pending(self) -> int:
+        """Spill whatever is still queued; used when the loop can no longer drain.
+
+        The batch the drainer was holding is included, so a record may be both
+        written and spilled, but none is lost.
+        """
+        items, self._inflight = [*self._inflight, *self.pending()], []
+        self._spill(items)
+        if items:
+            logger.warning(
+                f"Sink {self.name}: spilled {len(items)} undrained record(s) "
+                f"to {self.spill_path}"
+            )
+        return len(items)
+
+    def pending(self) -> list[Any]:
+        """Take whatever is still queued, without a running loop."""
+        items = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not _STOP:
+                items.append(item)
+        return items
+
+    async def aclose(self, timeout: float = 10.0) -> None:
+        """Stop accepting records and drain the queue into the writer."""
+        self._closed = True
+        if self._task is None:
+            return
+        await self._queue.put(_STOP)
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except TimeoutError:
+            logger.warning(f"Sink {self.name}: drain timed out after {timeout}s")
+            self.spill_pending()
+        logger.debug(f"Sink {self.name} closed: {asdict(self.stats)}")
+
+
+_sinks: dict[tuple[str, asyncio.AbstractEventLoop], BackgroundSink] = {}
+
+
+def get_sink(name: str, writer: Writer) -> BackgroundSink:
+    """Return the sink for ``name`` on the running loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    for key, sink in list(_sinks.items()):
+        if key[1].is_closed():
+            # loop ended without drain_sinks(); keep its records on disk
+            _sinks.pop(key)
+            sink.spill_pending()
+
+    sink = _sinks.get((name, loop))
+    if sink is None:
+        sink = BackgroundSink(
+            name,
+            writer,
+            max_queue=settings.telemetry_queue_size,
+            max_batch=settings.telemetry_batch_size,
+            flush_interval=settings.telemetry_flush_interval,
+            overflow=settings.telemetry_overflow,
+            spill_dir=settings.telemetry_spill_dir,
+        )
+        _sinks[(name, loop)] = sink
+    return sink
+
+
+async def drain_sinks(timeout: float = 10.0) -> None:
+    """Flush and close every sink owned by the running loop (call on shutdown)."""
+    loop = asyncio.get_running_loop()
+    for key, sink in list(_sinks.items()):
+        if key[1] is loop:
+            _sinks.pop(key)
+            await sink.aclose(timeout)
+
+
+@atexit.register
+def _spill_pending_at_exit() -> None:
+    for sink in _sinks.values():
+        sink.spill_pending()
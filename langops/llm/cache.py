@@ -0,0 +1,210 @@
+# ./llm/cache.py
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any
+
+import anyio
+import diskcache
+from config import settings
+from loguru import logger
+from pydantic import BaseModel
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    evictions: int = 0
+    # tokens the cache answered instead of the provider
+    input_tokens_saved: int = 0
+    output_tokens_saved: int = 0
+
+    def record_hit(self, response: dict[str, Any]) -> None:
+        self.hits += 1
+        usage = response.get("usage") or {}
+        self.input_tokens_saved += usage.get("input_tokens") or 0
+        self.output_tokens_saved += usage.get("output_tokens") or 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "hit_rate": round(self.hit_rate, 4)}
+
+
+class ResponseCache(ABC):
+    """Cache of normalized adapter responses, keyed by make_cache_key()."""
+
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+
+    @abstractmethod
+    async def get(self, key: str) -> dict[str, Any] | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set(self, key: str, response: dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    async def lookup(self, key: str) -> dict[str, Any] | None:
+        """get() plus hit/miss accounting; callers should use this one."""
+        response = await self.get(key)
+        if response is None:
+            self.stats.misses += 1
+            return None
+        self.stats.record_hit(response)
+        return response
+
+
+class MemoryResponseCache(ResponseCache):
+    """In-process LRU with a per-entry time-to-live."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float | None = None):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict[str, tuple[float | None, dict[str, Any]]] = (
+            OrderedDict()
+        )
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at is not None and expires_at < time.monotonic():
+            del self._data[key]
+            self.stats.evictions += 1
+            return None
+        self._data.move_to_end(key)
+        return copy.deepcopy(response)
+
+    async def set(self, key: str, response: dict[str, Any]) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        self._data[key] = (expires_at, copy.deepcopy(response))
+        self._data.move_to_end(key)
+        self.stats.sets += 1
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+
+
+class DiskResponseCache(ResponseCache):
+    """Persistent tier on diskcache; evicts least-recently-used past size_limit."""
+
+    def __init__(
+        self,
+        directory: str,
+        size_limit_bytes: int = 512 * 1024**2,
+        ttl_seconds: float | None = None,
+    ) -> None:
+        super().__init__()
+        self.ttl_seconds = ttl_seconds
+        self._cache = diskcache.Cache(
+            directory,
+            size_limit=size_limit_bytes,
+            eviction_policy="least-recently-used",
+        )
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        return await anyio.to_thread.run_sync(self._cache.get, key)
+
+    async def set(self, key: str, response: dict[str, Any]) -> None:
+        await anyio.to_thread.run_sync(
+            lambda: self._cache.set(key, response, expire=self.ttl_seconds)
+        )
+        self.stats.sets += 1
+
+    def close(self) -> None:
+        self._cache.close()
+
+
+class TieredResponseCache(ResponseCache):
+    """Memory LRU in front of the disk cache; disk hits are promoted."""
+
+    def __init__(self, memory: MemoryResponseCache, disk: DiskResponseCache):
+        super().__init__()
+        self.memory = memory
+        self.disk = disk
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        response = await self.memory.lookup(key)
+        if response is not None:
+            return response
+        response = await self.disk.lookup(key)
+        if response is not None:
+            await self.memory.set(key, response)
+        return response
+
+    async def set(self, key: str, response: dict[str, Any]) -> None:
+        await self.memory.set(key, response)
+        await self.disk.set(key, response)
+        self.stats.sets += 1
+
+
+@lru_cache(maxsize=256)
+def _schema_fingerprint(output_model: type[BaseModel]) -> str:
+    schema = json.dumps(output_model.model_json_schema(), sort_keys=True)
+    return hashlib.sha256(schema.encode()).hexdigest()
+
+
+def make_cache_key(
+    *,
+    provider: str | None,
+    model: str | None,
+    messages: list[dict[str, Any]],
+    temperature: float | None,
+    output_model: type[BaseModel] | None,
+) -> str:
+    """Content address of a request: sha256 over everything that shapes the output."""
+    material = {
+        "provider": provider,
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "schema": _schema_fingerprint(output_model) if output_model else None,
+    }
+    raw = json.dumps(material, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+_caches: dict[str, ResponseCache] = {}
+
+
+def _build_cache(kind: str) -> ResponseCache:
+    ttl = settings.llm_cache_ttl_seconds
+    if kind == "memory":
+        return MemoryResponseCache(settings.llm_cache_max_entries, ttl)
+    if kind == "disk":
+        return DiskResponseCache(
+            settings.llm_cache_dir, settings.llm_cache_size_limit_mb * 1024**2, ttl
+        )
+    if kind == "tiered":
+        return TieredResponseCache(_build_cache("memory"), _build_cache("disk"))
+    raise ValueError(f"Unsupported LLM cache kind: {kind}")
+
+
+def get_response_cache(kind: str | None) -> ResponseCache | None:
+    """Return the process-wide cache for a profile's `llm_cache` setting."""
+    if not kind or kind == "none":
+        return None
+    cache = _caches.get(kind)
+    if cache is None:
+        cache = _caches[kind] = _build_cache(kind)
+        logger.debug(f"LLM response cache enabled: {kind}")
+    return cache
+
+
+def cache_stats() -> dict[str, dict[str, Any]]:
+    return {kind: cache.stats.as_dict() for kind, cache in _caches.items()}
@@ -1,13 +1,17 @@
 # ./llm/client.py
 from __future__ import annotations
 
-import json
 from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
+from pydantic import ValidationError
+
 from langops.hooks.payload import LLMHookPayload
 
 from .adapters import BaseLLMAdapter
+from .cache import ResponseCache, make_cache_key
+from .validation import get_validator, is_json_error, response_content
 
 Hook = Callable[[LLMHookPayload], Awaitable[None]]
 
@@ -25,40 +29,152 @@ class LLMResponseValidationError(LLMError):
 
 
 class LLMClient:
-    def __init__(self, adapter: BaseLLMAdapter) -> None:
+    def __init__(
+        self,
+        adapter: BaseLLMAdapter,
+        cache: ResponseCache | None = None,
+        stream: bool = False,
+        max_output_tokens: int | None = None,
+    ) -> None:
         self.adapter = adapter
-
-    def _extract_json_dict(self, content: Any) -> dict[str, Any]:
-        if isinstance(content, dict):
-            return content
-        if isinstance(content, str):
-            try:
-                parsed = json.loads(content)
-            except Exception as e:
-                raise LLMResponseNotJSON(f"Response is not valid JSON: {e}") from e
-            if not isinstance(parsed, dict):
-                raise LLMResponseNotJSON("JSON root is not an object")
-            return parsed
-        raise LLMResponseNotJSON(f"Unsupported content type: {type(content).__name__}")
-
-    # TODO: add @alru_cache(maxsize=128)
-    async def request(self, payload: LLMHookPayload) -> LLMHookPayload:
-        if payload.llm_output_model is None:
-            raise LLMResponseValidationError("llm_output_model is required")
-
-        response = await self.adapter.send(
+        self.cache = cache
+        # stream=True assembles responses from the adapter's stream, which
+        # records TTFT and can stop at `max_output_tokens`
+        self.stream = stream
+        self.max_output_tokens = max_output_tokens
+
+    def _stream_options(self) -> dict[str, Any]:
+        if not self.stream:
+            return {}
+        return {"stream": True, "max_output_tokens": self.max_output_tokens}
+
+    def _cache_key(self, payload: LLMHookPayload) -> str | None:
+        if self.cache is None:
+            return None
+        return make_cache_key(
+            provider=self.adapter.provider_name,
+            model=getattr(self.adapter, "model", payload.llm_model),
             messages=payload.messages,
             temperature=payload.temperature,
-            response_model=payload.llm_output_model,
+            output_model=payload.llm_output_model,
         )
 
+    async def _apply_response(
+        self,
+        payload: LLMHookPayload,
+        response: dict[str, Any],
+        cache_key: str | None,
+    ) -> LLMHookPayload:
         payload.response_llm = response
         payload.llm_model = response.get("model")
 
-        content = response.get("content")
-        parsed = self._extract_json_dict(content)
+        content = response_content(response)
+        try:
+            instance, repaired = get_validator(
+                payload.llm_output_model
+            ).validate_or_repair(content)
+        except TypeError as e:
+            raise LLMResponseNotJSON(str(e)) from e
+        except ValidationError as e:
+            if is_json_error(e):
+                raise LLMResponseNotJSON(f"Response is not valid JSON: {e}") from e
+            raise LLMResponseValidationError(
+                f"Response does not match {payload.llm_output_model.__name__}: {e}"
+            ) from e
+        if repaired:
+            # store the repaired object so cache replays skip the repair
+            content = instance.model_dump(mode="json")
+            response["content"] = content
+
+        payload.response_llm_parsed = (
+            content if isinstance(content, dict) else instance.model_dump(mode="json")
+        )
+        payload.response_llm_instance = instance
 
-        payload.response_llm_parsed = parsed
-        payload.response_llm_instance = payload.llm_output_model(**parsed)
+        # only responses that validated against the schema are worth replaying
+        if cache_key is not None and not payload.cache_hit:
+            await self.cache.set(cache_key, response)
 
         return payload
+
+    async def request(self, payload: LLMHookPayload) -> LLMHookPayload:
+        if payload.llm_output_model is None:
+            raise LLMResponseValidationError("llm_output_model is required")
+
+        cache_key = self._cache_key(payload)
+        response = await self.cache.lookup(cache_key) if cache_key else None
+
+        payload.cache_hit = response is not None
+        if response is None:
+            payload.request_started_at = datetime.now(timezone.utc)
+            response = await self.adapter.throttled_send(
+                messages=payload.messages,
+                temperature=payload.temperature,
+                response_model=payload.llm_output_model,
+                **self._stream_options(),
+            )
+            payload.request_ended_at = datetime.now(timezone.utc)
+            ttft = (response.get("timing") or {}).get("ttft_s")
+            if ttft is not None:
+                payload.first_token_at = payload.request_started_at + timedelta(
+                    seconds=ttft
+                )
+
+        return await self._apply_response(payload, response, cache_key)
+
+    async def request_batch(
+        self, payloads: list[LLMHookPayload], **batch_options: Any
+    ) -> list[LLMHookPayload | Exception]:
+        """Like request() for many payloads, sent as one provider batch job.
+
+        Cache hits are answered locally; the rest go through adapter.send_batch.
+        Failures are returned in place so one bad item does not sink the batch.
+        """
+        if not self.adapter.supports_batch:
+            raise LLMError(f"{self.adapter.provider_name} does not support batches")
+
+        results: list[LLMHookPayload | Exception] = list(payloads)
+        cache_keys: list[str | None] = []
+        pending: list[int] = []
+        for i, payload in enumerate(payloads):
+            if payload.llm_output_model is None:
+                results[i] = LLMResponseValidationError("llm_output_model is required")
+                cache_keys.append(None)
+                continue
+            cache_key = self._cache_key(payload)
+            cache_keys.append(cache_key)
+            cached = await self.cache.lookup(cache_key) if cache_key else None
+            payload.cache_hit = cached is not None
+            if cached is None:
+                pending.append(i)
+                continue
+            results[i] = await self._apply_response(payload, cached, cache_key)
+
+        started_at = datetime.now(timezone.utc)
+        responses = await self.adapter.send_batch(
+            [
+                {
+                    "messages": payloads[i].messages,
+                    "temperature": payloads[i].temperature,
+                    "response_model": payloads[i].llm_output_model,
+                }
+                for i in pending
+            ],
+            **batch_options,
+        )
+        ended_at = datetime.now(timezone.utc)
+
+        for i, response in zip(pending, responses):
+            payloads[i].request_started_at = started_at
+            payloads[i].request_ended_at = ended_at
+            if isinstance(response, Exception):
+                results[i] = response
+                continue
+            try:
+                results[i] = await self._apply_response(
+                    payloads[i], response, cache_keys[i]
+                )
+            except Exception as e:
+                results[i] = e
+
+        return results
@@ -2,57 +2,161 @@
 from __future__ import annotations
 
 import json
+from collections import defaultdict
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any
 
 from config import settings
 from loguru import logger
-from pymongo import MongoClient
+from motor.motor_asyncio import (
+    AsyncIOMotorClient,
+    AsyncIOMotorCollection,
+    AsyncIOMotorDatabase,
+)
+from pymongo import ASCENDING, DESCENDING, IndexModel, WriteConcern
+from pymongo.errors import BulkWriteError, OperationFailure
 
-from langops.llm.schemas import LLMCall
+from langops.hooks.sink import get_sink
 
-client = MongoClient(settings.mongo_uri)
-db = client[settings.mongo_db]
+# the filters audit queries use: per operation over time, and by source row
+AUDIT_INDEXES = [
+    IndexModel([("operation", ASCENDING), ("created_at", DESCENDING)]),
+    IndexModel([("created_at", DESCENDING)]),
+    IndexModel([("ref_id", ASCENDING)], sparse=True),
+]
 
 
-def _json_default(o: Any) -> Any:
-    if hasattr(o, "model_dump"):
-        try:
-            return o.model_dump()
-        except Exception:
-            pass
-    if hasattr(o, "__dict__"):
-        try:
-            return o.__dict__
-        except Exception:
-            pass
-    return str(o)
+@lru_cache
+def get_mongo_client() -> AsyncIOMotorClient:
+    """Shared motor client; it only connects when the first operation runs."""
+    connection_string = settings.mongo_uri or "mongodb://localhost:27017"
+
+    client = AsyncIOMotorClient(
+        connection_string,
+        maxPoolSize=10,
+        minPoolSize=1,
+        serverSelectionTimeoutMS=5000,
+    )
+
+    return client
+
+
+def get_db(database_name: str | None = None) -> AsyncIOMotorDatabase:
+    db_name = database_name or settings.mongo_db or "llm_logs"
+    client = get_mongo_client()
+    return client[db_name]
 
 
-def insert_call_mongo(data: dict) -> Any:
+def audit_record(data: dict[str, Any]) -> dict[str, Any]:
+    """Shape an LLM call like `schemas.LLMCall`, keeping the response as is.
+
+    Dict responses are stored without a JSON round-trip; only raw text is
+    parsed, and kept alongside as `response_raw`.
+    """
     response = data.get("response")
-    coll = db[data.get("mongo_coll_name")]
+    doc: dict[str, Any] = {
+        "operation": data.get("operation"),
+        "llm_provider": data.get("llm_provider"),
+        "llm_model": data.get("llm_model"),
+        "prompt": data.get("prompt"),
+        "created_at": data.get("created_at") or datetime.now(timezone.utc),
+    }
+    output_model = data.get("output_model")
+    if output_model is not None:
+        doc["output_model"] = getattr(output_model, "__name__", str(output_model))
+    if data.get("ref_id") is not None:
+        doc["ref_id"] = data["ref_id"]
 
-    # Keep both dict and raw string for auditability
-    if isinstance(response, dict):
-        data["response_raw"] = json.dumps(
-            response, ensure_ascii=False, default=_json_default
-        )
-    elif isinstance(response, str):
-        data["response_raw"] = response
+    if isinstance(response, str):
+        doc["response_raw"] = response
         try:
-            data["response"] = json.loads(response)
+            response = json.loads(response)
         except json.JSONDecodeError:
-            data["response"] = {"raw": response}
-    else:
-        data["response_raw"] = json.dumps(
-            response, ensure_ascii=False, default=_json_default
+            response = {"raw": response}
+    elif hasattr(response, "model_dump"):
+        response = response.model_dump()
+    doc["response"] = response
+    return doc
+
+
+class MongoAuditWriter:
+    """Batched writer of LLM audit records into Mongo collections.
+
+    Records are grouped per collection and written with one unordered
+    `insert_many`, so a bad document does not stop the rest of the batch.
+    Each collection gets its query indexes the first time it is written to.
+    """
+
+    def __init__(
+        self,
+        database_name: str | None = None,
+        write_concern: WriteConcern | None = None,
+    ) -> None:
+        self.database_name = database_name
+        self.write_concern = write_concern or WriteConcern(w=1)
+        self._indexed: set[str] = set()
+
+    def collection(self, name: str) -> AsyncIOMotorCollection:
+        return get_db(self.database_name).get_collection(
+            name, write_concern=self.write_concern
         )
+
+    async def ensure_indexes(self, collection: AsyncIOMotorCollection) -> None:
+        if collection.name in self._indexed:
+            return
+        # attempted once: a conflicting index or missing privilege must not
+        # cost the audit records themselves
+        self._indexed.add(collection.name)
         try:
-            data["response"] = json.loads(data["response_raw"])
-        except Exception:
-            data["response"] = {"raw": data["response_raw"]}
-
-    validated = LLMCall(**data)
-    result = coll.insert_one(validated.model_dump())
-    logger.debug(f"Inserted into Mongo _id={result.inserted_id}")
-    return result.inserted_id
+            await collection.create_indexes(AUDIT_INDEXES)
+        except OperationFailure as e:
+            logger.warning(
+                f"MongoDB: could not create indexes on {collection.name}: {e}"
+            )
+
+    async def write(self, records: list[tuple[str, dict[str, Any]]]) -> int:
+        """Insert (collection, document) pairs; returns the documents written."""
+        by_collection: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for coll_name, doc in records:
+            by_collection[coll_name].append(doc)
+
+        written = 0
+        for coll_name, docs in by_collection.items():
+            collection = self.collection(coll_name)
+            await self.ensure_indexes(collection)
+            try:
+                result = await collection.insert_many(docs, ordered=False)
+                inserted = len(result.inserted_ids)
+            except BulkWriteError as e:
+                inserted = e.details.get("nInserted", 0)
+                logger.warning(
+                    f"MongoDB: {len(docs) - inserted} of {len(docs)} call(s) "
+                    f"rejected by {coll_name}: {e.details.get('writeErrors', [])[:1]}"
+                )
+            written += inserted
+            logger.debug(f"MongoDB: logged {inserted} call(s) to {coll_name}")
+        return written
+
+
+def _write_concern() -> WriteConcern:
+    w: int | str = settings.mongo_write_w
+    if isinstance(w, str) and w.isdigit():
+        w = int(w)
+    return WriteConcern(w=w, j=settings.mongo_write_journal or None)
+
+
+@lru_cache
+def get_audit_writer() -> MongoAuditWriter:
+    return MongoAuditWriter(write_concern=_write_concern())
+
+
+async def write_audit_batch(records: list[tuple[str, dict[str, Any]]]) -> None:
+    """Sink writer shared by `insert_call_mongo` and the mongo hook."""
+    await get_audit_writer().write(records)
+
+
+async def insert_call_mongo(data: dict[str, Any]) -> None:
+    """Queue an LLM call for the batched audit writer; returns once enqueued."""
+    record = audit_record(data)
+    await get_sink("mongo", write_audit_batch).put((data["mongo_coll_name"], record))
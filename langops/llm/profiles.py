@@ -2,51 +2,184 @@
 from __future__ import annotations
 
 import importlib
+import importlib.util
+import threading
+import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Callable
 
 import tomllib as toml
+from loguru import logger
+
+REQUIRED_KEYS = ("llm_provider", "llm_model")
+LLM_CACHES = {"none", "memory", "disk", "tiered"}
+RATE_LIMIT_KEYS = {
+    "requests_per_minute",
+    "tokens_per_minute",
+    "max_concurrency",
+    "min_concurrency",
+    "max_retries",
+    "backoff",
+}
+# per-operation overrides read by GenericLLMTask, defaulting to the base keys
+DETECTION_DEFAULTS = {
+    "llm_provider_detection": "llm_provider",
+    "llm_model_detection": "llm_model",
+    "temperature_detection": "temperature",
+}
+
+
+HOOKSETS = ("hookset_before", "hookset_after")
+
+
+@lru_cache(maxsize=None)
+def _import_from_path(dotted: str) -> Callable:
+    module_path, attr = dotted.rsplit(".", 1)
+    module = importlib.import_module(module_path)
+    return getattr(module, attr)
+
+
+def _check_hook_path(dotted: str) -> None:
+    """Check that a hook path points somewhere, without importing the hook.
+
+    A package (such as langops.hooks, which loads its hooks lazily) is
+    imported to look the name up; for a plain module only the module is
+    checked, and a missing name surfaces on the first resolve().
+    """
+    module_path, _, attr = dotted.rpartition(".")
+    if not module_path:
+        raise ValueError(f"'{dotted}' is not a dotted path")
+    spec = importlib.util.find_spec(module_path)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{module_path}'")
+    if spec.submodule_search_locations is not None:
+        if attr not in dir(importlib.import_module(module_path)):
+            raise AttributeError(f"module '{module_path}' has no attribute '{attr}'")
 
 
 class ProfileStore:
-    def __init__(self, path: str | Path = "profiles.toml") -> None:
-        self.path = Path(path)
-        with self.path.open("rb") as f:
-            self._cfg = toml.load(f)
+    """Parsed and validated `profiles.toml`, resolved once per profile.
 
-    def _import_from_path(self, dotted: str) -> Callable:
-        module_path, attr = dotted.rsplit(".", 1)
-        module = importlib.import_module(module_path)
-        return getattr(module, attr)
+    Every profile and hook path is checked when the file is loaded, so bad
+    config fails on startup. The hooks themselves are imported on the first
+    resolve() that needs them, keeping their SDKs (Motor, Langfuse, ...) out
+    of processes that only load the config. The file's mtime is checked at
+    most every `reload_interval` seconds and a changed file is reloaded; a
+    reload that fails validation is logged and the previous config stays
+    active.
+    """
 
-    def _load_hooks(self, names: list[str]) -> list[Callable]:
-        return [self._import_from_path(name) for name in (names or [])]
+    def __init__(
+        self, path: str | Path = "profiles.toml", reload_interval: float = 1.0
+    ) -> None:
+        self.path = Path(path)
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._mtime_ns = self.path.stat().st_mtime_ns
+        self._resolved = self._load()
+        # hook paths -> imported callables, shared by profiles and reloads
+        self._hooks: dict[tuple[str, ...], list[Callable]] = {}
 
-    def resolve(self, profile_key: str) -> dict[str, Any]:
-        profile = self._cfg.get(profile_key)
-        if profile is None:
-            raise KeyError(f"Profile not found: {profile_key}")
+    def _load(self) -> dict[str, dict[str, Any]]:
+        with self.path.open("rb") as f:
+            cfg = toml.load(f)
+        return {key: self._resolve(key, profile) for key, profile in cfg.items()}
 
-        required_keys = ()
+    @staticmethod
+    def _resolve(profile_key: str, profile: Any) -> dict[str, Any]:
+        if not isinstance(profile, dict):
+            raise ValueError(f"Profile {profile_key} must be a table")
 
-        missing = [k for k in required_keys if profile.get(k) in (None, "")]
+        missing = [k for k in REQUIRED_KEYS if profile.get(k) in (None, "")]
         if missing:
             raise ValueError(
                 f"Profile {profile_key} missing required fields: {', '.join(missing)}"
             )
-
-        before_paths = profile.get("hookset_before", []) or []
-        after_paths = profile.get("hookset_after", []) or []
+        cache = profile.get("llm_cache")
+        if cache is not None and cache not in LLM_CACHES:
+            raise ValueError(f"Profile {profile_key} has unknown llm_cache '{cache}'")
+        rate_limit = profile.get("rate_limit")
+        if rate_limit is not None:
+            unknown = set(rate_limit) - RATE_LIMIT_KEYS
+            if unknown:
+                raise ValueError(
+                    f"Profile {profile_key} has unknown rate_limit keys: "
+                    f"{', '.join(sorted(unknown))}"
+                )
 
         resolved: dict[str, Any] = dict(profile)
-        resolved["hookset_before"] = self._load_hooks(before_paths)
-        resolved["hookset_after"] = self._load_hooks(after_paths)
+        for key, default in DETECTION_DEFAULTS.items():
+            resolved.setdefault(key, profile.get(default))
+        for hookset in HOOKSETS:
+            paths = tuple(profile.get(hookset, []) or [])
+            try:
+                for path in paths:
+                    _check_hook_path(path)
+            except (ImportError, AttributeError, ValueError) as e:
+                raise ValueError(
+                    f"Profile {profile_key} has an unresolvable {hookset} hook: {e}"
+                ) from e
+            resolved[hookset] = paths
+        return resolved
 
+    def _import_hooks(
+        self, profile_key: str, hookset: str, paths: tuple[str, ...]
+    ) -> list[Callable]:
+        hooks = self._hooks.get(paths)
+        if hooks is None:
+            try:
+                hooks = [_import_from_path(p) for p in paths]
+            except (ImportError, AttributeError) as e:
+                raise ValueError(
+                    f"Profile {profile_key} has an unresolvable {hookset} hook: {e}"
+                ) from e
+            self._hooks[paths] = hooks
+        return hooks
+
+    def _maybe_reload(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return
+        with self._lock:
+            self._checked_at = now
+            try:
+                mtime_ns = self.path.stat().st_mtime_ns
+                if mtime_ns == self._mtime_ns:
+                    return
+                # a broken edit is reported once, not on every check
+                self._mtime_ns = mtime_ns
+                self._resolved = self._load()
+                logger.info(f"Reloaded LLM profiles from {self.path}")
+            except Exception as e:
+                logger.error(f"Keeping previous profiles, reload failed: {e}")
+
+    def resolve(self, profile_key: str) -> dict[str, Any]:
+        self._maybe_reload()
+        profile = self._resolved.get(profile_key)
+        if profile is None:
+            raise KeyError(f"Profile not found: {profile_key}")
+        # shallow copy: callers may add keys, hook lists stay shared
+        resolved = dict(profile)
+        for hookset in HOOKSETS:
+            resolved[hookset] = self._import_hooks(
+                profile_key, hookset, profile[hookset]
+            )
         return resolved
 
+    @property
+    def profiles(self) -> list[str]:
+        return list(self._resolved)
+
     @staticmethod
     def load_profile(
         profile_key: str, path: str | Path = "profiles.toml"
     ) -> dict[str, Any]:
-        store = ProfileStore(path)
-        return store.resolve(profile_key)
+        return get_profile_store(path).resolve(profile_key)
+
+
+@lru_cache
+def get_profile_store(path: str | Path = "profiles.toml") -> ProfileStore:
+    """Return the process-wide store for `path`, loading it on first use."""
+    return ProfileStore(path)
@@ -0,0 +1,2 @@
+# ./llm/providers/__init__.py
+"""Provider adapters; each module imports its SDK, so import them lazily."""
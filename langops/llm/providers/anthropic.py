@@ -0,0 +1,333 @@
+# ./llm/providers/anthropic.py
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import json
+import time
+from typing import Any
+
+import anthropic
+import httpx
+from anthropic import AsyncAnthropic
+from config import settings
+from loguru import logger
+from pydantic import BaseModel
+
+from langops.llm.adapters import BaseLLMAdapter, LLMError, StreamAssembler
+
+
+# HTTP/2 multiplexing needs the optional `h2` package; fall back to keep-alive
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+
+
+def _pooled_http_client() -> httpx.AsyncClient:
+    return anthropic.DefaultAsyncHttpxClient(
+        http2=HTTP2_ENABLED,
+        limits=httpx.Limits(
+            max_connections=100,
+            max_keepalive_connections=20,
+            keepalive_expiry=60.0,
+        ),
+    )
+
+
+def _anthropic_messages(
+    messages: list[dict[str, Any]],
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Split messages into Anthropic `system` blocks and chat messages.
+
+    A message carrying `cache_control` (e.g. "ephemeral") becomes a text
+    block marked for prompt caching; the cached prefix runs up to the last
+    marked block.
+    """
+    system: list[dict[str, Any]] = []
+    chat: list[dict[str, Any]] = []
+    for m in messages:
+        role = m.get("role") or "user"
+        mark = m.get("cache_control")
+        if role != "system" and not mark:
+            chat.append({"role": role, "content": m.get("content")})
+            continue
+        block: dict[str, Any] = {"type": "text", "text": m.get("content") or ""}
+        if mark:
+            block["cache_control"] = {"type": mark}
+        if role == "system":
+            system.append(block)
+        else:
+            chat.append({"role": role, "content": [block]})
+    return system, chat
+
+
+def _anthropic_usage(usage: Any) -> dict[str, Any]:
+    return {
+        "input_tokens": usage.input_tokens,
+        "output_tokens": usage.output_tokens,
+        "cache_creation_input_tokens": getattr(
+            usage, "cache_creation_input_tokens", None
+        )
+        or 0,
+        "cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", None) or 0,
+    }
+
+
+class AnthropicAdapter(BaseLLMAdapter):
+    provider_name = "anthropic.3x"
+
+    def __init__(
+        self,
+        model: str,
+        api_key: str | None = None,
+        temperature: float = 0.0,
+        max_tokens: int = 4096,
+    ) -> None:
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.client = AsyncAnthropic(
+            api_key=api_key or settings.anthropic_api_key,
+            http_client=_pooled_http_client(),
+            # 429s and transient errors are retried by the provider limiter
+            max_retries=0,
+        )
+
+    async def aclose(self) -> None:
+        await self.client.close()
+
+    @staticmethod
+    def parse_response(raw_response: dict) -> dict:
+        try:
+            text_json = raw_response["content"][0].get("text", "{}")
+            return json.loads(text_json)
+        except Exception:
+            return {}
+
+    async def send(
+        self,
+        *,
+        messages: list[dict[str, Any]],
+        temperature: float | None = None,
+    ) -> dict[str, Any]:
+        system, chat = _anthropic_messages(messages)
+        resp = await self.client.messages.create(
+            model=self.model,
+            messages=chat,
+            max_tokens=self.max_tokens,
+            temperature=temperature if temperature is not None else self.temperature,
+            **({"system": system} if system else {}),
+        )
+
+        # Convert response to dict for consistent interface
+        return resp.model_dump() if hasattr(resp, "model_dump") else resp.__dict__
+
+
+class AnthropicAdapter2(BaseLLMAdapter):
+    provider_name = "anthropic.4x"
+    supports_batch = True
+    supports_stream = True
+
+    def __init__(
+        self,
+        model: str,
+        api_key: str | None = None,
+        base_url: str | None = None,
+    ):
+        self.model = model
+        self.client = anthropic.AsyncAnthropic(
+            api_key=api_key or settings.anthropic_api_key,
+            base_url=base_url,
+            http_client=_pooled_http_client(),
+        )
+        # online calls leave retries to the provider limiter; batch calls keep
+        # the SDK's own retries for submission and polling
+        self._online = self.client.with_options(max_retries=0)
+
+    async def aclose(self) -> None:
+        await self.client.close()
+
+    def _build_params(
+        self,
+        messages: list[dict],
+        temperature: float | None = None,
+        response_model: type[BaseModel] | None = None,
+        **kwargs,
+    ) -> dict[str, Any]:
+        system, chat = _anthropic_messages(messages)
+        request_params = {
+            "model": self.model,
+            "messages": chat,
+            # TODO: remove hardcoded max tokens
+            "max_tokens": kwargs.get("max_tokens", 8000),
+        }
+        if system:
+            request_params["system"] = system
+
+        if temperature is not None:
+            request_params["temperature"] = temperature
+
+        if response_model:
+            tool_name = response_model.__name__
+            request_params["tools"] = [
+                {
+                    "name": tool_name,
+                    "description": f"Extract structured data as {tool_name}",
+                    "input_schema": response_model.model_json_schema(),
+                }
+            ]
+            request_params["tool_choice"] = {"type": "tool", "name": tool_name}
+
+        return request_params
+
+    @staticmethod
+    def _normalize(response: Any, response_model: type[BaseModel] | None) -> dict:
+        usage = _anthropic_usage(response.usage)
+
+        # Tool use response handling
+        if response_model and response.stop_reason == "tool_use":
+            for content_block in response.content:
+                if content_block.type == "tool_use":
+                    return {
+                        "id": response.id,
+                        "content": content_block.input,  # ✅ Dict directly
+                        "model": response.model,
+                        "stop_reason": response.stop_reason,
+                        "usage": usage,
+                    }
+
+        # Fallback: text response (shouldn't happen with tool_choice)
+        if response.content and len(response.content) > 0:
+            first_block = response.content[0]
+            if hasattr(first_block, "text"):
+                content = first_block.text
+            elif hasattr(first_block, "input"):
+                content = first_block.input
+            else:
+                content = "{}"
+        else:
+            content = "{}"
+
+        return {
+            "id": response.id,
+            "content": content,
+            "model": response.model,
+            "stop_reason": response.stop_reason,
+            "usage": usage,
+        }
+
+    async def send(
+        self,
+        messages: list[dict],
+        temperature: float | None = None,
+        response_model: type[BaseModel] | None = None,
+        **kwargs,
+    ):
+        request_params = self._build_params(
+            messages, temperature, response_model, **kwargs
+        )
+        response = await self._online.messages.create(**request_params)
+        return self._normalize(response, response_model)
+
+    async def send_stream(
+        self,
+        *,
+        messages: list[dict],
+        temperature: float | None = None,
+        response_model: type[BaseModel] | None = None,
+        max_output_tokens: int | None = None,
+        **kwargs,
+    ) -> dict[str, Any]:
+        request_params = self._build_params(
+            messages, temperature, response_model, **kwargs
+        )
+        assembler = StreamAssembler(response_model, max_output_tokens)
+        response: dict[str, Any] = {
+            "id": None,
+            "model": self.model,
+            "stop_reason": None,
+            "usage": {},
+        }
+
+        # message_start carries a placeholder output count; the real one
+        # comes with message_delta at the end of the message
+        final_usage = False
+        stream = await self._online.messages.create(**request_params, stream=True)
+        try:
+            async for event in stream:
+                if event.type == "message_start":
+                    response["id"] = event.message.id
+                    response["model"] = event.message.model
+                    response["usage"] = _anthropic_usage(event.message.usage)
+                elif event.type == "content_block_delta":
+                    if assembler.parsed is not None:
+                        # generation runs on past a complete object: cut it
+                        response["stop_reason"] = "parsed"
+                        break
+                    # tool-use JSON arrives as partial_json, plain output as text
+                    delta = getattr(event.delta, "partial_json", None)
+                    if delta is None:
+                        delta = getattr(event.delta, "text", "")
+                    assembler.feed(delta)
+                elif event.type == "message_delta":
+                    response["stop_reason"] = event.delta.stop_reason
+                    response["usage"]["output_tokens"] = event.usage.output_tokens
+                    final_usage = True
+        finally:
+            # closing the stream cancels the rest of the generation
+            await stream.close()
+
+        if not final_usage:
+            assembler.estimate_usage(response["usage"])
+
+        response["content"] = assembler.content()
+        response["timing"] = assembler.timing()
+        return response
+
+    async def send_batch(
+        self,
+        requests: list[dict[str, Any]],
+        *,
+        poll_interval: float = 30.0,
+        timeout: float = 24 * 3600,
+    ) -> list[dict[str, Any] | LLMError]:
+        """Run many requests as one Message Batch and wait for the results.
+
+        Each request holds the keyword arguments of send(). Results come back
+        in request order; a request that errored, expired or was canceled on
+        the provider side yields an LLMError in its slot.
+        """
+        if not requests:
+            return []
+
+        batch = await self.client.messages.batches.create(
+            requests=[
+                {"custom_id": str(i), "params": self._build_params(**req)}
+                for i, req in enumerate(requests)
+            ]
+        )
+        logger.info(f"Submitted message batch {batch.id} ({len(requests)} requests)")
+
+        deadline = time.monotonic() + timeout
+        while batch.processing_status != "ended":
+            if time.monotonic() > deadline:
+                await self.client.messages.batches.cancel(batch.id)
+                raise LLMError(f"Message batch {batch.id} timed out after {timeout}s")
+            await asyncio.sleep(poll_interval)
+            batch = await self.client.messages.batches.retrieve(batch.id)
+
+        results: list[dict[str, Any] | LLMError] = [
+            LLMError(f"Missing result in message batch {batch.id}")
+        ] * len(requests)
+        async for entry in await self.client.messages.batches.results(batch.id):
+            i = int(entry.custom_id)
+            if entry.result.type == "succeeded":
+                results[i] = self._normalize(
+                    entry.result.message, requests[i].get("response_model")
+                )
+            else:
+                error = getattr(entry.result, "error", None)
+                results[i] = LLMError(
+                    f"Batch request {entry.custom_id} {entry.result.type}: {error}"
+                )
+
+        logger.info(f"Message batch {batch.id} ended: {batch.request_counts}")
+        return results
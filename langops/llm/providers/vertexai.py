@@ -0,0 +1,198 @@
+# ./llm/providers/vertexai.py
+from __future__ import annotations
+
+from typing import Any
+
+from config import settings
+from google import genai
+from google.genai import types
+from google.oauth2.service_account import Credentials as ServiceAccountCredentials
+from pydantic import BaseModel
+
+from langops.llm.adapters import (
+    BaseLLMAdapter,
+    LLMStructuredOutputRequired,
+    StreamAssembler,
+)
+
+
+class VertexAIAdapter(BaseLLMAdapter):
+    provider_name = "vertexai"
+    supports_stream = True
+
+    def __init__(self, model) -> None:
+        self.model = model
+        project_id = settings.vertexai_project
+        region = settings.vertexai_location
+        sa_file = settings.vertexai_service_account_path
+        api_version = settings.vertexai_genai_api_version
+        scopes = ["https://www.googleapis.com/auth/cloud-platform"]
+
+        if not project_id:
+            raise RuntimeError("Missing Vertex AI project in settings")
+
+        credentials = None
+        if sa_file:
+            credentials = ServiceAccountCredentials.from_service_account_file(
+                sa_file,
+                scopes=scopes,
+            )
+
+        http_options = (
+            types.HttpOptions(api_version=api_version) if api_version else None
+        )
+
+        self.client = genai.Client(
+            vertexai=True,
+            project=project_id,
+            location=region,
+            credentials=credentials,
+            http_options=http_options,
+        ).aio
+
+    async def aclose(self) -> None:
+        if hasattr(self.client, "aclose"):
+            await self.client.aclose()
+
+    def _build_request(
+        self,
+        messages: list[dict[str, Any]],
+        temperature: float | None,
+        response_model: type[BaseModel] | None,
+        **kwargs: Any,
+    ) -> tuple[list[types.Content], types.GenerateContentConfig]:
+        if response_model is None:
+            raise LLMStructuredOutputRequired(
+                "VertexAI requires response_model for structured output"
+            )
+
+        system_text = "\n".join(
+            (m.get("content") or "").strip()
+            for m in messages
+            if (m.get("role") or "").lower() == "system"
+        ).strip()
+
+        contents: list[types.Content] = []
+        for m in messages:
+            role = (m.get("role") or "user").lower()
+            if role == "system":
+                continue
+            text = (m.get("content") or "").strip()
+            if not text:
+                continue
+            part = types.Part.from_text(text=text)
+            if role == "assistant":
+                contents.append(types.Content(role="model", parts=[part]))
+            else:
+                contents.append(types.Content(role="user", parts=[part]))
+
+        cfg: dict[str, Any] = {"max_output_tokens": kwargs.get("max_tokens", 8000)}
+        if system_text:
+            cfg["system_instruction"] = system_text
+        if temperature is not None:
+            cfg["temperature"] = temperature
+
+        cfg["response_mime_type"] = "application/json"
+        cfg["response_schema"] = response_model
+
+        return contents, types.GenerateContentConfig(**cfg)
+
+    @staticmethod
+    def _usage(um: Any) -> dict[str, Any]:
+        return {
+            "input_tokens": getattr(um, "prompt_token_count", None) if um else None,
+            "output_tokens": getattr(um, "candidates_token_count", None)
+            if um
+            else None,
+            # Gemini caches repeated prefixes implicitly
+            "cache_read_input_tokens": getattr(um, "cached_content_token_count", None)
+            if um
+            else None,
+        }
+
+    async def send(
+        self,
+        *,
+        messages: list[dict[str, Any]],
+        temperature: float | None = None,
+        response_model: type[BaseModel] | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        contents, config = self._build_request(
+            messages, temperature, response_model, **kwargs
+        )
+
+        resp = await self.client.models.generate_content(
+            model=self.model,
+            contents=contents,
+            config=config,
+        )
+
+        parsed = getattr(resp, "parsed", None)
+        if parsed is None:
+            raise LLMStructuredOutputRequired("VertexAI did not return parsed output")
+
+        if isinstance(parsed, BaseModel):
+            content: Any = parsed.model_dump()
+        elif isinstance(parsed, dict):
+            content = parsed
+        else:
+            raise LLMStructuredOutputRequired(
+                f"VertexAI parsed output is {type(parsed).__name__}, expected dict"
+            )
+
+        return {
+            "content": content,
+            "model": getattr(resp, "model", None) or self.model,
+            "usage": self._usage(getattr(resp, "usage_metadata", None)),
+        }
+
+    async def send_stream(
+        self,
+        *,
+        messages: list[dict[str, Any]],
+        temperature: float | None = None,
+        response_model: type[BaseModel] | None = None,
+        max_output_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        contents, config = self._build_request(
+            messages, temperature, response_model, **kwargs
+        )
+        assembler = StreamAssembler(response_model, max_output_tokens)
+        usage_metadata = None
+        model = None
+        cut = False
+
+        stream = await self.client.models.generate_content_stream(
+            model=self.model,
+            contents=contents,
+            config=config,
+        )
+        try:
+            async for chunk in stream:
+                usage_metadata = (
+                    getattr(chunk, "usage_metadata", None) or usage_metadata
+                )
+                model = getattr(chunk, "model_version", None) or model
+                text = chunk.text or ""
+                if assembler.parsed is not None and text.strip():
+                    # generation runs on past a complete object: cut it
+                    cut = True
+                    break
+                assembler.feed(text)
+        finally:
+            # closing the generator cancels the rest of the generation
+            if hasattr(stream, "aclose"):
+                await stream.aclose()
+
+        usage = self._usage(usage_metadata)
+        if cut:
+            # counts so far cover only part of the output
+            assembler.estimate_usage(usage)
+        return {
+            "content": assembler.content(),
+            "model": model or self.model,
+            "usage": usage,
+            "timing": assembler.timing(),
+        }
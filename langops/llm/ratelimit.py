@@ -0,0 +1,228 @@
+# ./llm/ratelimit.py
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from loguru import logger
+
+
+class AsyncRateLimiter:
+    """Token bucket limiting the number of requests started per minute."""
+
+    def __init__(self, requests_per_minute: float, burst: int | None = None) -> None:
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive")
+        self.rate = requests_per_minute / 60.0
+        self.capacity = float(burst if burst is not None else max(1, self.rate))
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    async def acquire(self, cost: float = 1) -> None:
+        """Take `cost` tokens; a cost above capacity waits for a full bucket."""
+        async with self._lock:
+            self._refill()
+            need = min(cost, self.capacity)
+            if self._tokens < need:
+                await asyncio.sleep((need - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= cost
+
+    def debit(self, cost: float) -> None:
+        """Correct an earlier estimate; the bucket may go negative."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens - cost)
+
+
+### Adaptive provider limiter
+
+
+def rate_limit_delay(exc: BaseException) -> float | None:
+    """Seconds the provider asked us to wait if `exc` is a 429, else None.
+
+    Reads `retry-after-ms` / `retry-after` from the error's HTTP response;
+    a 429 without a usable header yields 0.0.
+    """
+    status = getattr(exc, "status_code", None) or getattr(exc, "code", None)
+    if status != 429:
+        return None
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    for name, scale in (("retry-after-ms", 1e-3), ("retry-after", 1.0)):
+        try:
+            return max(0.0, float(headers.get(name)) * scale)
+        except (TypeError, ValueError):
+            continue
+    return 0.0
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Server errors and network failures worth retrying after a backoff."""
+    status = getattr(exc, "status_code", None) or getattr(exc, "code", None)
+    if isinstance(status, int) and 500 <= status < 600:
+        return True
+    network: tuple[type[BaseException], ...] = (TimeoutError, ConnectionError)
+    # only an already imported httpx can have raised; don't import it here
+    if (httpx := sys.modules.get("httpx")) is not None:
+        network += (httpx.TransportError,)
+    # SDKs wrap transport errors in their own types, raised `from` the original
+    return isinstance(exc, network) or isinstance(exc.__cause__, network)
+
+
+def estimate_tokens(messages: list[dict[str, Any]]) -> int:
+    """Rough input size (~4 chars per token) used before usage is known."""
+    return sum(len(str(m.get("content") or "")) // 4 + 4 for m in messages)
+
+
+class AdaptiveLimiter:
+    """Throttle shared by every adapter of one provider.
+
+    Each call takes a concurrency slot, one request token and an estimate of
+    its input tokens; the token bucket is corrected from the response usage.
+    Concurrency follows AIMD: every success adds 1/limit slots (about one
+    per round of calls), a 429 halves the limit and pauses new calls for the
+    provider's `retry-after`. 429s and transient errors are retried here, so
+    adapters should not retry them themselves.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        max_concurrency: int = 16,
+        min_concurrency: int = 1,
+        max_retries: int = 4,
+        backoff: float = 1.0,
+    ) -> None:
+        if not 1 <= min_concurrency <= max_concurrency:
+            raise ValueError("expected 1 <= min_concurrency <= max_concurrency")
+        self.requests = (
+            AsyncRateLimiter(requests_per_minute) if requests_per_minute else None
+        )
+        self.tokens = AsyncRateLimiter(tokens_per_minute) if tokens_per_minute else None
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self._waiters: list[asyncio.Future[None]] = []
+        self._resume_at = 0.0
+
+    async def _acquire_slot(self) -> None:
+        # plain futures rather than asyncio.Condition: the limiter outlives loops
+        while self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except BaseException:
+                # hand a wake-up this cancelled waiter received to the next one
+                self._waiters.remove(waiter)
+                self._wake()
+                raise
+            self._waiters.remove(waiter)
+        self.in_flight += 1
+
+    def _release_slot(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        free = int(self.limit) - self.in_flight
+        for waiter in self._waiters[: max(free, 0)]:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _on_success(self) -> None:
+        self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+
+    def _on_throttled(self, delay: float) -> None:
+        now = time.monotonic()
+        # a burst of 429s from calls already in flight is one congestion event
+        if now >= self._resume_at:
+            self.limit = max(self.min_concurrency, self.limit / 2)
+        self._resume_at = max(self._resume_at, now + delay)
+
+    async def _admit(self, estimated_tokens: int) -> None:
+        await self._acquire_slot()
+        try:
+            while (pause := self._resume_at - time.monotonic()) > 0:
+                await asyncio.sleep(pause)
+            if self.requests is not None:
+                await self.requests.acquire()
+            if self.tokens is not None:
+                await self.tokens.acquire(estimated_tokens)
+        except BaseException:
+            self._release_slot()
+            raise
+
+    def _settle(self, estimated_tokens: int, response: Any) -> None:
+        if self.tokens is None or not isinstance(response, dict):
+            return
+        usage = response.get("usage") or {}
+        used = (usage.get("input_tokens") or 0) + (usage.get("output_tokens") or 0)
+        if used:
+            self.tokens.debit(used - estimated_tokens)
+
+    async def call(
+        self, send: Callable[[], Awaitable[Any]], estimated_tokens: int = 0
+    ) -> Any:
+        """Run `send()` under the limiter, retrying 429s and transient errors."""
+        for attempt in range(self.max_retries + 1):
+            await self._admit(estimated_tokens)
+            try:
+                response = await send()
+            except Exception as e:
+                self._release_slot()
+                delay = rate_limit_delay(e)
+                if delay is not None:
+                    delay = delay or self.backoff * 2**attempt
+                    self._on_throttled(delay)
+                elif is_transient(e):
+                    delay = self.backoff * 2**attempt
+                else:
+                    raise
+                if attempt == self.max_retries:
+                    raise
+                logger.warning(
+                    f"LLM call failed ({type(e).__name__}), retry {attempt + 1}/"
+                    f"{self.max_retries} in {delay:.1f}s; "
+                    f"concurrency limit {int(self.limit)}"
+                )
+                await asyncio.sleep(delay)
+                continue
+            self._release_slot()
+            self._on_success()
+            self._settle(estimated_tokens, response)
+            return response
+
+
+_adaptive_limiters: dict[str, tuple[AdaptiveLimiter, dict[str, Any]]] = {}
+
+
+def get_adaptive_limiter(
+    provider: str, config: dict[str, Any] | None = None
+) -> AdaptiveLimiter:
+    """Return the process-wide adaptive limiter of a provider.
+
+    `config` holds AdaptiveLimiter keyword arguments, i.e. a profile's
+    `rate_limit` table. Without it the current limiter is reused (or a
+    default one created); a different config replaces it.
+    """
+    key = provider.lower().strip()
+    cached = _adaptive_limiters.get(key)
+    if cached is not None and (config is None or cached[1] == config):
+        return cached[0]
+    limiter = AdaptiveLimiter(**(config or {}))
+    _adaptive_limiters[key] = (limiter, dict(config or {}))
+    return limiter
@@ -0,0 +1,154 @@
+# ./llm/registry.py
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import importlib
+from typing import Any
+
+from loguru import logger
+
+from .adapters import BaseLLMAdapter
+from .cache import get_response_cache
+from .client import LLMClient
+from .ratelimit import get_adaptive_limiter
+
+AdapterKey = tuple[str, str, str | None]
+
+# adapters are bound to the event loop that created their HTTP pool
+_adapters: dict[
+    AdapterKey, tuple[BaseLLMAdapter, asyncio.AbstractEventLoop | None]
+] = {}
+_clients: dict[tuple[AdapterKey, str | None, bool, int | None], LLMClient] = {}
+
+
+def _credentials_key(api_key: str | None) -> str | None:
+    # never keep raw secrets in the registry key
+    if api_key is None:
+        return None
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+
+def _adapter_key(llm_provider: str, llm_model: str, api_key: str | None) -> AdapterKey:
+    return (
+        llm_provider.lower().strip(),
+        llm_model.strip(),
+        _credentials_key(api_key),
+    )
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+# provider -> module of its adapters; a provider's SDK is only imported
+# when an adapter for it is first built
+PROVIDER_MODULES = {
+    "anthropic": "langops.llm.providers.anthropic",
+    "vertexai": "langops.llm.providers.vertexai",
+}
+PROVIDER_ALIASES = {"vertex": "vertexai", "google": "vertexai", "gcp": "vertexai"}
+
+
+def _provider_module(llm_provider: str):
+    p = llm_provider.lower().strip()
+    p = PROVIDER_ALIASES.get(p, p)
+    if p not in PROVIDER_MODULES:
+        raise ValueError(f"Unsupported LLM provider: {llm_provider}")
+    return p, importlib.import_module(PROVIDER_MODULES[p])
+
+
+def build_adapter(
+    llm_provider: str, llm_model: str, api_key: str | None = None
+) -> BaseLLMAdapter:
+    p, module = _provider_module(llm_provider)
+    m = llm_model.lower().strip()
+
+    if p == "anthropic":
+        if m.startswith("claude-3"):
+            return module.AnthropicAdapter(model=llm_model, api_key=api_key)
+        return module.AnthropicAdapter2(model=llm_model, api_key=api_key)
+
+    return module.VertexAIAdapter(model=llm_model)
+
+
+def get_adapter(
+    llm_provider: str, llm_model: str, api_key: str | None = None
+) -> BaseLLMAdapter:
+    """Return the process-wide adapter for (provider, model, credentials).
+
+    The adapter and its HTTP connection pool are reused across calls. An entry
+    created on another (by now finished) event loop is rebuilt, since its
+    pooled connections cannot be awaited from the current loop. Every adapter
+    of a provider shares that provider's AdaptiveLimiter.
+    """
+    key = _adapter_key(llm_provider, llm_model, api_key)
+    loop = _running_loop()
+
+    cached = _adapters.get(key)
+    if cached is not None:
+        adapter, owner_loop = cached
+        if owner_loop is None or owner_loop is loop or not owner_loop.is_closed():
+            return adapter
+        logger.debug(f"Rebuilding LLM adapter {key[:2]}: owner event loop closed")
+
+    adapter = build_adapter(llm_provider, llm_model, api_key)
+    adapter.limiter = get_adaptive_limiter(llm_provider)
+    _adapters[key] = (adapter, loop)
+    return adapter
+
+
+def get_client(
+    llm_provider: str,
+    llm_model: str,
+    api_key: str | None = None,
+    cache: str | None = None,
+    rate_limit: dict[str, Any] | None = None,
+    stream: bool = False,
+    max_output_tokens: int | None = None,
+) -> LLMClient:
+    """Return the pooled LLMClient wrapping get_adapter() and the named cache.
+
+    `rate_limit` is the profile's AdaptiveLimiter config for the provider;
+    `stream` and `max_output_tokens` select the streaming response path.
+    """
+    key = _adapter_key(llm_provider, llm_model, api_key)
+    adapter = get_adapter(llm_provider, llm_model, api_key)
+    if rate_limit is not None:
+        adapter.limiter = get_adaptive_limiter(llm_provider, rate_limit)
+
+    client_key = (key, cache, stream, max_output_tokens)
+    client = _clients.get(client_key)
+    if client is None or client.adapter is not adapter:
+        client = LLMClient(
+            adapter=adapter,
+            cache=get_response_cache(cache),
+            stream=stream,
+            max_output_tokens=max_output_tokens,
+        )
+        _clients[client_key] = client
+    return client
+
+
+async def aclose_adapters() -> None:
+    """Close every pooled adapter owned by the running event loop.
+
+    Call this on the owning loop before it closes (the `analyze` CLI and the
+    Dagster runtime do): an adapter whose loop is already closed can no longer
+    close its HTTP pool and is only dropped from the registry.
+    """
+    loop = _running_loop()
+    for key, (adapter, owner_loop) in list(_adapters.items()):
+        if owner_loop is not None and owner_loop is not loop:
+            if owner_loop.is_closed():
+                _adapters.pop(key, None)
+            continue
+        _adapters.pop(key, None)
+        try:
+            await adapter.aclose()
+        except Exception as e:
+            logger.warning(f"Closing LLM adapter {key[:2]} failed: {e}")
+
@@ -0,0 +1,89 @@
+# ./llm/validation.py
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+from typing import Any
+
+from loguru import logger
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+
+class OutputValidator:
+    """Cached per-model validation of structured LLM output.
+
+    JSON text is parsed and validated in one pydantic-core pass; tool-use
+    dict content is validated directly. Only output that fails goes through
+    Guardrails, whose Guard is built once per model on first repair.
+    """
+
+    def __init__(self, model: type[BaseModel]) -> None:
+        self.model = model
+        self.adapter = TypeAdapter(model)
+        self.json_schema = model.model_json_schema()
+        self._guard = None
+
+    def validate(self, content: Any) -> BaseModel:
+        """Raises ValidationError on bad output, TypeError on unusable content."""
+        if isinstance(content, self.model):
+            return content
+        if isinstance(content, dict):
+            return self.adapter.validate_python(content)
+        if isinstance(content, (str, bytes)):
+            return self.adapter.validate_json(content)
+        raise TypeError(f"Unsupported content type: {type(content).__name__}")
+
+    def guard(self):
+        if self._guard is None:
+            # Guardrails is slow to import and only needed to repair output
+            from guardrails import Guard
+
+            self._guard = Guard.for_pydantic(self.model)
+        return self._guard
+
+    def repair(self, content: Any) -> BaseModel | None:
+        raw = content if isinstance(content, str) else json.dumps(content, default=str)
+        guard = self.guard()
+        try:
+            validated = guard.parse(raw, reask_on_fail=False).validated_output
+        except Exception as e:
+            logger.warning(f"Guardrails repair failed for {self.model.__name__}: {e}")
+            return None
+        finally:
+            # a cached Guard would otherwise keep every call in its history
+            guard.history.clear()
+        try:
+            return self.validate(validated)
+        except (ValidationError, TypeError):
+            return None
+
+    def validate_or_repair(self, content: Any) -> tuple[BaseModel, bool]:
+        """(instance, repaired); re-raises the fast-path error if repair fails."""
+        try:
+            return self.validate(content), False
+        except ValidationError:
+            repaired = self.repair(content)
+            if repaired is None:
+                raise
+            logger.info(f"Guardrails repair applied for {self.model.__name__}")
+            return repaired, True
+
+
+@lru_cache(maxsize=None)
+def get_validator(model: type[BaseModel]) -> OutputValidator:
+    return OutputValidator(model)
+
+
+def response_content(response: dict[str, Any]) -> Any:
+    """The structured part of a response: tool-use dict, JSON text or text block."""
+    content = response.get("content")
+    if isinstance(content, list) and content and isinstance(content[0], dict):
+        block = content[0]
+        return (
+            block.get("input") if block.get("type") == "tool_use" else block.get("text")
+        )
+    return content
+
+
+def is_json_error(error: ValidationError) -> bool:
+    return any(e["type"] == "json_invalid" for e in error.errors())
@@ -1,16 +1,20 @@
 # ./orchestration/dagster/__init__.py
 from dagster import Definitions
 
+from langops.llm.profiles import get_profile_store
+
 from .config_loader import load_settings
 from .graphs import *  # noqa: F403
 from .jobs import (
     analyse_new_sentences_sentiment_job,
+    analyse_new_sentences_sentiment_sharded_job,
     ingest_new_documents_job,
     scraping_data_job,
     scraping_meta_job,
     split_new_docs_into_sentences_and_persist_job,
 )
 from .ops import *  # noqa: F403
+from .resources import get_async_runtime
 from .schedules import *  # noqa: F403
 from .sensors import (
     analyse_new_sentences_sentiment_sensor,
@@ -18,6 +22,9 @@ from .sensors import (
     split_new_docs_into_sentences_and_persist_sensor,
 )
 
+# a broken profiles.toml fails the code location load, not the first run
+get_profile_store()
+
 # DAGster uses these defs implicitly
 # ```
 # if hasattr(module, "defs"):
@@ -28,6 +35,7 @@ defs = Definitions(
         ingest_new_documents_job,
         split_new_docs_into_sentences_and_persist_job,
         analyse_new_sentences_sentiment_job,
+        analyse_new_sentences_sentiment_sharded_job,
         scraping_meta_job,
         scraping_data_job,
     ],  # noqa: F405
@@ -37,6 +45,6 @@ defs = Definitions(
         split_new_docs_into_sentences_and_persist_sensor,
         analyse_new_sentences_sentiment_sensor,
     ],
-    # context.resources.settings
-    resources={"settings": load_settings()},
+    # context.resources.settings / context.resources.runtime
+    resources={"settings": load_settings(), "runtime": get_async_runtime()},
 )
@@ -3,9 +3,12 @@ from dagster import graph
 
 from .ops import (
     analyse_new_sentences_sentiment_and_persist_op,
+    analyse_sentence_shard_op,
+    collect_sentiment_stats_op,
     get_unscraped_colls_op,
-    ingest_add_document_op,
+    ingest_documents_op,
     scraping_op,
+    shard_unprocessed_sentences_op,
     split_sentences_and_persist_op,
     update_coll_op,
 )
@@ -13,7 +16,7 @@ from .ops import (
 
 @graph
 def ingest_new_documents_graph():
-    ingest_add_document_op()
+    ingest_documents_op()
 
 
 @graph
@@ -27,6 +30,12 @@ def analyse_new_sentences_sentiment_graph():
     analyse_new_sentences_sentiment_and_persist_op()
 
 
+@graph
+def analyse_new_sentences_sentiment_sharded_graph():
+    shard_stats = shard_unprocessed_sentences_op().map(analyse_sentence_shard_op)
+    collect_sentiment_stats_op(shard_stats.collect())
+
+
 ### Client Side Graphs
 
 
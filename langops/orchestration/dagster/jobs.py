@@ -3,6 +3,7 @@ from dagster import job
 
 from .graphs import (
     analyse_new_sentences_sentiment_graph,
+    analyse_new_sentences_sentiment_sharded_graph,
     ingest_new_documents_graph,
     scraping_raw_graph,
     split_new_docs_into_sentences_and_persist_graph,
@@ -24,6 +25,11 @@ def analyse_new_sentences_sentiment_job():
     analyse_new_sentences_sentiment_graph()
 
 
+@job
+def analyse_new_sentences_sentiment_sharded_job():
+    analyse_new_sentences_sentiment_sharded_graph()
+
+
 ###
 
 scraping_meta_job = scraping_raw_graph.to_job(
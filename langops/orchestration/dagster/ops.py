@@ -1,65 +1,131 @@
 # ./orchestration/dagster/ops.py
-import asyncio
-
-from langops.persistence.models.sentence import SentenceType
-from langops.persistence.repository.sentence_repo import SentenceRepository
-from langops.persistence.repository.sentence_sentiment_repo import (
-    SentenceSentimentRepository,
-)
 from langops.persistence.session import get_async_session
 from langops.tasks.add_document import add_document_from_json
-from langops.tasks.analyse_sentiment_sentence import run_sentiment_analysis
-from langops.tasks.doc_sentence_splitter import split_sentences_regex
+from langops.tasks.analyse_sentiment_sentence import (
+    analyse_unprocessed_sentences,
+    plan_sentiment_shards,
+)
+from langops.tasks.doc_sentence_splitter import split_unprocessed_documents
+from langops.tasks.ingest_documents import ingest_documents
 from loguru import logger
 
-from dagster import DynamicOut, DynamicOutput, Out, op
+from dagster import Backoff, DynamicOut, DynamicOutput, Out, RetryPolicy, op
 
 
-@op(out=Out(dict))
-def ingest_add_document_op(_context, json_path):
+@op(out=Out(dict), required_resource_keys={"runtime"})
+def ingest_add_document_op(context, json_path):
     logger.info(f"Ingesting document from {json_path}")
-    result = asyncio.run(add_document_from_json(json_path, skip_duplicates=True))
+    result = context.resources.runtime.run(
+        add_document_from_json(json_path, skip_duplicates=True)
+    )
     return {"status": "success", "document": str(result)}
 
 
-@op(out=Out(None))
-async def split_sentences_and_persist_op(_context):
-    logger.info("Splitting sentences for unprocessed documents...")
-
-    unprocessed_docs = None
-    async with get_async_session() as session:
-        unprocessed_docs = await SentenceRepository().get_unprocessed(session)
-        for doc in unprocessed_docs:
-            sentences = await split_sentences_regex(doc.content)
-
-            repo = SentenceRepository()
-            for sent in sentences:
-                entity = repo.entity(
-                    sentence_type=SentenceType.OTHER,
-                    text=sent,
-                    text_hash=repo.compute_hash(sent),
-                    **{repo.fk_field: doc.id},
-                )
-                await repo.create(session, entity)
-
-        logger.info(f"Split {len(unprocessed_docs)} documents into sentences.")
+@op(out=Out(dict), required_resource_keys={"runtime"})
+def ingest_documents_op(context, json_paths: list[str]):
+    logger.info(f"Ingesting {len(json_paths)} document file(s)")
+    return context.resources.runtime.run(ingest_documents(json_paths))
 
 
-@op(out=Out(list))
-async def analyse_new_sentences_sentiment_and_persist_op(_context):
+@op(out=Out(dict), required_resource_keys={"settings", "runtime"})
+def split_sentences_and_persist_op(context):
+    logger.info("Splitting sentences for unprocessed documents...")
+    settings = context.resources.settings
+    segmentation = settings.get("segmentation", {})
+    return context.resources.runtime.run(
+        split_unprocessed_documents(
+            backend=segmentation.get("backend", "regex"),
+            max_workers=segmentation.get("max_workers"),
+            chunk_chars=segmentation.get("chunk_chars", 200_000),
+            page_size=settings["batches"]["docs"],
+        )
+    )
+
+
+def _sentiment_options(settings: dict) -> dict:
+    concurrency = settings.get("concurrency", {})
+    queue = settings.get("queue", {})
+    return {
+        "page_size": settings["batches"]["sents"],
+        "max_in_flight": concurrency.get("max_in_flight", 8),
+        "mode": settings["batches"].get("mode", "online"),
+        "pack_size": settings["batches"].get("pack_size", 20),
+        "pack_tokens": settings["batches"].get("pack_tokens", 2000),
+        "source": queue.get("source", "queue"),
+        "lease_seconds": queue.get("lease_seconds", 600),
+        "max_attempts": queue.get("max_attempts", 3),
+    }
+
+
+@op(out=Out(dict), required_resource_keys={"settings", "runtime"})
+def analyse_new_sentences_sentiment_and_persist_op(context):
     logger.info("Running sentiment analysis on new sentences...")
-    analyzed = []
-    unprocessed_sentences = None
-    async with get_async_session() as session:
-        unprocessed_sentences = await SentenceSentimentRepository.get_unprocessed(
-            session
+    settings = context.resources.settings
+    runtime = context.resources.runtime
+    try:
+        stats = runtime.run(
+            analyse_unprocessed_sentences(
+                **_sentiment_options(settings),
+                backfill=settings.get("queue", {}).get("backfill", True),
+            )
+        )
+    finally:
+        # adapters and the engine stay open on the runtime loop for the next
+        # run; only queued telemetry is delivered here
+        runtime.flush()
+    logger.info(f"Sentiment analysis finished: {stats}")
+    return stats
+
+
+@op(out=DynamicOut(list), required_resource_keys={"settings", "runtime"})
+def shard_unprocessed_sentences_op(context):
+    settings = context.resources.settings
+    shards = settings.get("shards", {})
+    ranges = context.resources.runtime.run(
+        plan_sentiment_shards(
+            max_shards=shards.get("max_shards", 4),
+            min_shard_size=shards.get("min_shard_size", 100),
+            backfill=settings.get("queue", {}).get("backfill", True),
         )
-        for sentence in unprocessed_sentences:
-            model, status = await run_sentiment_analysis(
-                text=sentence.text, sentence_id=sentence.id, persist_override=False
+    )
+    logger.info(f"Sentiment backlog split into {len(ranges)} shard(s): {ranges}")
+    for lo, hi in ranges:
+        yield DynamicOutput([lo, hi], mapping_key=f"ids_{lo}_{hi}")
+
+
+@op(
+    out=Out(dict),
+    required_resource_keys={"settings", "runtime"},
+    # only the failing shard is re-run; a failed attempt releases its claims,
+    # so the retry picks the same items up again under its new worker id
+    retry_policy=RetryPolicy(max_retries=3, delay=30, backoff=Backoff.EXPONENTIAL),
+)
+def analyse_sentence_shard_op(context, id_range: list):
+    runtime = context.resources.runtime
+    lo, hi = id_range
+    try:
+        stats = runtime.run(
+            analyse_unprocessed_sentences(
+                **_sentiment_options(context.resources.settings),
+                id_range=(lo, hi),
             )
-            logger.info(f"Analyzed {model.__class__.__name__} with status {status}")
-    return analyzed
+        )
+    finally:
+        runtime.flush()
+    logger.info(f"Shard [{lo}, {hi}) finished: {stats}")
+    return {"shard": [lo, hi], **stats}
+
+
+@op(out=Out(dict))
+def collect_sentiment_stats_op(_context, shard_stats: list[dict]):
+    totals: dict[str, int] = {}
+    for stats in shard_stats:
+        for key, value in stats.items():
+            if key != "shard":
+                totals[key] = totals.get(key, 0) + value
+    totals["shards"] = len(shard_stats)
+    logger.info(f"Sharded sentiment analysis finished: {totals}")
+    return totals
 
 
 ### Client Side
@@ -0,0 +1,103 @@
+# ./orchestration/dagster/resources.py
+from __future__ import annotations
+
+import asyncio
+import atexit
+import threading
+from collections.abc import Coroutine
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, TypeVar
+
+from langops.hooks.sink import drain_sinks
+from langops.llm.registry import aclose_adapters
+from langops.persistence.session import dispose_engine, init_engine_v2
+from langops.persistence.writer import close_writer
+from loguru import logger
+
+T = TypeVar("T")
+
+
+class AsyncRuntime:
+    """One long-lived event loop per process, running on a daemon thread.
+
+    Ops and sensors are synchronous and submit coroutines with `run()`, so
+    the DB engine, LLM adapters and telemetry sinks are created once on this
+    loop and reused by every run in the process, instead of being rebuilt
+    (and bound to a dead loop) by an `asyncio.run()` per call.
+    """
+
+    def __init__(self) -> None:
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._start()
+            return self._loop
+
+    def _start(self) -> None:
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(
+            target=loop.run_forever, name="langops-async-runtime", daemon=True
+        )
+        thread.start()
+        self._loop, self._thread = loop, thread
+        # the engine is created on, and its connections bound to, this loop
+        asyncio.run_coroutine_threadsafe(self._init(), loop).result()
+        logger.debug("Async runtime loop started")
+
+    @staticmethod
+    async def _init() -> None:
+        init_engine_v2()
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+        """Run `coro` on the runtime loop and block until it returns."""
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("AsyncRuntime.run() called from its own loop")
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    def flush(self) -> None:
+        """Deliver queued telemetry; sinks restart lazily on the next event."""
+        if self._loop is not None and not self._loop.is_closed():
+            self.run(drain_sinks())
+
+    def close(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or loop.is_closed():
+                return
+
+            async def _shutdown() -> None:
+                await drain_sinks()
+                await aclose_adapters()
+                await close_writer()
+                await dispose_engine()
+
+            try:
+                asyncio.run_coroutine_threadsafe(_shutdown(), loop).result(30)
+            except Exception as e:
+                logger.warning(f"Async runtime shutdown incomplete: {e}")
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+            loop.close()
+            self._loop = self._thread = None
+            logger.debug("Async runtime loop stopped")
+
+
+_runtime = AsyncRuntime()
+
+
+def get_async_runtime() -> AsyncRuntime:
+    return _runtime
+
+
+atexit.register(_runtime.close)
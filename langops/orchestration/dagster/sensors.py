@@ -1,23 +1,68 @@
 # ./orchestration/dagster/sensors.py
-import asyncio
 import hashlib
 import time
 from pathlib import Path
 
-from langops.persistence.repository.sentence_repo import SentenceRepository
-from langops.persistence.repository.sentence_sentiment_repo import (
-    SentenceSentimentRepository,
+from langops.persistence.repository.document_repo import DocumentRepository
+from langops.persistence.repository.work_queue_repo import (
+    SENTIMENT_QUEUE,
+    WorkQueueRepository,
 )
 from langops.persistence.session import get_async_session
-
-from dagster import DefaultSensorStatus, RunRequest, SkipReason, sensor
+from langops.tasks.analyse_sentiment_sentence import backfill_sentiment_queue
+
+from dagster import (
+    DagsterRunStatus,
+    DefaultSensorStatus,
+    RunRequest,
+    RunsFilter,
+    SkipReason,
+    sensor,
+)
 
 from .jobs import (
-    analyse_new_sentences_sentiment_job,
+    analyse_new_sentences_sentiment_sharded_job,
     ingest_new_documents_job,
     split_new_docs_into_sentences_and_persist_job,
 )
 
+# tag carrying the highest document id a split run was started for
+MAX_DOCUMENT_ID_TAG = "langops/max_document_id"
+# a failed run is not relaunched before this many seconds
+RETRY_AFTER_FAILURE_S = 60
+
+IN_FLIGHT = {
+    DagsterRunStatus.QUEUED,
+    DagsterRunStatus.NOT_STARTED,
+    DagsterRunStatus.MANAGED,
+    DagsterRunStatus.STARTING,
+    DagsterRunStatus.STARTED,
+    DagsterRunStatus.CANCELING,
+}
+
+
+def _latest_run(context, job):
+    records = context.instance.get_run_records(
+        filters=RunsFilter(job_name=job.name), limit=1
+    )
+    return records[0] if records else None
+
+
+def _busy_reason(record) -> str | None:
+    """Why a new run of the job must wait, given its newest run record."""
+    if record is None:
+        return None
+    run = record.dagster_run
+    if run.status in IN_FLIGHT:
+        return f"Run {run.run_id} is still {run.status.value}."
+    if (
+        run.status == DagsterRunStatus.FAILURE
+        and record.end_time is not None
+        and time.time() - record.end_time < RETRY_AFTER_FAILURE_S
+    ):
+        return f"Run {run.run_id} failed; retrying after {RETRY_AFTER_FAILURE_S}s."
+    return None
+
 
 @sensor(
     job=ingest_new_documents_job,
@@ -47,19 +92,23 @@ def ingest_new_documents_sensor(context):
         return
 
     candidates.sort(key=lambda x: x[1])
-    max_mtime = last_mtime
-
-    for file, mtime in candidates:
-        max_mtime = max(max_mtime, mtime)
-        run_key = f"{str(file)}::{int(mtime)}"
+    max_mtime = max(last_mtime, candidates[-1][1])
+
+    # one run per `batches.docs` files instead of one run per file
+    batch_size = max(1, settings["batches"]["docs"])
+    for i in range(0, len(candidates), batch_size):
+        batch = candidates[i : i + batch_size]
+        paths = [str(file) for file, _ in batch]
+        batch_src = "|".join(f"{file}::{int(mtime)}" for file, mtime in batch)
+        run_key = "ingest_" + hashlib.md5(batch_src.encode("utf-8")).hexdigest()[:16]
         yield RunRequest(
             run_key=run_key,
             run_config={
                 "ops": {
                     "ingest_new_documents_graph": {
                         "ops": {
-                            "ingest_add_document_op": {
-                                "inputs": {"json_path": {"value": str(file)}}
+                            "ingest_documents_op": {
+                                "inputs": {"json_paths": {"value": paths}}
                             }
                         }
                     }
@@ -72,55 +121,66 @@ def ingest_new_documents_sensor(context):
 
 @sensor(
     job=split_new_docs_into_sentences_and_persist_job,
+    required_resource_keys={"runtime"},
     minimum_interval_seconds=5,
     default_status=DefaultSensorStatus.STOPPED,
 )
 def split_new_docs_into_sentences_and_persist_sensor(context):
-    async def fetch_unprocessed_ids():
-        async with get_async_session() as session:
-            docs = await SentenceRepository().get_unprocessed(session)
-            return sorted(d.id for d in docs)
-
-    unprocessed_ids = asyncio.run(fetch_unprocessed_ids())
-    if not unprocessed_ids:
-        yield SkipReason("No documents waiting for sentence split.")
+    # cursor = highest document id covered by a successful split run; it only
+    # moves once that run succeeded, so a failed run is requested again
+    record = _latest_run(context, split_new_docs_into_sentences_and_persist_job)
+    last_id = int(context.cursor) if context.cursor else 0
+    if record is not None and record.dagster_run.status == DagsterRunStatus.SUCCESS:
+        done_id = int(record.dagster_run.tags.get(MAX_DOCUMENT_ID_TAG, 0))
+        if done_id > last_id:
+            last_id = done_id
+            context.update_cursor(str(last_id))
+
+    busy = _busy_reason(record)
+    if busy:
+        yield SkipReason(busy)
         return
 
-    fingerprint_src = ",".join(map(str, unprocessed_ids))
-    fingerprint = hashlib.md5(fingerprint_src.encode("utf-8")).hexdigest()
+    async def fetch_max_document_id():
+        async with get_async_session() as session:
+            return await DocumentRepository().get_max_id(session)
 
-    if context.cursor == fingerprint:
-        yield SkipReason("No change in unprocessed document set.")
+    max_id = context.resources.runtime.run(fetch_max_document_id())
+    if max_id <= last_id:
+        yield SkipReason("No new documents since the last split run.")
         return
 
-    run_key = f"split_new_docs_{fingerprint[:12]}_{int(time.time())}"
-    context.update_cursor(fingerprint)
-    yield RunRequest(run_key=run_key)
+    yield RunRequest(tags={MAX_DOCUMENT_ID_TAG: str(max_id)})
 
 
 @sensor(
-    job=analyse_new_sentences_sentiment_job,
+    job=analyse_new_sentences_sentiment_sharded_job,
+    required_resource_keys={"settings", "runtime"},
     minimum_interval_seconds=5,
     default_status=DefaultSensorStatus.STOPPED,
 )
 def analyse_new_sentences_sentiment_sensor(context):
-    async def fetch_unprocessed_sentence_ids():
-        async with get_async_session() as session:
-            sentences = await SentenceSentimentRepository().get_unprocessed(session)
-            return sorted(s.id for s in sentences)
-
-    unprocessed_ids = asyncio.run(fetch_unprocessed_sentence_ids())
-    if not unprocessed_ids:
-        yield SkipReason("No new sentences awaiting sentiment analysis.")
+    backfill = context.resources.settings.get("queue", {}).get("backfill", True)
+
+    # one run at a time drains the queue; items it releases or abandons are
+    # picked up by the next run once this one is over
+    busy = _busy_reason(
+        _latest_run(context, analyse_new_sentences_sentiment_sharded_job)
+    )
+    if busy:
+        yield SkipReason(busy)
         return
 
-    fingerprint_src = ",".join(map(str, unprocessed_ids))
-    fingerprint = hashlib.md5(fingerprint_src.encode("utf-8")).hexdigest()
+    async def fetch_queue_watermark():
+        # a database from before the queue has its backlog enqueued once
+        if backfill:
+            await backfill_sentiment_queue()
+        async with get_async_session() as session:
+            return await WorkQueueRepository().watermark(session, SENTIMENT_QUEUE)
 
-    if context.cursor == fingerprint:
-        yield SkipReason("No change in unprocessed sentence set.")
+    max_id, has_claimable = context.resources.runtime.run(fetch_queue_watermark())
+    if not has_claimable:
+        yield SkipReason("No claimable sentences in the sentiment queue.")
         return
 
-    run_key = f"analyse_sentiments_{fingerprint[:12]}_{int(time.time())}"
-    context.update_cursor(fingerprint)
-    yield RunRequest(run_key=run_key)
+    yield RunRequest(tags={"langops/max_work_item_id": str(max_id)})
@@ -3,6 +3,8 @@ from .base import BaseLLMResponseModel  # noqa: F401
 from .document import DocumentEntity  # noqa: F401
 from .sentence import (  # noqa: F401
     SentenceEntity,
+    SentenceSentimentBatchResponseModel,
     SentenceSentimentEntity,
     SentenceSentimentResponseModel,
 )
+from .work_queue import WorkItemEntity, WorkStatus  # noqa: F401
@@ -30,6 +30,15 @@ class SentenceSentimentResponseModel(BaseLLMResponseModel):
     sentiment_confidence: float = PydField(ge=0.0, le=1.0)
 
 
+class SentenceSentimentItem(SentenceSentimentResponseModel):
+    # 1-based position of the sentence in the packed prompt
+    n: int
+
+
+class SentenceSentimentBatchResponseModel(BaseLLMResponseModel):
+    items: list[SentenceSentimentItem]
+
+
 class SentenceEntity(BaseEntityModel, table=True):
     __tablename__ = "sentences"
     id: int | None = SQLField(default=None, primary_key=True)
@@ -0,0 +1,48 @@
+# ./persistence/models/work_queue.py
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import Column, Index, String, Text
+from sqlalchemy import Enum as SAEnum
+from sqlmodel import Field as SQLField
+
+from langops.persistence.models.base import BaseEntityModel
+
+
+class WorkStatus(str, Enum):
+    PENDING = "pending"
+    CLAIMED = "claimed"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class WorkItemEntity(BaseEntityModel, table=True):
+    """One unit of work (e.g. a sentence awaiting sentiment) in a named queue.
+
+    `process_id` holds the worker that currently owns the lease.
+    """
+
+    __tablename__ = "work_queue"
+    id: int | None = SQLField(default=None, primary_key=True)
+    __table_args__ = (
+        Index("ix_work_queue_queue_ref", "queue", "ref_id", unique=True),
+        # claim scans: oldest claimable items of a queue
+        Index("ix_work_queue_claim", "queue", "status", "id"),
+    )
+
+    queue: str = SQLField(sa_column=Column(String, nullable=False))
+    ref_id: int = SQLField(nullable=False)
+    status: WorkStatus = SQLField(
+        sa_column=Column(
+            SAEnum(WorkStatus, name="work_status_enum"),
+            nullable=False,
+            default=WorkStatus.PENDING,
+        )
+    )
+    attempts: int = SQLField(default=0, nullable=False)
+    lease_expires_at: datetime | None = SQLField(default=None)
+    last_error: str | None = SQLField(
+        default=None, sa_column=Column(Text, nullable=True)
+    )
@@ -3,3 +3,4 @@ from .base_repo import BaseRepository  # noqa: F401
 from .document_repo import DocumentRepository  # noqa: F401
 from .sentence_repo import SentenceRepository  # noqa: F401
 from .sentence_sentiment_repo import SentenceSentimentRepository  # noqa: F401
+from .work_queue_repo import WorkQueueRepository  # noqa: F401
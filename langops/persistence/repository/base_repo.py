@@ -2,11 +2,26 @@
 from __future__ import annotations
 
 import hashlib
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from typing import Any
 
+from langops.persistence.models.base import BaseEntityModel
+from sqlalchemy import exists, func, insert
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from langops.persistence.models.base import BaseEntityModel
+
+def dialect_insert(session: AsyncSession):
+    """INSERT construct with ON CONFLICT support for the session's dialect."""
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        raise NotImplementedError(f"ON CONFLICT inserts are not supported on {dialect}")
+    return insert
 
 
 class BaseRepository:
@@ -23,32 +38,88 @@ class BaseRepository:
         return hashlib.md5(text.encode()).hexdigest()
 
     @classmethod
-    async def get_unprocessed(
-        cls, session: AsyncSession, limit: int = 100
-    ) -> list[BaseEntityModel] | None:
+    def _unprocessed_stmt(
+        cls, limit: int | None, after_id: int | None, before_id: int | None = None
+    ):
+        """Parents without a child row, in id order, within (after_id, before_id).
+
+        NOT EXISTS is an anti-join probe on the child's indexed fk column, and
+        `id > after_id ORDER BY id` is a range scan on the parent's primary
+        key, so each page costs O(limit) regardless of table size.
+        """
         if not cls.parent_entity or not cls.fk_field:
             raise NotImplementedError(
                 f"GUARD: {cls.__name__} does not support get_unprocessed(), "
                 f"because it has no parent entity."
             )
 
+        fk = getattr(cls.entity, cls.fk_field)
         stmt = (
             select(cls.parent_entity)
-            .outerjoin(
-                cls.entity,
-                getattr(cls.entity, cls.fk_field) == cls.parent_entity.id,
-            )
-            .where(getattr(cls.entity, "id").is_(None))
+            .where(~exists().where(fk == cls.parent_entity.id))
+            .order_by(cls.parent_entity.id)
             .limit(limit)
         )
+        if after_id is not None:
+            stmt = stmt.where(cls.parent_entity.id > after_id)
+        if before_id is not None:
+            stmt = stmt.where(cls.parent_entity.id < before_id)
+        return stmt
 
-        result = await session.exec(stmt)
+    @classmethod
+    async def get_unprocessed(
+        cls,
+        session: AsyncSession,
+        limit: int = 100,
+        after_id: int | None = None,
+        before_id: int | None = None,
+    ) -> list[BaseEntityModel] | None:
+        result = await session.exec(cls._unprocessed_stmt(limit, after_id, before_id))
         return result.all()
 
+    @classmethod
+    async def iter_unprocessed(
+        cls,
+        session: AsyncSession,
+        page_size: int = 500,
+        after_id: int | None = None,
+    ) -> AsyncIterator[list[BaseEntityModel]]:
+        """Stream unprocessed parents page by page with keyset pagination.
+
+        Use a dedicated read session: it is cleared once the caller moves past
+        a page, so memory stays bounded by one page however long the backlog.
+        """
+        while True:
+            page = await cls.get_unprocessed(
+                session, limit=page_size, after_id=after_id
+            )
+            if not page:
+                return
+            after_id = page[-1].id
+            yield page
+            session.expunge_all()
+            if len(page) < page_size:
+                return
+
     async def get_by_id(self, session: AsyncSession, id: int) -> BaseEntityModel | None:
         result = await session.exec(select(self.entity).where(self.entity.id == id))
         return result.one_or_none()
 
+    async def get_max_id(self, session: AsyncSession) -> int:
+        """Highest primary key so far; a cheap high-water mark for new rows."""
+        result = await session.exec(select(func.max(self.entity.id)))
+        return result.one() or 0
+
+    async def get_by_ids(
+        self, session: AsyncSession, ids: list[int]
+    ) -> list[BaseEntityModel]:
+        if not ids:
+            return []
+        result = await session.exec(
+            select(self.entity).where(self.entity.id.in_(ids)).order_by(self.entity.id)
+        )
+        return list(result.all())
+
     async def create(
         self,
         session: AsyncSession,
@@ -75,6 +146,31 @@ class BaseRepository:
         await session.flush()
         return entities
 
+    async def insert_many(
+        self,
+        session: AsyncSession,
+        rows: list[dict[str, Any]],
+        chunk_size: int = 500,
+    ) -> int:
+        """Bulk INSERT plain row dicts as executemany, one statement per chunk.
+
+        Unlike create_many() no ORM objects are built or refreshed, so ids are
+        not returned. Timestamps are filled in since SQLModel default factories
+        only run on model instantiation.
+        """
+        if not rows:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        stmt = insert(self.entity)
+        for start in range(0, len(rows), chunk_size):
+            chunk = [
+                {"created_at": now, "updated_at": now, **row}
+                for row in rows[start : start + chunk_size]
+            ]
+            await session.execute(stmt, chunk)
+        return len(rows)
+
     async def update(
         self, session: AsyncSession, updated_entity: BaseEntityModel
     ) -> BaseEntityModel:
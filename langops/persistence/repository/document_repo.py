@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from loguru import logger
+from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from langops.persistence.models.document import DocumentEntity, DocumentType
@@ -33,3 +34,16 @@ class DocumentRepository(BaseRepository):
             created_doc = await self.create(session, doc)
             logger.debug(f"Created document ID={created_doc.id}")
             return created_doc.id
+
+    async def get_existing_hashes(
+        self, session: AsyncSession, hashes: list[str]
+    ) -> set[str]:
+        """Return the subset of content hashes already stored, in one query."""
+        if not hashes:
+            return set()
+        result = await session.exec(
+            select(DocumentEntity.content_hash).where(
+                DocumentEntity.content_hash.in_(hashes)
+            )
+        )
+        return set(result.all())
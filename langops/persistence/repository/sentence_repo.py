@@ -1,9 +1,16 @@
 # ./persistence/repository/sentence_repo.py
 from __future__ import annotations
 
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
 from langops.persistence.models.document import DocumentEntity
-from langops.persistence.models.sentence import SentenceEntity
+from langops.persistence.models.sentence import SentenceEntity, SentenceType
 from langops.persistence.repository.base_repo import BaseRepository
+from langops.persistence.repository.work_queue_repo import (
+    SENTIMENT_QUEUE,
+    WorkQueueRepository,
+)
 
 
 class SentenceRepository(BaseRepository):
@@ -13,3 +20,54 @@ class SentenceRepository(BaseRepository):
 
     def __init__(self) -> None:
         super().__init__()
+
+    async def get_text_hashes(self, session: AsyncSession, doc_id: int) -> set[str]:
+        result = await session.exec(
+            select(SentenceEntity.text_hash).where(SentenceEntity.doc_id == doc_id)
+        )
+        return set(result.all())
+
+    async def bulk_insert_sentences(
+        self,
+        session: AsyncSession,
+        doc_id: int,
+        sentences: list[str],
+        sentence_type: SentenceType = SentenceType.OTHER,
+        chunk_size: int = 500,
+    ) -> int:
+        """Insert a document's sentences in chunks, skipping repeated text_hash.
+
+        Sentences already stored for the document and repeats within the list
+        are dropped, and new sentences are enqueued for sentiment analysis.
+        Returns the number of rows inserted; the caller commits.
+        """
+        seen = await self.get_text_hashes(session, doc_id)
+        rows = []
+        for text in sentences:
+            text_hash = self.compute_hash(text)
+            if text_hash in seen:
+                continue
+            seen.add(text_hash)
+            rows.append(
+                {
+                    "doc_id": doc_id,
+                    "sentence_type": sentence_type,
+                    "text": text,
+                    "text_hash": text_hash,
+                }
+            )
+        if not rows:
+            return 0
+        # ids only grow, so the rows of this call are the ones above prev_max
+        prev_max = await self.get_max_id(session)
+        inserted = await self.insert_many(session, rows, chunk_size=chunk_size)
+        if inserted:
+            # new sentences go straight into the sentiment work queue
+            await WorkQueueRepository().enqueue_select(
+                session,
+                SENTIMENT_QUEUE,
+                select(SentenceEntity.id).where(
+                    SentenceEntity.doc_id == doc_id, SentenceEntity.id > prev_max
+                ),
+            )
+        return inserted
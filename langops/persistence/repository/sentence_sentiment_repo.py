@@ -13,7 +13,7 @@ from langops.persistence.models.sentence import (
     SentenceSentimentEntity,
     SentenceSentimentResponseModel,
 )
-from langops.persistence.repository.base_repo import BaseRepository
+from langops.persistence.repository.base_repo import BaseRepository, dialect_insert
 
 
 class SentenceSentimentRepository(BaseRepository):
@@ -41,6 +41,20 @@ class SentenceSentimentRepository(BaseRepository):
         sentence_sentiment_entity = await session.exec(stmt_sentiment)
         return sentence_sentiment_entity.scalar_one_or_none()
 
+    async def analysed_ids(
+        self, session: AsyncSession, sentence_ids: list[int]
+    ) -> set[int]:
+        """The given sentences that already have a sentiment stored."""
+        if not sentence_ids:
+            return set()
+        result = await session.exec(
+            select(SentenceSentimentEntity.sentence_id).where(
+                SentenceSentimentEntity.sentence_id.in_(sentence_ids),
+                SentenceSentimentEntity.sentiment.is_not(None),
+            )
+        )
+        return set(result.scalars().all())
+
     async def upsert(
         self,
         session: AsyncSession,
@@ -48,59 +62,99 @@ class SentenceSentimentRepository(BaseRepository):
         text: str,
         response_llm_instance: SentenceSentimentResponseModel,
         persist_override: bool,
-    ) -> tuple[SentenceSentimentEntity, str]:
+    ) -> tuple[SentenceSentimentResponseModel | None, str]:
         if sentence_id is None:
             raise ValueError("sentence_id cannot be None during upsert()")
 
-        existing = await self.get_by_sentence_id_and_hash(session, sentence_id, text)
-
-        if existing:
-            log.info("Existing sentiment analysis found, proceeding")
-
-            if persist_override:
-                log.info("Existing sentiment analysis found re-analyzing")
-
-                existing.sentiment = response_llm_instance.sentiment
-                existing.sentiment_confidence = (
-                    response_llm_instance.sentiment_confidence
-                )
-                existing.sentiment_calls += 1
-                existing.updated_at = datetime.now(timezone.utc)
-
-                await self.update(session, existing)
-
-                log.info(f"Updated sentiment id={existing.id}")
-                return response_llm_instance, "updated"
-
-            if not persist_override and existing.sentiment is None:
-                log.info("Existing sentiment analysis found but empty, re-analyzing")
-                log.warning(
-                    "override=False but sentiment is empty ⇒ semantic overriding"
-                )
-
-                existing.sentiment = response_llm_instance.sentiment
-                existing.sentiment_confidence = (
-                    response_llm_instance.sentiment_confidence
-                )
-                existing.sentiment_calls += 1
-                existing.updated_at = datetime.now(timezone.utc)
-
-                await self.update(session, existing)
-                await session.flush()
-                await session.refresh(existing)
-                log.info(f"Updated sentiment id={existing.id}")
-                return existing, "updated semantically"
-
-        if not existing:
-            log.info("No existing sentiment analysis found, proceeding")
-            # REFACTOR: from_llm_output base method that must be overridden by subclass
-            new_entity = SentenceSentimentEntity.from_llm_output(
-                llm_output=response_llm_instance,
-                sentence_id=sentence_id,
+        stats = await self.upsert_many(
+            session,
+            [(sentence_id, self.compute_hash(text), response_llm_instance)],
+            persist_override=persist_override,
+        )
+        if stats["created"]:
+            log.info(f"Created new sentiment for sentence_id={sentence_id}")
+            return response_llm_instance, "created"
+        if stats["updated"]:
+            status = "updated" if persist_override else "updated semantically"
+            log.info(f"Sentiment {status} for sentence_id={sentence_id}")
+            return response_llm_instance, status
+        if stats["stale"]:
+            log.warning(f"Sentence {sentence_id} text changed, result not stored")
+            return None, "stale"
+        log.info("Existing sentiment analysis found, not overriding")
+        return None, "skipped"
+
+    async def upsert_many(
+        self,
+        session: AsyncSession,
+        items: list[tuple[int, str, SentenceSentimentResponseModel]],
+        persist_override: bool = False,
+        chunk_size: int = 500,
+    ) -> dict[str, int]:
+        """Store (sentence_id, text_hash, result) items with one statement per chunk.
+
+        Runs INSERT ... ON CONFLICT(sentence_id) DO UPDATE with
+        `sentiment_calls` incremented in SQL. An existing row is only
+        overwritten with persist_override or while its sentiment is still
+        empty (semantic override). Items whose text_hash no longer matches
+        the sentence are counted as stale and skipped.
+        """
+        stats = {"created": 0, "updated": 0, "skipped": 0, "stale": 0}
+        if not items:
+            return stats
+
+        table = SentenceSentimentEntity.__table__
+        insert = dialect_insert(session)
+        now = datetime.now(timezone.utc)
+
+        for start in range(0, len(items), chunk_size):
+            chunk = items[start : start + chunk_size]
+            # current hash and existing sentiment row in one round-trip
+            result = await session.exec(
+                select(SentenceEntity.id, SentenceEntity.text_hash, table.c.id)
+                .outerjoin(table, table.c.sentence_id == SentenceEntity.id)
+                .where(SentenceEntity.id.in_({sid for sid, _, _ in chunk}))
             )
-            await self.create(session, new_entity)
-            await session.flush()
-            await session.refresh(new_entity)
-            log.info(f"Created new sentiment id={new_entity.id}")
-            return new_entity, "created"
-        return None, "error"
+            current = {sid: (h, row_id) for sid, h, row_id in result.all()}
+
+            # the last result per sentence wins; a statement may not touch a
+            # conflicting row twice
+            values: dict[int, dict] = {}
+            for sentence_id, text_hash, model in chunk:
+                if current.get(sentence_id, (None,))[0] != text_hash:
+                    stats["stale"] += 1
+                    continue
+                values[sentence_id] = {
+                    "sentence_id": sentence_id,
+                    "sentiment": model.sentiment,
+                    "sentiment_confidence": model.sentiment_confidence,
+                    "sentiment_calls": 1,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            if not values:
+                continue
+
+            stmt = insert(table).values(list(values.values()))
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.sentence_id],
+                set_={
+                    "sentiment": stmt.excluded.sentiment,
+                    "sentiment_confidence": stmt.excluded.sentiment_confidence,
+                    "sentiment_calls": table.c.sentiment_calls + 1,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+                where=None if persist_override else table.c.sentiment.is_(None),
+            ).returning(table.c.sentence_id)
+            written = set((await session.execute(stmt)).scalars().all())
+
+            for sentence_id in values:
+                if sentence_id not in written:
+                    stats["skipped"] += 1
+                elif current[sentence_id][1] is None:
+                    stats["created"] += 1
+                else:
+                    stats["updated"] += 1
+
+        log.debug(f"Sentiment upsert_many: {stats}")
+        return stats
@@ -0,0 +1,299 @@
+# ./persistence/repository/work_queue_repo.py
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import and_, case, func, literal, or_, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from langops.persistence.models.work_queue import WorkItemEntity, WorkStatus
+from langops.persistence.repository.base_repo import BaseRepository, dialect_insert
+
+SENTIMENT_QUEUE = "sentence_sentiment"
+
+_t = WorkItemEntity.__table__
+
+
+def _status(status: WorkStatus):
+    # typed so the enum is stored the way the column stores it
+    return literal(status, type_=_t.c.status.type)
+
+
+class WorkQueueRepository(BaseRepository):
+    """Claim-based work queue over the `work_queue` table.
+
+    Items are enqueued once per (queue, ref_id). Workers claim a batch with
+    a lease, then ack or release it; an expired lease makes the item
+    claimable again. `process_id` records the lease holder and `attempts`
+    counts claims, so an item that keeps failing ends up FAILED.
+    """
+
+    entity = WorkItemEntity
+    parent_entity = None
+    fk_field = None
+
+    def __init__(self) -> None:
+        super().__init__()
+
+    async def enqueue(
+        self, session: AsyncSession, queue: str, ref_ids: list[int]
+    ) -> int:
+        """Add ref_ids to a queue; ids already queued are left untouched."""
+        if not ref_ids:
+            return 0
+        now = datetime.now(timezone.utc)
+        insert = dialect_insert(session)
+        stmt = (
+            insert(_t)
+            .values(
+                [
+                    {
+                        "queue": queue,
+                        "ref_id": ref_id,
+                        "status": WorkStatus.PENDING,
+                        "attempts": 0,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for ref_id in dict.fromkeys(ref_ids)
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=[_t.c.queue, _t.c.ref_id])
+        )
+        result = await session.execute(stmt)
+        return result.rowcount
+
+    async def enqueue_select(
+        self, session: AsyncSession, queue: str, ref_ids: Any
+    ) -> int:
+        """Enqueue the ids produced by a single-column SELECT, server side.
+
+        SQLite needs a WHERE clause in the SELECT for INSERT ... SELECT ...
+        ON CONFLICT to parse, so pass a filtered select.
+        """
+        now = datetime.now(timezone.utc)
+        source = ref_ids.subquery()
+        insert = dialect_insert(session)
+        stmt = insert(_t).from_select(
+            ["queue", "ref_id", "status", "attempts", "created_at", "updated_at"],
+            select(
+                literal(queue),
+                source.c[0],
+                _status(WorkStatus.PENDING),
+                literal(0),
+                literal(now, type_=_t.c.created_at.type),
+                literal(now, type_=_t.c.updated_at.type),
+            ).where(source.c[0].is_not(None)),
+        )
+        stmt = stmt.on_conflict_do_nothing(index_elements=[_t.c.queue, _t.c.ref_id])
+        result = await session.execute(stmt)
+        return result.rowcount
+
+    async def backfill(
+        self, session: AsyncSession, queue: str, repo: type[BaseRepository]
+    ) -> int:
+        """Enqueue every parent that `repo.get_unprocessed()` would report."""
+        unprocessed = repo._unprocessed_stmt(limit=None, after_id=None)
+        return await self.enqueue_select(
+            session, queue, unprocessed.with_only_columns(repo.parent_entity.id)
+        )
+
+    async def backfill_once(
+        self, session: AsyncSession, queue: str, repo: type[BaseRepository]
+    ) -> int | None:
+        """Run `backfill()` the first time it is called for `queue` on a database.
+
+        A DONE marker item in `<queue>:backfill` records the run; it is
+        inserted in the same transaction, so concurrent callers backfill
+        once. Returns None when the backfill already ran.
+        """
+        marker = f"{queue}:backfill"
+        done = await session.execute(
+            select(_t.c.id).where(_t.c.queue == marker).limit(1)
+        )
+        if done.first() is not None:
+            return None
+        now = datetime.now(timezone.utc)
+        insert = dialect_insert(session)
+        result = await session.execute(
+            insert(_t)
+            .values(
+                queue=marker,
+                ref_id=0,
+                status=WorkStatus.DONE,
+                attempts=0,
+                created_at=now,
+                updated_at=now,
+            )
+            .on_conflict_do_nothing(index_elements=[_t.c.queue, _t.c.ref_id])
+        )
+        if not result.rowcount:
+            return None
+        return await self.backfill(session, queue, repo)
+
+    async def claim(
+        self,
+        session: AsyncSession,
+        queue: str,
+        process_id: str,
+        limit: int = 100,
+        lease_seconds: float = 600,
+        max_attempts: int = 3,
+        ref_range: tuple[int, int] | None = None,
+    ) -> list[int]:
+        """Atomically lease up to `limit` of the oldest claimable ref_ids.
+
+        `ref_range` = [lo, hi) restricts the claim to one shard of ref_ids.
+
+        Claimable means PENDING, or CLAIMED with an expired lease. A single
+        UPDATE ... RETURNING takes the batch, so concurrent workers never
+        share an item; on PostgreSQL the candidate rows are locked with
+        SKIP LOCKED so workers do not queue behind each other.
+        """
+        now = datetime.now(timezone.utc)
+        expired = and_(_t.c.status == WorkStatus.CLAIMED, _t.c.lease_expires_at < now)
+
+        # leases that ran out on their last attempt will not be retried
+        await session.execute(
+            update(_t)
+            .where(_t.c.queue == queue, expired, _t.c.attempts >= max_attempts)
+            .values(status=WorkStatus.FAILED, lease_expires_at=None, updated_at=now)
+        )
+
+        candidates = (
+            select(_t.c.id)
+            .where(
+                _t.c.queue == queue,
+                or_(_t.c.status == WorkStatus.PENDING, expired),
+                _t.c.attempts < max_attempts,
+            )
+            .order_by(_t.c.id)
+            .limit(limit)
+        )
+        if ref_range is not None:
+            candidates = candidates.where(
+                _t.c.ref_id >= ref_range[0], _t.c.ref_id < ref_range[1]
+            )
+        if session.get_bind().dialect.name == "postgresql":
+            candidates = candidates.with_for_update(skip_locked=True)
+
+        result = await session.execute(
+            update(_t)
+            .where(_t.c.id.in_(candidates.scalar_subquery()))
+            .values(
+                status=WorkStatus.CLAIMED,
+                process_id=process_id,
+                attempts=_t.c.attempts + 1,
+                lease_expires_at=now + timedelta(seconds=lease_seconds),
+                updated_at=now,
+            )
+            .returning(_t.c.ref_id)
+        )
+        ref_ids = sorted(result.scalars().all())
+        if ref_ids:
+            logger.debug(f"{process_id} claimed {len(ref_ids)} item(s) of {queue}")
+        return ref_ids
+
+    async def ack(
+        self, session: AsyncSession, queue: str, ref_ids: list[int], process_id: str
+    ) -> int:
+        """Mark leased items done; items whose lease was lost are not touched."""
+        if not ref_ids:
+            return 0
+        result = await session.execute(
+            update(_t)
+            .where(self._held_by(queue, ref_ids, process_id))
+            .values(
+                status=WorkStatus.DONE,
+                lease_expires_at=None,
+                last_error=None,
+                updated_at=datetime.now(timezone.utc),
+            )
+        )
+        return result.rowcount
+
+    async def release(
+        self,
+        session: AsyncSession,
+        queue: str,
+        ref_ids: list[int],
+        process_id: str,
+        error: str | None = None,
+        max_attempts: int = 3,
+    ) -> int:
+        """Give leased items back for retry, or FAILED once out of attempts."""
+        if not ref_ids:
+            return 0
+        result = await session.execute(
+            update(_t)
+            .where(self._held_by(queue, ref_ids, process_id))
+            .values(
+                status=case(
+                    (_t.c.attempts >= max_attempts, _status(WorkStatus.FAILED)),
+                    else_=_status(WorkStatus.PENDING),
+                ),
+                lease_expires_at=None,
+                last_error=error,
+                updated_at=datetime.now(timezone.utc),
+            )
+        )
+        return result.rowcount
+
+    async def watermark(self, session: AsyncSession, queue: str) -> tuple[int, bool]:
+        """(highest item id, whether `queue` has claimable work) in two probes.
+
+        The id is the table-wide max(id) on the primary key: it grows with
+        every enqueue. Claimable matches `claim`: PENDING, or CLAIMED with an
+        expired lease, so released and abandoned items count as work again.
+        """
+        now = datetime.now(timezone.utc)
+        max_id = await session.execute(select(func.max(_t.c.id)))
+        open_item = await session.execute(
+            select(_t.c.id)
+            .where(
+                _t.c.queue == queue,
+                or_(
+                    _t.c.status == WorkStatus.PENDING,
+                    and_(
+                        _t.c.status == WorkStatus.CLAIMED,
+                        _t.c.lease_expires_at < now,
+                    ),
+                ),
+            )
+            .limit(1)
+        )
+        return max_id.scalar_one() or 0, open_item.first() is not None
+
+    async def open_ref_bounds(
+        self, session: AsyncSession, queue: str
+    ) -> tuple[int, int] | None:
+        """(min, max) ref_id of the pending or claimed items of `queue`."""
+        result = await session.execute(
+            select(func.min(_t.c.ref_id), func.max(_t.c.ref_id)).where(
+                _t.c.queue == queue,
+                _t.c.status.in_([WorkStatus.PENDING, WorkStatus.CLAIMED]),
+            )
+        )
+        lo, hi = result.one()
+        return None if lo is None else (lo, hi)
+
+    async def counts(self, session: AsyncSession, queue: str) -> dict[str, int]:
+        result = await session.execute(
+            select(_t.c.status, func.count())
+            .where(_t.c.queue == queue)
+            .group_by(_t.c.status)
+        )
+        counts = {status.value: 0 for status in WorkStatus}
+        counts.update({status.value: n for status, n in result.all()})
+        return counts
+
+    @staticmethod
+    def _held_by(queue: str, ref_ids: list[int], process_id: str):
+        return and_(
+            _t.c.queue == queue,
+            _t.c.ref_id.in_(ref_ids),
+            _t.c.process_id == process_id,
+            _t.c.status == WorkStatus.CLAIMED,
+        )
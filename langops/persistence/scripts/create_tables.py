@@ -4,6 +4,7 @@ import asyncio
 from config import settings
 from langops.persistence.models.document import DocumentEntity  # noqa: F401
 from langops.persistence.models.sentence import SentenceSentimentEntity  # noqa: F401
+from langops.persistence.models.work_queue import WorkItemEntity  # noqa: F401
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import SQLModel
 
@@ -48,6 +48,25 @@ def init_engine_v2() -> None:
     )
 
 
+def get_engine() -> AsyncEngine:
+    if _engine is None:
+        init_engine_v2()
+    return _engine
+
+
+async def dispose_engine() -> None:
+    """Close pooled connections; the next session re-creates the engine.
+
+    aiosqlite connections belong to the loop that opened them, so call this
+    on that loop before it is closed.
+    """
+    global _engine, _SessionLocal
+    if _engine is None:
+        return
+    engine, _engine, _SessionLocal = _engine, None, None
+    await engine.dispose()
+
+
 @event.listens_for(Engine, "connect")
 def set_sqlite_pragmas_v2(dbapi_connection, connection_record):
     try:
@@ -0,0 +1,212 @@
+# ./persistence/writer.py
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from typing import Any, TypeVar
+
+from config import settings
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from langops.persistence.session import get_async_session, get_engine
+
+T = TypeVar("T")
+WriteFn = Callable[[AsyncSession], Awaitable[T]]
+
+_STOP = object()
+
+
+@dataclass
+class WriterStats:
+    writes: int = 0
+    rows: int = 0
+    commits: int = 0
+    # groups rolled back and replayed one write per transaction
+    replayed_groups: int = 0
+    failed: int = 0
+
+
+@dataclass
+class _Intent:
+    fn: WriteFn
+    rows: int
+    future: asyncio.Future
+
+
+class WriteBehindWriter:
+    """A single task that owns one write connection and group-commits writes.
+
+    Callers `submit()` an async function of a session and await its result.
+    The writer runs queued functions back to back in one transaction and
+    commits once `max_rows` rows are pending or `max_delay` seconds after the
+    first of them arrived; futures resolve after that commit. When a write
+    raises, the group is rolled back and replayed one write per transaction,
+    so only the failing write sees the error. Reads stay on the pool.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        *,
+        max_rows: int = 500,
+        max_delay: float = 0.02,
+        max_queue: int = 10_000,
+    ) -> None:
+        self.engine = engine
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self.stats = WriterStats()
+        self._queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=max_queue)
+        self._task: asyncio.Task | None = None
+        self._closed = False
+
+    def _ensure_started(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="sql-writer")
+
+    async def submit(self, fn: WriteFn[T], rows: int = 1) -> T:
+        """Queue `fn` and wait until the transaction that ran it is committed."""
+        if self._closed:
+            raise RuntimeError("SQL writer is closed")
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_Intent(fn, max(rows, 1), future))
+        return await future
+
+    async def _run(self) -> None:
+        try:
+            await self._serve()
+        except Exception as e:
+            # e.g. no connection: fail the waiting writes, restart on next submit
+            logger.error(f"SQL writer stopped: {e}")
+            self._task = None
+            while not self._queue.empty():
+                intent = self._queue.get_nowait()
+                if intent is not _STOP:
+                    self._fail(intent, e)
+
+    async def _serve(self) -> None:
+        loop = asyncio.get_running_loop()
+        async with self.engine.connect() as conn:
+            stopping = False
+            while not stopping:
+                intent = await self._queue.get()
+                if intent is _STOP:
+                    break
+                group, rows = [intent], intent.rows
+                deadline = loop.time() + self.max_delay
+                while rows < self.max_rows:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        intent = await asyncio.wait_for(self._queue.get(), timeout)
+                    except TimeoutError:
+                        break
+                    if intent is _STOP:
+                        stopping = True
+                        break
+                    group.append(intent)
+                    rows += intent.rows
+                await self._commit_group(conn, group)
+
+    async def _commit_group(self, conn: AsyncConnection, group: list[_Intent]) -> None:
+        # a caller that gave up before its turn does not get written
+        group = [i for i in group if not i.future.done()]
+        if not group:
+            return
+        try:
+            results = await self._transaction(conn, group)
+        except Exception as e:
+            if len(group) == 1:
+                self._fail(group[0], e)
+                return
+            self.stats.replayed_groups += 1
+            logger.warning(f"SQL writer: group of {len(group)} failed ({e}), replaying")
+            for intent in group:
+                try:
+                    (result,) = await self._transaction(conn, [intent])
+                except Exception as e:
+                    self._fail(intent, e)
+                    continue
+                self._resolve(intent, result)
+            return
+        for intent, result in zip(group, results):
+            self._resolve(intent, result)
+
+    async def _transaction(
+        self, conn: AsyncConnection, group: list[_Intent]
+    ) -> list[Any]:
+        async with AsyncSession(
+            bind=conn, expire_on_commit=False, autoflush=False
+        ) as session:
+            try:
+                results = [await intent.fn(session) for intent in group]
+                await session.commit()
+            except BaseException:
+                await session.rollback()
+                raise
+        self.stats.commits += 1
+        self.stats.writes += len(group)
+        self.stats.rows += sum(i.rows for i in group)
+        return results
+
+    def _resolve(self, intent: _Intent, result: Any) -> None:
+        if not intent.future.done():
+            intent.future.set_result(result)
+
+    def _fail(self, intent: _Intent, error: Exception) -> None:
+        self.stats.failed += 1
+        if not intent.future.done():
+            intent.future.set_exception(error)
+
+    async def aclose(self) -> None:
+        """Commit what is queued, then release the write connection."""
+        self._closed = True
+        if self._task is None:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        logger.debug(f"SQL writer closed: {asdict(self.stats)}")
+
+
+_writers: dict[asyncio.AbstractEventLoop, WriteBehindWriter] = {}
+
+
+def write_behind_enabled() -> bool:
+    return settings.sqlite_write_behind and settings.database_url.startswith("sqlite")
+
+
+def get_writer() -> WriteBehindWriter:
+    """Return the writer of the running loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    for key in [k for k in _writers if k.is_closed()]:
+        _writers.pop(key)
+
+    writer = _writers.get(loop)
+    if writer is None:
+        writer = WriteBehindWriter(
+            get_engine(),
+            max_rows=settings.write_batch_rows,
+            max_delay=settings.write_batch_ms / 1000,
+        )
+        _writers[loop] = writer
+    return writer
+
+
+async def run_write(fn: WriteFn[T], rows: int = 1) -> T:
+    """Run a write through the SQLite writer, or in its own session elsewhere."""
+    if write_behind_enabled():
+        return await get_writer().submit(fn, rows)
+    async with get_async_session() as session:
+        return await fn(session)
+
+
+async def close_writer() -> None:
+    """Drain and close the running loop's writer (call before dispose_engine)."""
+    writer = _writers.pop(asyncio.get_running_loop(), None)
+    if writer is not None:
+        await writer.aclose()
@@ -3,20 +3,51 @@ from __future__ import annotations
 
 import asyncio
 import json
+import os
+import socket
+from uuid import uuid4
 
 import typer
 from loguru import logger as log
 
+from langops.hooks.runner import hook_timing_summary
+from langops.hooks.sink import drain_sinks
+from langops.llm.cache import cache_stats
+from langops.llm.ratelimit import estimate_tokens
+from langops.llm.registry import aclose_adapters
 from langops.persistence.models.sentence import (
+    SentenceEntity,
+    SentenceSentimentBatchResponseModel,
     SentenceSentimentEntity,
     SentenceSentimentResponseModel,
 )
+from langops.persistence.repository.sentence_repo import SentenceRepository
 from langops.persistence.repository.sentence_sentiment_repo import (
     SentenceSentimentRepository,
 )
+from langops.persistence.repository.work_queue_repo import (
+    SENTIMENT_QUEUE,
+    WorkQueueRepository,
+)
 from langops.persistence.session import get_async_session
+from langops.persistence.writer import close_writer, run_write
 from langops.tasks.base import GenericLLMTask
-from langops.tasks.prompts.prompt_sentiment import build_sentiment_prompt
+from langops.tasks.batch_executor import BatchExecutor
+from langops.tasks.prompts.prompt_sentiment import (
+    build_sentiment_batch_input,
+    build_sentiment_input,
+    build_sentiment_prefix,
+)
+
+
+def _sentiment_task(profile: str | None) -> GenericLLMTask:
+    return GenericLLMTask(
+        llm_output_model=SentenceSentimentResponseModel,
+        db_entity_model=SentenceSentimentEntity,
+        mongo_coll_name="llm_calls_sentiment",
+        operation_name="sentiment_analysis",
+        profile=profile or "dev",
+    )
 
 
 async def run_sentiment_analysis(
@@ -29,10 +60,17 @@ async def run_sentiment_analysis(
     ### Persist Related
     sentence_id: int | None = None,
     persist_override: bool = False,
+    persist: bool = True,
+    check_existing: bool = True,
 ) -> tuple[SentenceSentimentResponseModel, str]:
-    async with get_async_session() as session:
-        repo = SentenceSentimentRepository()
-        existing = await repo.get_by_sentence_id_and_hash(session, sentence_id, text)
+    existing = None
+    # callers that page over unprocessed sentences already know there is none
+    if check_existing:
+        async with get_async_session() as session:
+            repo = SentenceSentimentRepository()
+            existing = await repo.get_by_sentence_id_and_hash(
+                session, sentence_id, text
+            )
 
     # The part of the upsert logic outside the upsert() method prevents unnecessary LLM
     if existing and existing.sentiment is not None and not persist_override:
@@ -40,25 +78,22 @@ async def run_sentiment_analysis(
         cached_model = SentenceSentimentResponseModel.model_validate(existing)
         return cached_model, "cached"
 
-    llm_task = GenericLLMTask(
-        llm_output_model=SentenceSentimentResponseModel,
-        db_entity_model=SentenceSentimentEntity,
-        mongo_coll_name="llm_calls_sentiment",
-        operation_name="sentiment_analysis",
-        profile=profile,
-    )
+    llm_task = _sentiment_task(profile)
 
-    prompt = build_sentiment_prompt(text, in_context_learning)
+    # instruction and shots form a cacheable prefix, the sentence the suffix
+    prompt = build_sentiment_input(text)
     log.debug("Prompt prepared")
 
-    payload = await llm_task.run_llm_request(
+    payload = await llm_task.run(
         user_role="user",
         prompt=prompt,
+        system_prompt=build_sentiment_prefix(in_context_learning),
         temperature=temperature,
         text=text,
         ref_id=sentence_id,
         ref_field_name="sentence_id",
-        repo=SentenceSentimentRepository,
+        # persist=False leaves the write to the caller, e.g. batched commits
+        repo=SentenceSentimentRepository if persist else None,
         persist_override=persist_override,
     )
 
@@ -69,6 +104,368 @@ async def run_sentiment_analysis(
     return created_model, "created"
 
 
+async def run_sentiment_analysis_batch(
+    sentences: list[SentenceEntity],
+    *,
+    profile: str | None = None,
+    temperature: float | None = None,
+    in_context_learning: str | None = None,
+    **batch_options,
+) -> list[tuple[SentenceSentimentResponseModel, str] | Exception]:
+    """Analyse sentences through one provider batch job; results are not persisted.
+
+    Meant for bulk backfills of unprocessed sentences, so the per-sentence
+    existing-result lookup of run_sentiment_analysis() is skipped.
+    """
+    llm_task = _sentiment_task(profile)
+    results = await llm_task.run_batch(
+        [
+            {
+                "user_role": "user",
+                "prompt": build_sentiment_input(s.text),
+                "system_prompt": build_sentiment_prefix(in_context_learning),
+                "temperature": temperature,
+                "text": s.text,
+                "ref_id": s.id,
+                "ref_field_name": "sentence_id",
+            }
+            for s in sentences
+        ],
+        **batch_options,
+    )
+    return [
+        result
+        if isinstance(result, Exception)
+        else (
+            SentenceSentimentResponseModel.model_validate(result.response_llm_instance),
+            "created",
+        )
+        for result in results
+    ]
+
+
+def pack_sentences(
+    sentences: list[SentenceEntity], max_items: int = 20, max_tokens: int = 2000
+) -> list[list[SentenceEntity]]:
+    """Group sentences in order into packs of <= max_items and ~max_tokens.
+
+    A sentence larger than the token budget gets a pack of its own.
+    """
+    packs: list[list[SentenceEntity]] = []
+    pack: list[SentenceEntity] = []
+    tokens = 0
+    for sentence in sentences:
+        cost = estimate_tokens([{"content": sentence.text}])
+        if pack and (len(pack) >= max_items or tokens + cost > max_tokens):
+            packs.append(pack)
+            pack, tokens = [], 0
+        pack.append(sentence)
+        tokens += cost
+    if pack:
+        packs.append(pack)
+    return packs
+
+
+async def run_sentiment_analysis_packed(
+    sentences: list[SentenceEntity],
+    *,
+    profile: str | None = None,
+    temperature: float | None = None,
+    in_context_learning: str | None = None,
+) -> list[tuple[SentenceSentimentResponseModel, str] | Exception]:
+    """Analyse a pack of sentences in one structured-output call; not persisted.
+
+    Items are mapped back to sentences by their prompt position `n`.
+    Sentences the model dropped or answered twice, or the whole pack when
+    the call fails, fall back to one run_sentiment_analysis() call each.
+    """
+    llm_task = GenericLLMTask(
+        llm_output_model=SentenceSentimentBatchResponseModel,
+        mongo_coll_name="llm_calls_sentiment",
+        operation_name="sentiment_analysis_packed",
+        profile=profile or "dev",
+    )
+    items = []
+    try:
+        payload = await llm_task.run(
+            user_role="user",
+            prompt=build_sentiment_batch_input([s.text for s in sentences]),
+            system_prompt=build_sentiment_prefix(in_context_learning, packed=True),
+            temperature=temperature,
+        )
+        items = payload.response_llm_instance.items
+    except Exception as e:
+        log.warning(f"Packed sentiment call for {len(sentences)} sentences failed: {e}")
+
+    by_position: dict[int, SentenceSentimentResponseModel] = {}
+    repeated: set[int] = set()
+    for item in items:
+        if item.n in by_position:
+            repeated.add(item.n)
+        by_position[item.n] = SentenceSentimentResponseModel.model_validate(
+            item.model_dump(exclude={"n"})
+        )
+
+    results: list[tuple[SentenceSentimentResponseModel, str] | Exception | None] = [
+        None if n in repeated or n not in by_position else (by_position[n], "created")
+        for n in range(1, len(sentences) + 1)
+    ]
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing and items:
+        log.warning(
+            f"Packed sentiment answered {len(sentences) - len(missing)}/"
+            f"{len(sentences)} sentences, falling back for the rest"
+        )
+    fallback = await asyncio.gather(
+        *(
+            run_sentiment_analysis(
+                sentences[i].text,
+                profile=profile,
+                temperature=temperature,
+                in_context_learning=in_context_learning,
+                sentence_id=sentences[i].id,
+                persist=False,
+                check_existing=False,
+            )
+            for i in missing
+        ),
+        return_exceptions=True,
+    )
+    for i, result in zip(missing, fallback):
+        results[i] = result
+    return results
+
+
+async def backfill_sentiment_queue(
+    queue: WorkQueueRepository | None = None,
+) -> int | None:
+    """Enqueue sentences stored before the queue existed, once per database."""
+    queue = queue or WorkQueueRepository()
+    added = await run_write(
+        lambda session: queue.backfill_once(
+            session, SENTIMENT_QUEUE, SentenceSentimentRepository
+        )
+    )
+    if added is not None:
+        log.info(f"Backfilled {added} sentence(s) into {SENTIMENT_QUEUE}")
+    return added
+
+
+def _worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+
+async def analyse_unprocessed_sentences(
+    *,
+    page_size: int = 20,
+    max_in_flight: int = 8,
+    profile: str = "dev",
+    temperature: float | None = None,
+    in_context_learning: str | None = None,
+    mode: str = "online",
+    pack_size: int = 20,
+    pack_tokens: int = 2000,
+    source: str = "queue",
+    lease_seconds: float = 600,
+    max_attempts: int = 3,
+    backfill: bool = True,
+    id_range: tuple[int, int] | None = None,
+) -> dict[str, int]:
+    """Analyse the unprocessed sentence backlog page by page.
+
+    With source="queue" pages are leased from the sentiment work queue, so
+    concurrent runs never analyse the same sentence; failed items are
+    released for retry until `max_attempts`, and claimed sentences that
+    already have a sentiment (e.g. from the `analyze` CLI) are acked without
+    a call. `backfill` enqueues the sentences stored before the queue
+    existed, once per database. source="scan" pages through the anti-join
+    instead, for single-worker use. `id_range` = [lo, hi) limits the run to
+    one shard of sentence ids.
+
+    In "online" mode each page is fanned out with at most ``max_in_flight``
+    concurrent LLM calls (throttled by the provider AdaptiveLimiter); in "packed"
+    mode the page is cut into packs of up to ``pack_size`` sentences and
+    ``pack_tokens`` input tokens, one call per pack; in "batch" mode each page
+    is one provider batch job. Every page is persisted in one transaction.
+    """
+    if mode not in {"online", "packed", "batch"}:
+        raise ValueError(f"Unsupported sentiment execution mode: {mode}")
+    if source not in {"queue", "scan"}:
+        raise ValueError(f"Unsupported sentence source: {source}")
+
+    executor = BatchExecutor(max_in_flight=max_in_flight)
+
+    async def _analyse(sentence: SentenceEntity):
+        return await run_sentiment_analysis(
+            text=sentence.text,
+            profile=profile,
+            temperature=temperature,
+            in_context_learning=in_context_learning,
+            sentence_id=sentence.id,
+            persist=False,
+            check_existing=False,
+        )
+
+    async def _analyse_pack(pack: list[SentenceEntity]):
+        return await run_sentiment_analysis_packed(
+            pack,
+            profile=profile,
+            temperature=temperature,
+            in_context_learning=in_context_learning,
+        )
+
+    queue = WorkQueueRepository()
+    worker_id = _worker_id()
+    if source == "queue" and backfill:
+        await backfill_sentiment_queue(queue)
+
+    async def _release_claimed(claimed: list[int], error: BaseException) -> None:
+        # a failed attempt hands its page back now instead of letting the
+        # leases run out: a retry runs under a new worker id
+        try:
+            await run_write(
+                lambda session: queue.release(
+                    session,
+                    SENTIMENT_QUEUE,
+                    claimed,
+                    worker_id,
+                    error=repr(error),
+                    max_attempts=max_attempts,
+                )
+            )
+        except Exception as release_error:
+            log.error(f"Could not release {len(claimed)} claim(s): {release_error}")
+
+    stats = {"pages": 0, "analysed": 0, "cached": 0, "skipped": 0, "failed": 0}
+    after_id: int | None = id_range[0] - 1 if id_range else None
+    while True:
+        if source == "queue":
+            claimed = await run_write(
+                lambda session: queue.claim(
+                    session,
+                    SENTIMENT_QUEUE,
+                    worker_id,
+                    limit=page_size,
+                    lease_seconds=lease_seconds,
+                    max_attempts=max_attempts,
+                    ref_range=id_range,
+                )
+            )
+        async with get_async_session() as session:
+            if source == "queue":
+                page = await SentenceRepository().get_by_ids(session, claimed)
+                # analysed since they were enqueued: ack instead of re-sending
+                analysed = await SentenceSentimentRepository().analysed_ids(
+                    session, claimed
+                )
+                page = [s for s in page if s.id not in analysed]
+                stats["skipped"] += len(analysed)
+            else:
+                page = await SentenceSentimentRepository.get_unprocessed(
+                    session,
+                    limit=page_size,
+                    after_id=after_id,
+                    before_id=id_range[1] if id_range else None,
+                )
+                claimed = [s.id for s in page]
+        if not claimed:
+            break
+        after_id = claimed[-1]
+        stats["pages"] += 1
+
+        try:
+            if not page:
+                results = []
+            elif mode == "batch":
+                results = await run_sentiment_analysis_batch(
+                    page,
+                    profile=profile,
+                    temperature=temperature,
+                    in_context_learning=in_context_learning,
+                )
+            elif mode == "packed":
+                packs = pack_sentences(page, pack_size, pack_tokens)
+                packed = await executor.map(packs, _analyse_pack)
+                results = [
+                    result
+                    for pack, pack_results in zip(packs, packed)
+                    for result in (
+                        [pack_results] * len(pack)
+                        if isinstance(pack_results, BaseException)
+                        else pack_results
+                    )
+                ]
+            else:
+                results = await executor.map(page, _analyse)
+
+            items, failed = [], {}
+            for sentence, result in zip(page, results):
+                if isinstance(result, BaseException):
+                    log.error(f"Sentiment failed for id={sentence.id}: {result}")
+                    stats["failed"] += 1
+                    failed[sentence.id] = repr(result)
+                    continue
+                model, status = result
+                if status == "cached":
+                    stats["cached"] += 1
+                    continue
+                items.append((sentence.id, sentence.text_hash, model))
+
+            async def _persist_page(session) -> dict[str, int]:
+                written = await SentenceSentimentRepository().upsert_many(
+                    session, items
+                )
+                if source == "queue":
+                    # deleted sentences are acked along with the processed ones
+                    done = [sid for sid in claimed if sid not in failed]
+                    await queue.ack(session, SENTIMENT_QUEUE, done, worker_id)
+                    for sid, error in failed.items():
+                        await queue.release(
+                            session,
+                            SENTIMENT_QUEUE,
+                            [sid],
+                            worker_id,
+                            error=error,
+                            max_attempts=max_attempts,
+                        )
+                return written
+
+            written = await run_write(_persist_page, rows=len(claimed))
+        except BaseException as e:
+            if source == "queue":
+                await _release_claimed(claimed, e)
+            raise
+        stats["analysed"] += written["created"] + written["updated"]
+        stats["skipped"] += written["skipped"] + written["stale"]
+
+        log.info(f"Sentiment page {stats['pages']} committed: {stats}")
+
+    log.info(f"LLM response cache: {cache_stats()}")
+    log.info(f"Hook latency: {hook_timing_summary()}")
+    return stats
+
+
+async def plan_sentiment_shards(
+    max_shards: int = 4, min_shard_size: int = 100, backfill: bool = True
+) -> list[tuple[int, int]]:
+    """Split the open sentiment queue into [lo, hi) sentence-id ranges.
+
+    Ranges are even in id span, at most `max_shards` of them and none
+    narrower than `min_shard_size` ids; an empty queue yields no shards.
+    `backfill` seeds the queue first, as in analyse_unprocessed_sentences().
+    """
+    if backfill:
+        await backfill_sentiment_queue()
+    async with get_async_session() as session:
+        bounds = await WorkQueueRepository().open_ref_bounds(session, SENTIMENT_QUEUE)
+    if bounds is None:
+        return []
+    lo, hi = bounds[0], bounds[1] + 1
+    shards = max(1, min(max_shards, (hi - lo) // max(1, min_shard_size)))
+    step = -(-(hi - lo) // shards)
+    return [(start, min(start + step, hi)) for start in range(lo, hi, step)]
+
+
 app = typer.Typer(help="Run sentiment analysis on text input.")
 
 
@@ -86,16 +483,22 @@ def analyze(
     pretty: bool = typer.Option(False, "--pretty", help="Pretty-print JSON"),
     sentence_id: int | None = typer.Option(None, "--sentence-id", help="Sentence ID"),
 ):
-    response, status = asyncio.run(
-        run_sentiment_analysis(
-            text=text,
-            profile=profile,
-            temperature=temperature,
-            in_context_learning=in_context_learning,
-            persist_override=persist_override,
-            sentence_id=sentence_id,
-        )
-    )
+    async def _main():
+        try:
+            return await run_sentiment_analysis(
+                text=text,
+                profile=profile,
+                temperature=temperature,
+                in_context_learning=in_context_learning,
+                persist_override=persist_override,
+                sentence_id=sentence_id,
+            )
+        finally:
+            await drain_sinks()
+            await close_writer()
+            await aclose_adapters()
+
+    response, status = asyncio.run(_main())
 
     log.success(f"Analysis completed with status: {status}")
     print(
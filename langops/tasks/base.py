@@ -1,16 +1,14 @@
 # ./tasks/base.py
 from __future__ import annotations
 
-import inspect
 from collections.abc import Awaitable, Callable
 from typing import Any, Generic, TypeVar
 
-import anyio
-
 from langops.hooks.payload import LLMHookPayload
-from langops.llm.adapters import AnthropicAdapter, AnthropicAdapter2, VertexAIAdapter
-from langops.llm.client import LLMClient
-from langops.llm.profiles import ProfileStore
+from langops.hooks.runner import fire_hooks
+from langops.llm.adapters import BaseLLMAdapter
+from langops.llm.profiles import get_profile_store
+from langops.llm.registry import get_adapter, get_client
 from langops.persistence.models.base import BaseLLMResponseModel
 from langops.persistence.repository.base_repo import BaseRepository
 
@@ -35,32 +33,61 @@ class GenericLLMTask(Generic[T_LLM_Output_Model, T_Entity]):
         self.profile = profile
 
     def _load_profile(self, profile_name: str) -> dict[str, Any]:
-        store = ProfileStore()
-        return store.resolve(profile_name)
-
-    def _get_adapter(self, llm_provider: str, llm_model: str):
-        p = llm_provider.lower().strip()
-        m = llm_model.lower().strip()
-
-        if p == "anthropic":
-            if m.startswith("claude-3"):
-                return AnthropicAdapter(model=llm_model)
-            return AnthropicAdapter2(model=llm_model)
-
-        if p in {"vertex", "vertexai", "google", "gcp"}:
-            return VertexAIAdapter(model=llm_model)
+        # parsed once per process, hot-reloaded when profiles.toml changes
+        return get_profile_store().resolve(profile_name)
 
-        raise ValueError(f"Unsupported LLM provider: {llm_provider}")
-
-    async def _run_hook(self, hook: Hook, payload: LLMHookPayload) -> None:
-        if inspect.iscoroutinefunction(hook):
-            await hook(payload)
-        else:
-            await anyio.to_thread.run_sync(hook, payload)
+    def _get_adapter(self, llm_provider: str, llm_model: str) -> BaseLLMAdapter:
+        # pooled process-wide; see llm.registry
+        return get_adapter(llm_provider=llm_provider, llm_model=llm_model)
 
     async def _fire(self, hooks: list[Hook], payload: LLMHookPayload) -> None:
-        for hook in hooks:
-            await self._run_hook(hook, payload)
+        # independent observers run concurrently, mutating hooks stay ordered
+        await fire_hooks(hooks, payload)
+
+    def _build_payload(
+        self,
+        profile: dict[str, Any],
+        user_role: str,
+        prompt: str,
+        text: str | None = None,
+        ref_id: int | None = None,
+        ref_field_name: str | None = None,
+        repo: BaseRepository | None = None,
+        persist_override: bool = False,
+        temperature: float | None = None,
+        system_prompt: str | None = None,
+    ) -> LLMHookPayload:
+        messages = [{"role": user_role, "content": prompt}]
+        if system_prompt:
+            # stable prefix, marked for provider prompt caching
+            messages.insert(
+                0,
+                {
+                    "role": "system",
+                    "content": system_prompt,
+                    "cache_control": "ephemeral",
+                },
+            )
+        return LLMHookPayload(
+            prompt=prompt,
+            messages=messages,
+            llm_provider=profile["llm_provider_detection"],
+            llm_model=profile["llm_model_detection"],
+            temperature=(
+                temperature
+                if temperature is not None
+                else profile["temperature_detection"]
+            ),
+            operation_name=self.operation_name,
+            llm_output_model=self.llm_output_model,
+            db_entity_model=self.db_entity_model,
+            repo=repo,
+            text=text,
+            ref_id=ref_id,
+            ref_field_name=ref_field_name,
+            persist_override=persist_override,
+            mongo_coll_name=self.mongo_coll_name,
+        )
 
     async def run(
         self,
@@ -71,46 +98,84 @@ class GenericLLMTask(Generic[T_LLM_Output_Model, T_Entity]):
         ref_field_name: str | None = None,
         repo: BaseRepository | None = None,
         persist_override: bool = False,
+        temperature: float | None = None,
+        system_prompt: str | None = None,
     ) -> LLMHookPayload | None:
         profile = self._load_profile(self.profile)
 
-        adapter = self._get_adapter(
+        client = get_client(
             llm_provider=profile["llm_provider_detection"],
             llm_model=profile["llm_model_detection"],
+            cache=profile.get("llm_cache"),
+            rate_limit=profile.get("rate_limit"),
+            stream=profile.get("llm_stream", False),
+            max_output_tokens=profile.get("llm_max_output_tokens"),
         )
 
-        client = LLMClient(adapter=adapter)
-
-        payload = LLMHookPayload(
+        payload = self._build_payload(
+            profile,
+            user_role=user_role,
             prompt=prompt,
-            messages=[{"role": user_role, "content": prompt}],
-            llm_provider=profile["llm_provider_detection"],
-            llm_model=profile["llm_model_detection"],
-            temperature=profile["temperature_detection"],
-            operation_name=self.operation_name,
-            llm_output_model=self.llm_output_model,
-            db_entity_model=self.db_entity_model,
-            repo=repo,
             text=text,
             ref_id=ref_id,
             ref_field_name=ref_field_name,
+            repo=repo,
             persist_override=persist_override,
-            mongo_coll_name=self.mongo_coll_name,
+            temperature=temperature,
+            system_prompt=system_prompt,
         )
 
         before_hooks = profile.get("hookset_before", [])
         after_hooks = profile.get("hookset_after", [])
 
-        try:
-            if before_hooks:
+        if before_hooks:
+            await self._fire(before_hooks, payload)
+
+        payload = await client.request(payload)
+
+        if after_hooks:
+            await self._fire(after_hooks, payload)
+
+        return payload
+
+    async def run_batch(
+        self,
+        requests: list[dict[str, Any]],
+        **batch_options: Any,
+    ) -> list[LLMHookPayload | Exception]:
+        """Submit many run() calls as one provider batch job.
+
+        Each request holds the keyword arguments of run(). Before hooks fire per
+        payload ahead of submission, after hooks per successful result once the
+        batch has ended. Results keep request order; failures are returned.
+        """
+        profile = self._load_profile(self.profile)
+
+        client = get_client(
+            llm_provider=profile["llm_provider_detection"],
+            llm_model=profile["llm_model_detection"],
+            cache=profile.get("llm_cache"),
+            rate_limit=profile.get("rate_limit"),
+        )
+
+        payloads = [self._build_payload(profile, **req) for req in requests]
+
+        before_hooks = profile.get("hookset_before", [])
+        after_hooks = profile.get("hookset_after", [])
+
+        if before_hooks:
+            for payload in payloads:
                 await self._fire(before_hooks, payload)
 
-            payload = await client.request(payload)
+        results = await client.request_batch(payloads, **batch_options)
 
-            if after_hooks:
-                await self._fire(after_hooks, payload)
+        if after_hooks:
+            for i, result in enumerate(results):
+                if isinstance(result, Exception):
+                    continue
+                try:
+                    await self._fire(after_hooks, result)
+                except Exception as e:
+                    results[i] = e
 
-            return payload
-        finally:
-            if hasattr(adapter, "aclose") and callable(getattr(adapter, "aclose")):
-                await adapter.aclose()
+        return results
@@ -0,0 +1,38 @@
+# ./tasks/batch_executor.py
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Generic, TypeVar
+
+T_Item = TypeVar("T_Item")
+T_Result = TypeVar("T_Result")
+
+
+class BatchExecutor(Generic[T_Item, T_Result]):
+    """Fan a batch of items out to a coroutine with bounded concurrency.
+
+    Request rates are not limited here: every LLM call goes through its
+    provider's AdaptiveLimiter, configured per profile.
+    """
+
+    def __init__(self, max_in_flight: int = 8) -> None:
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be >= 1")
+        self.max_in_flight = max_in_flight
+
+    async def map(
+        self,
+        items: Sequence[T_Item],
+        fn: Callable[[T_Item], Awaitable[T_Result]],
+    ) -> list[T_Result | BaseException]:
+        """Run fn over items; results keep input order, failures are returned."""
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        async def _run(item: T_Item) -> T_Result:
+            async with semaphore:
+                return await fn(item)
+
+        return await asyncio.gather(
+            *(_run(item) for item in items), return_exceptions=True
+        )
@@ -2,11 +2,28 @@
 from __future__ import annotations
 
 import asyncio
+import os
 import re
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any
+
+from loguru import logger
+
+from langops.persistence.models.sentence import SentenceType
+from langops.persistence.repository.sentence_repo import SentenceRepository
+from langops.persistence.session import get_async_session
+from langops.persistence.writer import run_write
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n+")
+# where a large document may be cut into chunks without splitting a sentence
+_CHUNK_BOUNDARY = re.compile(r"\n+|(?<=[.!?])\s+")
 
 
 def _split_regex(text: str) -> list[str]:
-    parts = re.split(r"(?<=[.!?])\s+|\n+", text.strip())
+    parts = _SENTENCE_BOUNDARY.split(text.strip())
     return [p.strip() for p in parts if p and not p.isspace()]
 
 
@@ -15,3 +32,242 @@ async def split_sentences_regex(text: str) -> list[str]:
 
     # Run regex split in a background thread to avoid blocking the event loop
     return await asyncio.to_thread(_split_regex, text)
+
+
+### Segmenter backends
+
+
+class SentenceSegmenter(ABC):
+    """Splits a text into sentences; instances are built once per process."""
+
+    name: str
+
+    @abstractmethod
+    def split(self, text: str) -> list[str]: ...
+
+
+class RegexSegmenter(SentenceSegmenter):
+    name = "regex"
+
+    def split(self, text: str) -> list[str]:
+        return _split_regex(text)
+
+
+class NltkSegmenter(SentenceSegmenter):
+    """Punkt tokenizer; handles abbreviations and decimals the regex splits on."""
+
+    name = "nltk"
+
+    def __init__(self, language: str = "english") -> None:
+        import nltk
+
+        try:
+            nltk.data.find("tokenizers/punkt_tab")
+        except LookupError:
+            nltk.download("punkt_tab", quiet=True)
+        self._tokenize = nltk.tokenize.sent_tokenize
+        self.language = language
+
+    def split(self, text: str) -> list[str]:
+        # keep the regex backend's contract: line breaks always end a sentence
+        return [
+            s.strip()
+            for line in text.splitlines()
+            if line.strip()
+            for s in self._tokenize(line, language=self.language)
+            if s.strip()
+        ]
+
+
+class StanzaSegmenter(SentenceSegmenter):
+    """Neural tokenizer; the slowest and most accurate backend."""
+
+    name = "stanza"
+
+    def __init__(self, lang: str = "en") -> None:
+        import stanza
+
+        self._pipeline = stanza.Pipeline(
+            lang=lang, processors="tokenize", use_gpu=False, verbose=False
+        )
+
+    def split(self, text: str) -> list[str]:
+        doc = self._pipeline(text)
+        return [s.text.strip() for s in doc.sentences if s.text.strip()]
+
+
+SEGMENTERS: dict[str, type[SentenceSegmenter]] = {
+    cls.name: cls for cls in (RegexSegmenter, NltkSegmenter, StanzaSegmenter)
+}
+
+
+@lru_cache
+def get_segmenter(backend: str = "regex") -> SentenceSegmenter:
+    try:
+        return SEGMENTERS[backend]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown segmenter '{backend}', expected one of {sorted(SEGMENTERS)}"
+        ) from None
+
+
+def _segment(backend: str, text: str) -> list[str]:
+    # module-level so the process pool can pickle it
+    return get_segmenter(backend).split(text)
+
+
+def iter_text_chunks(text: str, max_chars: int) -> Iterator[str]:
+    """Yield consecutive slices of at most ~max_chars, cut on sentence boundaries.
+
+    A slice only exceeds max_chars when no boundary exists inside it.
+    """
+    start, n = 0, len(text)
+    while n - start > max_chars:
+        window = text[start : start + max_chars]
+        cut = None
+        for m in _CHUNK_BOUNDARY.finditer(window):
+            cut = m.end()
+        if not cut:
+            m = _CHUNK_BOUNDARY.search(text, start + max_chars)
+            cut = (m.end() - start) if m else n - start
+        yield text[start : start + cut]
+        start += cut
+    if start < n:
+        yield text[start:]
+
+
+### Service
+
+
+class SegmentationService:
+    """Fans segmentation out over a process pool.
+
+    Documents longer than `chunk_chars` are cut on sentence boundaries and the
+    chunks are segmented in parallel; `stream` yields their sentences in order
+    as they complete. Texts shorter than `inline_chars` are split in-process,
+    where pickling would cost more than the split itself.
+    """
+
+    def __init__(
+        self,
+        backend: str = "regex",
+        max_workers: int | None = None,
+        chunk_chars: int = 200_000,
+        inline_chars: int = 10_000,
+    ) -> None:
+        if backend not in SEGMENTERS:
+            raise ValueError(
+                f"Unknown segmenter '{backend}', expected one of {sorted(SEGMENTERS)}"
+            )
+        self.backend = backend
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_chars = chunk_chars
+        self.inline_chars = inline_chars
+        self._pool: ProcessPoolExecutor | None = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            logger.debug(
+                f"Segmentation pool started: backend={self.backend}, "
+                f"workers={self.max_workers}"
+            )
+        return self._pool
+
+    def _submit(self, text: str) -> asyncio.Future[list[str]]:
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._executor(), _segment, self.backend, text)
+
+    async def stream(self, text: str) -> AsyncIterator[list[str]]:
+        """Yield sentence lists chunk by chunk, in document order."""
+        if len(text) < self.inline_chars:
+            yield _segment(self.backend, text)
+            return
+        # bounded look-ahead so a huge document never sits in the queue whole
+        window = 2 * self.max_workers
+        pending: list[asyncio.Future[list[str]]] = []
+        for chunk in iter_text_chunks(text, self.chunk_chars):
+            pending.append(self._submit(chunk))
+            if len(pending) >= window:
+                yield await pending.pop(0)
+        for fut in pending:
+            yield await fut
+
+    async def split(self, text: str) -> list[str]:
+        return [s async for chunk in self.stream(text) for s in chunk]
+
+    async def split_many(self, texts: list[str]) -> list[list[str]]:
+        """Segment several documents concurrently; results follow input order."""
+        return list(await asyncio.gather(*(self.split(t) for t in texts)))
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def __enter__(self) -> SegmentationService:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+async def split_unprocessed_documents(
+    *,
+    backend: str = "regex",
+    max_workers: int | None = None,
+    chunk_chars: int = 200_000,
+    page_size: int = 100,
+) -> dict[str, int]:
+    """Segment documents without sentences and bulk-insert the results.
+
+    The backlog is streamed in id order, `page_size` documents at a time.
+    Regular documents of a page are segmented together across the pool and
+    written in one transaction; documents above `chunk_chars` are streamed
+    and inserted chunk by chunk within a transaction of their own. Writes go
+    through the SQL writer, so they group-commit with the rest of the process.
+    """
+    repo = SentenceRepository()
+    stats = {"documents": 0, "sentences": 0, "streamed": 0}
+
+    with SegmentationService(backend, max_workers, chunk_chars) as service:
+        async with get_async_session() as read_session:
+            async for docs in repo.iter_unprocessed(read_session, page_size=page_size):
+                stats["documents"] += len(docs)
+                regular = [d for d in docs if len(d.content) <= chunk_chars]
+                large = [d for d in docs if len(d.content) > chunk_chars]
+
+                segmented = await service.split_many([d.content for d in regular])
+
+                async def _insert_page(session) -> int:
+                    inserted = 0
+                    for doc, sentences in zip(regular, segmented):
+                        inserted += await repo.bulk_insert_sentences(
+                            session, doc.id, sentences, sentence_type=SentenceType.OTHER
+                        )
+                    return inserted
+
+                stats["sentences"] += await run_write(
+                    _insert_page, rows=sum(len(s) for s in segmented)
+                )
+
+                for doc in large:
+                    stats["streamed"] += 1
+
+                    # a document is committed whole: the backlog query skips
+                    # any document that already has sentences
+                    async def _insert_streamed(session, doc=doc) -> int:
+                        inserted = 0
+                        async for chunk in service.stream(doc.content):
+                            inserted += await repo.bulk_insert_sentences(
+                                session, doc.id, chunk, sentence_type=SentenceType.OTHER
+                            )
+                        return inserted
+
+                    stats["sentences"] += await run_write(_insert_streamed)
+
+    logger.info(
+        f"Split {stats['documents']} documents into {stats['sentences']} "
+        f"sentences ({backend}, {stats['streamed']} streamed)"
+    )
+    return stats
@@ -0,0 +1,201 @@
+# ./tasks/ingest_documents.py
+from __future__ import annotations
+
+import asyncio
+import glob
+import json
+import os
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+import click
+from loguru import logger
+from sqlalchemy.exc import IntegrityError
+
+from langops.persistence.repository.document_repo import DocumentRepository
+from langops.persistence.writer import close_writer, run_write
+from langops.tasks.add_document import (
+    _extract_document_fields,
+    _parse_document_json,
+    _validate_document_data,
+)
+
+# (origin, raw JSON) — raw is None when the record is a whole file to read
+SourceItem = tuple[str, str | None]
+
+
+def iter_sources(
+    sources: str | Path | Iterable[str | Path], pattern: str = "*.json"
+) -> Iterator[SourceItem]:
+    """Expand directories, globs, JSONL files and JSON files into records."""
+    if isinstance(sources, (str, Path)):
+        sources = [sources]
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            for file in sorted(path.rglob(pattern)):
+                yield from iter_sources(file)
+        elif path.suffix == ".jsonl" and path.is_file():
+            with open(path, encoding="utf-8") as f:
+                for line_no, line in enumerate(f, start=1):
+                    if line.strip():
+                        yield f"{path}:{line_no}", line
+        elif path.is_file():
+            yield str(path), None
+        else:
+            matches = sorted(glob.iglob(str(source), recursive=True))
+            if not matches:
+                logger.warning(f"No documents match {source}")
+            for match in matches:
+                yield from iter_sources(match)
+
+
+def _chunked(items: Iterator[SourceItem], size: int) -> Iterator[list[SourceItem]]:
+    while chunk := list(islice(items, size)):
+        yield chunk
+
+
+def _prepare_chunk(items: list[SourceItem]) -> list[dict[str, Any]]:
+    """Parse, validate and hash a chunk of records (runs in a worker process)."""
+    prepared = []
+    for origin, raw in items:
+        try:
+            doc_data = (
+                json.loads(raw)
+                if raw is not None
+                else _parse_document_json(Path(origin))
+            )
+            _validate_document_data(doc_data)
+            fields = _extract_document_fields(doc_data)
+            fields["content_hash"] = DocumentRepository.compute_hash(fields["content"])
+            prepared.append({"origin": origin, "fields": fields})
+        except Exception as e:
+            prepared.append({"origin": origin, "error": str(e)})
+    return prepared
+
+
+async def _persist_chunk(
+    repo: DocumentRepository, prepared: list[dict[str, Any]], stats: dict[str, int]
+) -> None:
+    unique: dict[str, dict[str, Any]] = {}
+    for item in prepared:
+        stats["seen"] += 1
+        if "error" in item:
+            stats["failed"] += 1
+            logger.warning(f"Skipping {item['origin']}: {item['error']}")
+            continue
+        fields = item["fields"]
+        if fields["content_hash"] in unique:
+            stats["duplicates"] += 1
+            continue
+        unique[fields["content_hash"]] = fields
+
+    # a concurrent ingester may win the unique index between check and insert;
+    # the retry re-checks and skips whatever it inserted
+    async def _insert(session) -> int:
+        existing = await repo.get_existing_hashes(session, list(unique))
+        rows = [f for h, f in unique.items() if h not in existing]
+        return await repo.insert_many(session, rows)
+
+    for attempt in range(2):
+        try:
+            inserted = await run_write(_insert, rows=len(unique))
+            break
+        except IntegrityError:
+            if attempt:
+                raise
+            logger.warning("Content hash conflict while ingesting, retrying chunk")
+
+    stats["inserted"] += inserted
+    stats["duplicates"] += len(unique) - inserted
+
+
+async def ingest_documents(
+    sources: str | Path | Iterable[str | Path],
+    *,
+    pattern: str = "*.json",
+    chunk_size: int = 500,
+    max_workers: int | None = None,
+) -> dict[str, Any]:
+    """Ingest documents from directories, globs, JSONL or JSON files.
+
+    Records are parsed and hashed in a process pool chunk by chunk; each chunk
+    is checked against existing `content_hash` values with one query and
+    inserted in one transaction. Duplicates are skipped.
+    """
+    repo = DocumentRepository()
+    workers = max_workers or os.cpu_count() or 1
+    stats: dict[str, Any] = {"seen": 0, "inserted": 0, "duplicates": 0, "failed": 0}
+    start = time.perf_counter()
+
+    def _report() -> None:
+        elapsed = time.perf_counter() - start
+        logger.info(
+            f"Ingest: {stats['seen']} records, {stats['inserted']} inserted, "
+            f"{stats['duplicates']} duplicates, {stats['failed']} failed "
+            f"({stats['seen'] / elapsed:.0f} docs/s)"
+        )
+
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # parsing runs ahead of persistence by a bounded number of chunks
+        pending: deque[asyncio.Future] = deque()
+        for chunk in _chunked(iter_sources(sources, pattern), chunk_size):
+            pending.append(loop.run_in_executor(pool, _prepare_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                await _persist_chunk(repo, await pending.popleft(), stats)
+                _report()
+        while pending:
+            await _persist_chunk(repo, await pending.popleft(), stats)
+            _report()
+
+    stats["elapsed_s"] = round(time.perf_counter() - start, 3)
+    stats["docs_per_s"] = (
+        round(stats["seen"] / stats["elapsed_s"], 1) if stats["seen"] else 0.0
+    )
+    return stats
+
+
+@click.command()
+@click.argument("sources", nargs=-1, required=True)
+@click.option(
+    "--glob",
+    "pattern",
+    default="*.json",
+    show_default=True,
+    help="File pattern used when a source is a directory",
+)
+@click.option("--chunk-size", default=500, show_default=True)
+@click.option("--workers", type=int, default=None, help="Parser processes [cpu count]")
+def ingest_documents_cli(
+    sources: tuple[str, ...], pattern: str, chunk_size: int, workers: int | None
+) -> None:
+    """Bulk-ingest documents from directories, globs, JSONL or JSON files."""
+
+    async def _main() -> dict[str, Any]:
+        try:
+            return await ingest_documents(
+                list(sources),
+                pattern=pattern,
+                chunk_size=chunk_size,
+                max_workers=workers,
+            )
+        finally:
+            await close_writer()
+
+    stats = asyncio.run(_main())
+    click.secho(
+        f"✅ {stats['inserted']} added, {stats['duplicates']} duplicates skipped, "
+        f"{stats['failed']} failed in {stats['elapsed_s']}s "
+        f"({stats['docs_per_s']} docs/s)",
+        fg="green" if not stats["failed"] else "yellow",
+    )
+
+
+if __name__ == "__main__":
+    ingest_documents_cli()
@@ -1,12 +1,22 @@
 # ./tasks/prompts/prompt_sentiment.py
 from __future__ import annotations
 
+from functools import lru_cache
+
 INSTRUCTION = (
     " Classify the sentiment. Respond ONLY with JSON:\n"
     '        \'{"sentiment": "<positive|neutral|negative>", '
     '"sentiment_confidence": 0..1}.\' '
 )
 
+PACKED_INSTRUCTION = (
+    " Classify the sentiment of each numbered input. Respond ONLY with JSON:\n"
+    '        \'{"items": [{"n": <input number>, '
+    '"sentiment": "<positive|neutral|negative>", "sentiment_confidence": 0..1}]}\' '
+    "\n        with exactly one item per input, in input order."
+)
+
+
 FEW_SHOTS = [
     {
         "text": "I absolutely love this product! Exceeded expectations.",
@@ -26,21 +36,50 @@ FEW_SHOTS = [
 ]
 
 
-def build_sentiment_prompt(text: str, in_context_learning: str = "zero-shot") -> str:
-    lines: list[str] = []
-    lines.append(INSTRUCTION)
-    if in_context_learning == "zero-shot":
-        pass
-    elif in_context_learning == "few-shot":
-        lines.append("Examples:")
-        for ex in FEW_SHOTS:
-            lines.append(
-                f'input: "{ex["text"]}"\noutput: '
-                f'{{"sentiment": "{ex["sentiment"]}", "sentiment_confidence": {ex["sentiment_confidence"]}}}'
-            )
-    else:
-        # fallback to basic
-        pass
-    lines.append("-------YOUR TURN-------")
-    lines.append(f'Input: "{text}"')
+def _few_shot_lines() -> list[str]:
+    lines = ["Examples:"]
+    for ex in FEW_SHOTS:
+        lines.append(
+            f'input: "{ex["text"]}"\noutput: '
+            f'{{"sentiment": "{ex["sentiment"]}", "sentiment_confidence": {ex["sentiment_confidence"]}}}'
+        )
+    return lines
+
+
+@lru_cache
+def build_sentiment_prefix(
+    in_context_learning: str = "zero-shot", packed: bool = False
+) -> str:
+    """Instruction and shots: identical across calls, so sent as a cached prefix."""
+    lines: list[str] = [PACKED_INSTRUCTION if packed else INSTRUCTION]
+    if in_context_learning == "few-shot":
+        lines.extend(_few_shot_lines())
+    # any other mode falls back to the bare instruction
     return "\n".join(lines)
+
+
+def build_sentiment_input(text: str) -> str:
+    return f'-------YOUR TURN-------\nInput: "{text}"'
+
+
+def build_sentiment_batch_input(texts: list[str]) -> str:
+    numbered = (f'{n}. "{text}"' for n, text in enumerate(texts, start=1))
+    return "\n".join(["-------YOUR TURN-------", *numbered])
+
+
+def build_sentiment_prompt(text: str, in_context_learning: str = "zero-shot") -> str:
+    return "\n".join(
+        [build_sentiment_prefix(in_context_learning), build_sentiment_input(text)]
+    )
+
+
+def build_sentiment_batch_prompt(
+    texts: list[str], in_context_learning: str = "zero-shot"
+) -> str:
+    """One prompt for several sentences; the instruction and shots are sent once."""
+    return "\n".join(
+        [
+            build_sentiment_prefix(in_context_learning, packed=True),
+            build_sentiment_batch_input(texts),
+        ]
+    )
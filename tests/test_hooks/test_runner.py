@@ -0,0 +1,41 @@
+# tests/test_hooks/test_runner.py
+import asyncio
+
+import pytest
+
+from langops.hooks import guard_output, langfuse_track, mongo_insert, persist_sql
+from langops.hooks.payload import LLMHookPayload
+from langops.hooks.runner import fire_hooks, hook_spec, plan_stages
+
+
+def test_plan_stages_keeps_guard_before_persist():
+    stages = plan_stages([mongo_insert, langfuse_track, guard_output, persist_sql])
+    assert stages == [[mongo_insert, langfuse_track], [guard_output], [persist_sql]]
+
+
+@pytest.mark.asyncio
+async def test_fire_hooks_runs_observers_concurrently():
+    events: list[str] = []
+
+    @hook_spec(mutates=False)
+    async def slow_a(payload):
+        events.append("a:start")
+        await asyncio.sleep(0.05)
+        events.append("a:end")
+
+    @hook_spec(mutates=False)
+    async def slow_b(payload):
+        events.append("b:start")
+        await asyncio.sleep(0.05)
+        events.append("b:end")
+
+    @hook_spec(mutates=True)
+    async def mutate(payload):
+        events.append("mutate")
+
+    payload = LLMHookPayload(prompt="p", messages=[{"role": "user", "content": "p"}])
+    await fire_hooks([slow_a, slow_b, mutate], payload)
+
+    assert events[:2] == ["a:start", "b:start"]
+    assert events[-1] == "mutate"
+    assert set(payload.hook_timings) == {"slow_a", "slow_b", "mutate"}
@@ -0,0 +1,80 @@
+# tests/test_hooks/test_sink.py
+import asyncio
+import json
+
+import pytest
+
+from config import settings
+from langops.hooks import sink as sink_module
+from langops.hooks.sink import BackgroundSink, get_sink
+
+
+@pytest.mark.asyncio
+async def test_sink_batches_and_drains_on_close():
+    batches: list[list[int]] = []
+
+    async def writer(batch):
+        batches.append(batch)
+
+    sink = BackgroundSink("test", writer, max_batch=4, flush_interval=0.05)
+    for i in range(10):
+        await sink.put(i)
+    await sink.aclose()
+
+    assert [i for batch in batches for i in batch] == list(range(10))
+    assert all(len(batch) <= 4 for batch in batches)
+    assert sink.stats.written == 10
+
+
+@pytest.mark.asyncio
+async def test_sink_spills_when_full(tmp_path):
+    release = asyncio.Event()
+
+    async def stuck_writer(batch):
+        await release.wait()
+
+    sink = BackgroundSink(
+        "spilly",
+        stuck_writer,
+        max_queue=2,
+        max_batch=1,
+        overflow="spill",
+        spill_dir=tmp_path,
+    )
+    for i in range(6):
+        await sink.put({"n": i})
+        await asyncio.sleep(0)
+
+    release.set()
+    await sink.aclose()
+
+    spilled = [json.loads(line) for line in sink.spill_path.read_text().splitlines()]
+    assert sink.stats.spilled == len(spilled) > 0
+    assert sink.stats.written + sink.stats.spilled == 6
+
+
+def test_sink_of_an_undrained_loop_spills_its_records(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "telemetry_spill_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "telemetry_overflow", "block")
+    monkeypatch.setattr(sink_module, "_sinks", {})
+
+    async def stuck_writer(batch):
+        await asyncio.Event().wait()
+
+    async def log_calls():
+        sink = get_sink("undrained", stuck_writer)
+        for i in range(3):
+            await sink.put({"n": i})
+        await asyncio.sleep(0.01)
+        return sink
+
+    # the loop ends without drain_sinks()
+    sink = asyncio.run(log_calls())
+
+    async def next_run():
+        get_sink("undrained", stuck_writer)
+
+    asyncio.run(next_run())
+
+    spilled = [json.loads(line) for line in sink.spill_path.read_text().splitlines()]
+    assert spilled == [{"n": 0}, {"n": 1}, {"n": 2}]
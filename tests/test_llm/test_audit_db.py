@@ -0,0 +1,77 @@
+# tests/test_llm/test_audit_db.py
+import pytest
+from pymongo import WriteConcern
+from pymongo.errors import BulkWriteError, OperationFailure
+
+from langops.llm import db
+
+
+class FakeCollection:
+    def __init__(self, name, fail_first=0, index_error=False):
+        self.name = name
+        self.fail_first = fail_first
+        self.index_error = index_error
+        self.index_calls = 0
+        self.inserts = []
+
+    async def create_indexes(self, indexes):
+        self.index_calls += 1
+        if self.index_error:
+            raise OperationFailure("Index with name: ref_id_1 already exists")
+
+    async def insert_many(self, docs, ordered=True):
+        self.inserts.append((docs, ordered))
+        if self.fail_first:
+            raise BulkWriteError(
+                {"nInserted": len(docs) - self.fail_first, "writeErrors": [{}]}
+            )
+
+        class Result:
+            inserted_ids = list(range(len(docs)))
+
+        return Result()
+
+
+def test_import_does_not_open_a_client():
+    assert db.get_mongo_client.cache_info().currsize == 0
+
+
+def test_audit_record_keeps_dict_response_without_round_trip():
+    response = {"content": [{"type": "text", "text": "hi"}]}
+    doc = db.audit_record({"operation": "op", "response": response, "ref_id": 3})
+    assert doc["response"] is response
+    assert "response_raw" not in doc
+    assert doc["ref_id"] == 3
+
+    doc = db.audit_record({"operation": "op", "response": '{"a": 1}'})
+    assert doc["response"] == {"a": 1}
+    assert doc["response_raw"] == '{"a": 1}'
+
+
+@pytest.mark.asyncio
+async def test_writer_batches_per_collection(monkeypatch):
+    collections = {"a": FakeCollection("a"), "b": FakeCollection("b", fail_first=1)}
+    writer = db.MongoAuditWriter(write_concern=WriteConcern(w="majority"))
+    monkeypatch.setattr(writer, "collection", collections.__getitem__)
+
+    written = await writer.write([("a", {"n": 1}), ("b", {"n": 2}), ("a", {"n": 3})])
+    written += await writer.write([("b", {"n": 4}), ("b", {"n": 5})])
+
+    a, b = collections["a"], collections["b"]
+    assert a.inserts == [([{"n": 1}, {"n": 3}], False)]
+    assert [docs for docs, _ in b.inserts] == [[{"n": 2}], [{"n": 4}, {"n": 5}]]
+    # one rejected document per batch of "b" does not stop the rest
+    assert written == 2 + 0 + 1
+    assert a.index_calls == 1 and b.index_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_writer_inserts_when_index_creation_fails(monkeypatch):
+    coll = FakeCollection("c", index_error=True)
+    writer = db.MongoAuditWriter()
+    monkeypatch.setattr(writer, "collection", lambda name: coll)
+
+    assert await writer.write([("c", {"n": 1})]) == 1
+    assert await writer.write([("c", {"n": 2})]) == 1
+    # tried once, not on every flush
+    assert coll.index_calls == 1
@@ -0,0 +1,149 @@
+# tests/test_llm/test_batch_adapter.py
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from langops.llm.adapters import AnthropicAdapter2, LLMError
+from langops.persistence.models.sentence import SentenceSentimentResponseModel
+
+
+class _BatchStub(BaseHTTPRequestHandler):
+    """Mimics POST/GET /v1/messages/batches and the .jsonl results endpoint."""
+
+    batches: dict[str, dict] = {}
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _batch(self, batch_id: str, status: str) -> dict:
+        host = f"http://{self.server.server_address[0]}:{self.server.server_port}"
+        ended = status == "ended"
+        return {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": status,
+            "request_counts": {
+                "processing": 0 if ended else 2,
+                "succeeded": 1 if ended else 0,
+                "errored": 1 if ended else 0,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "created_at": "2025-01-01T00:00:00Z",
+            "expires_at": "2025-01-02T00:00:00Z",
+            "ended_at": "2025-01-01T00:01:00Z" if ended else None,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": (
+                f"{host}/v1/messages/batches/{batch_id}/results" if ended else None
+            ),
+        }
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        body = json.loads(self.rfile.read(length))
+        batch_id = f"msgbatch_{len(self.batches)}"
+        self.batches[batch_id] = {"requests": body["requests"], "polls": 0}
+        payload = json.dumps(self._batch(batch_id, "in_progress")).encode()
+        self._send(200, payload, "application/json")
+
+    def do_GET(self):
+        parts = self.path.strip("/").split("/")
+        batch_id = parts[3]
+        state = self.batches[batch_id]
+
+        if parts[-1] == "results":
+            lines = []
+            for req in reversed(state["requests"]):  # out of order on purpose
+                if req["custom_id"] == "1":
+                    result = {
+                        "type": "errored",
+                        "error": {
+                            "type": "error",
+                            "error": {"type": "overloaded_error", "message": "x"},
+                        },
+                    }
+                else:
+                    result = {"type": "succeeded", "message": _tool_message(req)}
+                entry = {"custom_id": req["custom_id"], "result": result}
+                lines.append(json.dumps(entry))
+            self._send(200, "\n".join(lines).encode(), "application/binary")
+            return
+
+        state["polls"] += 1
+        status = "ended" if state["polls"] > 1 else "in_progress"
+        payload = json.dumps(self._batch(batch_id, status)).encode()
+        self._send(200, payload, "application/json")
+
+
+def _tool_message(req: dict) -> dict:
+    params = req["params"]
+    return {
+        "id": f"msg_{req['custom_id']}",
+        "type": "message",
+        "role": "assistant",
+        "model": params["model"],
+        "content": [
+            {
+                "type": "tool_use",
+                "id": "toolu_1",
+                "name": params["tool_choice"]["name"],
+                "input": {"sentiment": "positive", "sentiment_confidence": 0.9},
+            }
+        ],
+        "stop_reason": "tool_use",
+        "stop_sequence": None,
+        "usage": {"input_tokens": 12, "output_tokens": 5},
+    }
+
+
+@pytest.fixture
+def batch_stub_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _BatchStub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_send_batch_against_stub(batch_stub_url):
+    adapter = AnthropicAdapter2(
+        model="claude-sonnet-4", api_key="test", base_url=batch_stub_url
+    )
+    requests = [
+        {
+            "messages": [{"role": "user", "content": text}],
+            "temperature": 0.0,
+            "response_model": SentenceSentimentResponseModel,
+        }
+        for text in ("great", "flaky", "superb")
+    ]
+
+    try:
+        results = await adapter.send_batch(requests, poll_interval=0.01, timeout=5)
+    finally:
+        await adapter.aclose()
+
+    assert len(results) == 3
+    assert results[0]["content"] == {
+        "sentiment": "positive",
+        "sentiment_confidence": 0.9,
+    }
+    assert results[0]["id"] == "msg_0"
+    assert isinstance(results[1], LLMError)
+    assert results[2]["usage"] == {
+        "input_tokens": 12,
+        "output_tokens": 5,
+        "cache_creation_input_tokens": 0,
+        "cache_read_input_tokens": 0,
+    }
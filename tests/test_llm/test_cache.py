@@ -0,0 +1,51 @@
+# tests/test_llm/test_cache.py
+import pytest
+
+from langops.llm.cache import MemoryResponseCache, make_cache_key
+from langops.persistence.models.sentence import SentenceSentimentResponseModel
+
+
+def _key(text: str, temperature: float | None = 0.0) -> str:
+    return make_cache_key(
+        provider="anthropic.4x",
+        model="claude-sonnet-4",
+        messages=[{"role": "user", "content": text}],
+        temperature=temperature,
+        output_model=SentenceSentimentResponseModel,
+    )
+
+
+def test_cache_key_is_content_addressed():
+    assert _key("same text") == _key("same text")
+    assert _key("same text") != _key("other text")
+    assert _key("same text", 0.0) != _key("same text", 0.7)
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_lru_eviction_and_stats():
+    cache = MemoryResponseCache(max_entries=2)
+    response = {"content": {}, "usage": {"input_tokens": 10, "output_tokens": 2}}
+
+    await cache.set("a", response)
+    await cache.set("b", response)
+    assert await cache.lookup("a") is not None  # "a" is now most recent
+    await cache.set("c", response)  # evicts "b"
+
+    assert await cache.lookup("b") is None
+    assert await cache.lookup("c") is not None
+    assert cache.stats.hits == 2
+    assert cache.stats.misses == 1
+    assert cache.stats.evictions == 1
+    assert cache.stats.input_tokens_saved == 20
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_ttl_expiry(monkeypatch):
+    cache = MemoryResponseCache(max_entries=8, ttl_seconds=10)
+    clock = [1000.0]
+    monkeypatch.setattr("langops.llm.cache.time.monotonic", lambda: clock[0])
+
+    await cache.set("k", {"content": {}})
+    clock[0] += 11
+
+    assert await cache.lookup("k") is None
@@ -0,0 +1,45 @@
+# tests/test_llm/test_import_time.py
+import subprocess
+import sys
+from pathlib import Path
+
+# SDKs that only load once a provider adapter or hook is actually used
+LAZY_SDKS = {"anthropic", "google.genai", "langfuse", "motor", "guardrails"}
+# cumulative import time of the sentiment CLI module, in microseconds
+BUDGET_US = 1_500_000
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _importtime(code: str) -> dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=ROOT,
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line.split("|")
+        if total.strip().isdigit():
+            cumulative[name.strip()] = int(total)
+    return cumulative
+
+
+def test_sentiment_cli_import_skips_provider_sdks():
+    imported = _importtime("import langops.tasks.analyse_sentiment_sentence")
+
+    assert not LAZY_SDKS & imported.keys()
+    assert imported["langops.tasks.analyse_sentiment_sentence"] < BUDGET_US
+
+
+def test_profile_load_skips_hook_sdks():
+    # what the Dagster code location runs at import to validate profiles.toml
+    imported = _importtime(
+        "from langops.llm.profiles import get_profile_store; get_profile_store()"
+    )
+
+    assert "langops.llm.profiles" in imported
+    assert not LAZY_SDKS & imported.keys()
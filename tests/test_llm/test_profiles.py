@@ -0,0 +1,49 @@
+# tests/test_llm/test_profiles.py
+import os
+
+import pytest
+
+from langops.hooks import log_request
+from langops.llm.profiles import ProfileStore
+
+PROFILE = """
+[dev]
+llm_provider = "anthropic"
+llm_model = "{model}"
+hookset_before = ["langops.hooks.log_request"]
+"""
+
+
+def _write(path, text: str, mtime_ns: int) -> None:
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_resolve_is_memoized_and_hot_reloads(tmp_path):
+    path = tmp_path / "profiles.toml"
+    _write(path, PROFILE.format(model="model-a"), 1_000_000_000)
+    store = ProfileStore(path, reload_interval=0)
+
+    profile = store.resolve("dev")
+    assert profile["llm_provider_detection"] == "anthropic"
+    assert profile["llm_model_detection"] == "model-a"
+    assert profile["hookset_before"] == [log_request]
+    assert store.resolve("dev")["hookset_before"] is profile["hookset_before"]
+
+    _write(path, PROFILE.format(model="model-b"), 2_000_000_000)
+    assert store.resolve("dev")["llm_model_detection"] == "model-b"
+
+    # a broken edit keeps the last good config
+    _write(path, '[dev]\nllm_provider = "anthropic"\n', 3_000_000_000)
+    assert store.resolve("dev")["llm_model"] == "model-b"
+
+
+def test_invalid_profiles_fail_on_load(tmp_path):
+    path = tmp_path / "profiles.toml"
+    path.write_text(PROFILE.format(model="m").replace("log_request", "nope"))
+    with pytest.raises(ValueError, match="unresolvable hookset_before"):
+        ProfileStore(path)
+
+    path.write_text('[dev]\nllm_model = "m"\n')
+    with pytest.raises(ValueError, match="llm_provider"):
+        ProfileStore(path)
@@ -0,0 +1,61 @@
+# tests/test_llm/test_prompt_caching.py
+from types import SimpleNamespace
+
+from langops.llm.providers.anthropic import AnthropicAdapter2, _anthropic_messages
+from langops.persistence.models.sentence import SentenceSentimentResponseModel
+from langops.tasks.base import GenericLLMTask
+from langops.tasks.prompts.prompt_sentiment import (
+    build_sentiment_input,
+    build_sentiment_prefix,
+)
+
+
+def test_system_prefix_is_marked_for_prompt_caching():
+    task = GenericLLMTask(llm_output_model=SentenceSentimentResponseModel)
+    profile = {
+        "llm_provider_detection": "anthropic",
+        "llm_model_detection": "claude-sonnet-4",
+        "temperature_detection": 0.0,
+    }
+    payload = task._build_payload(
+        profile,
+        user_role="user",
+        prompt=build_sentiment_input("Nice."),
+        system_prompt=build_sentiment_prefix("few-shot"),
+    )
+
+    system, chat = _anthropic_messages(payload.messages)
+
+    assert system == [
+        {
+            "type": "text",
+            "text": build_sentiment_prefix("few-shot"),
+            "cache_control": {"type": "ephemeral"},
+        }
+    ]
+    assert chat == [{"role": "user", "content": build_sentiment_input("Nice.")}]
+
+
+def test_normalized_usage_reports_cache_tokens():
+    usage = SimpleNamespace(
+        input_tokens=12,
+        output_tokens=5,
+        cache_creation_input_tokens=None,
+        cache_read_input_tokens=1800,
+    )
+    response = SimpleNamespace(
+        id="msg_1",
+        model="claude-sonnet-4",
+        stop_reason="end_turn",
+        content=[SimpleNamespace(text="{}")],
+        usage=usage,
+    )
+
+    normalized = AnthropicAdapter2._normalize(response, None)
+
+    assert normalized["usage"] == {
+        "input_tokens": 12,
+        "output_tokens": 5,
+        "cache_creation_input_tokens": 0,
+        "cache_read_input_tokens": 1800,
+    }
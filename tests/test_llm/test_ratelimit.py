@@ -0,0 +1,65 @@
+# tests/test_llm/test_ratelimit.py
+import asyncio
+
+import httpx
+import pytest
+
+from langops.llm.ratelimit import AdaptiveLimiter, rate_limit_delay
+
+
+class _RateLimited(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after: str | None = None) -> None:
+        headers = {"retry-after": retry_after} if retry_after else {}
+        self.response = httpx.Response(429, headers=headers)
+
+
+def test_rate_limit_delay_reads_retry_after():
+    assert rate_limit_delay(_RateLimited("2")) == 2.0
+    assert rate_limit_delay(_RateLimited()) == 0.0
+    assert rate_limit_delay(ValueError("boom")) is None
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limiter_halves_concurrency_on_429_and_retries():
+    limiter = AdaptiveLimiter(max_concurrency=4, backoff=0.01)
+    calls = {"n": 0, "peak": 0, "running": 0}
+    limits = []
+
+    async def send():
+        calls["n"] += 1
+        attempt = calls["n"]
+        limits.append(limiter.limit)
+        calls["running"] += 1
+        calls["peak"] = max(calls["peak"], calls["running"])
+        try:
+            await asyncio.sleep(0.01)
+            if attempt <= 3:
+                raise _RateLimited("0.05")
+            return {"usage": {"input_tokens": 1, "output_tokens": 1}}
+        finally:
+            calls["running"] -= 1
+
+    results = await asyncio.gather(*(limiter.call(send) for _ in range(8)))
+
+    assert len(results) == 8
+    assert calls["n"] == 11
+    assert calls["peak"] <= 4
+    # the three 429s of one burst count as a single congestion event, then
+    # successes grow the limit back
+    assert int(min(limits)) == 2
+    assert limiter.limit == 4
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limiter_does_not_retry_other_errors():
+    limiter = AdaptiveLimiter(backoff=0.01)
+
+    async def send():
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        await limiter.call(send)
+    assert limiter.in_flight == 0
@@ -0,0 +1,107 @@
+# tests/test_llm/test_streaming.py
+from types import SimpleNamespace
+
+import pytest
+
+from langops.llm.adapters import (
+    AnthropicAdapter2,
+    LLMOutputBudgetExceeded,
+    StreamAssembler,
+)
+from langops.persistence.models.sentence import SentenceSentimentResponseModel
+
+
+class _FakeStream:
+    """Raw Anthropic stream events for one forced tool call."""
+
+    def __init__(self, chunks: list[str], output_tokens: int | None = None) -> None:
+        usage = SimpleNamespace(input_tokens=40, output_tokens=1)
+        message = SimpleNamespace(id="msg_1", model="claude-sonnet-4", usage=usage)
+        self.events = [SimpleNamespace(type="message_start", message=message)]
+        self.events += [
+            SimpleNamespace(
+                type="content_block_delta",
+                delta=SimpleNamespace(type="input_json_delta", partial_json=chunk),
+            )
+            for chunk in chunks
+        ]
+        if output_tokens is not None:
+            self.events += [
+                SimpleNamespace(type="content_block_stop"),
+                SimpleNamespace(
+                    type="message_delta",
+                    delta=SimpleNamespace(stop_reason="tool_use"),
+                    usage=SimpleNamespace(output_tokens=output_tokens),
+                ),
+                SimpleNamespace(type="message_stop"),
+            ]
+        self.consumed = 0
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.consumed == len(self.events):
+            raise StopAsyncIteration
+        self.consumed += 1
+        return self.events[self.consumed - 1]
+
+    async def close(self):
+        self.closed = True
+
+
+_CHUNKS = ['{"sentiment": "pos', 'itive", "sentiment_', 'confidence": 0.9}']
+_PARSED = {"sentiment": "positive", "sentiment_confidence": 0.9}
+
+
+async def _send_stream(monkeypatch, stream: _FakeStream) -> dict:
+    adapter = AnthropicAdapter2(model="claude-sonnet-4", api_key="test")
+
+    async def create(**params):
+        assert params["stream"] is True
+        return stream
+
+    monkeypatch.setattr(adapter._online.messages, "create", create)
+    try:
+        return await adapter.send_stream(
+            messages=[{"role": "user", "content": "Great."}],
+            response_model=SentenceSentimentResponseModel,
+        )
+    finally:
+        await adapter.aclose()
+
+
+@pytest.mark.asyncio
+async def test_stream_reads_final_usage_after_parsed_json(monkeypatch):
+    stream = _FakeStream(_CHUNKS, output_tokens=17)
+    response = await _send_stream(monkeypatch, stream)
+
+    assert response["content"] == _PARSED
+    assert response["stop_reason"] == "tool_use"
+    assert response["usage"]["output_tokens"] == 17
+    assert "output_tokens_estimated" not in response["usage"]
+    assert response["timing"]["ttft_s"] is not None
+    assert stream.consumed == len(stream.events)
+
+
+@pytest.mark.asyncio
+async def test_stream_cuts_output_past_the_object_and_estimates(monkeypatch):
+    stream = _FakeStream([*_CHUNKS, " trailing", " more"])
+    response = await _send_stream(monkeypatch, stream)
+
+    assert response["content"] == _PARSED
+    assert response["stop_reason"] == "parsed"
+    # the first extra chunk ends the stream, the rest is never read
+    assert stream.consumed == 5
+    assert stream.closed
+    usage = response["usage"]
+    assert usage["output_tokens_estimated"] is True
+    assert usage["output_tokens"] == -(-len("".join(_CHUNKS)) // 4)
+
+
+def test_assembler_enforces_output_budget():
+    assembler = StreamAssembler(max_output_tokens=2)
+    assembler.feed("abcd")
+    with pytest.raises(LLMOutputBudgetExceeded):
+        assembler.feed("efghijkl")
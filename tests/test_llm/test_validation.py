@@ -0,0 +1,42 @@
+# tests/test_llm/test_validation.py
+import pytest
+
+from langops.hooks.payload import LLMHookPayload
+from langops.llm.client import LLMClient, LLMResponseNotJSON
+from langops.llm.validation import get_validator
+from langops.persistence.models.sentence import SentenceSentimentResponseModel
+
+TEXT = '{"sentiment": "negative", "sentiment_confidence": 0.7}'
+
+
+def _payload() -> LLMHookPayload:
+    return LLMHookPayload(
+        prompt="p",
+        messages=[{"role": "user", "content": "p"}],
+        llm_output_model=SentenceSentimentResponseModel,
+    )
+
+
+def test_validator_is_cached_and_accepts_text_and_dict():
+    validator = get_validator(SentenceSentimentResponseModel)
+    assert get_validator(SentenceSentimentResponseModel) is validator
+
+    from_text = validator.validate(TEXT)
+    from_dict = validator.validate(from_text.model_dump())
+    assert from_text == from_dict
+    assert from_text.sentiment.value == "negative"
+
+
+@pytest.mark.asyncio
+async def test_client_validates_once_for_all_content_shapes():
+    client = LLMClient(adapter=None)
+    blocks = {"content": [{"type": "text", "text": TEXT}], "model": "m"}
+    tool_use = {"content": {"sentiment": "neutral", "sentiment_confidence": 0.5}}
+
+    payload = await client._apply_response(_payload(), blocks, cache_key=None)
+    assert payload.response_llm_instance.sentiment.value == "negative"
+    payload = await client._apply_response(_payload(), tool_use, cache_key=None)
+    assert payload.response_llm_parsed == tool_use["content"]
+
+    with pytest.raises(LLMResponseNotJSON):
+        await client._apply_response(_payload(), {"content": 42}, cache_key=None)
@@ -0,0 +1,87 @@
+# tests/test_persistence/test_sentence_repo.py
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import sqlite
+
+from langops.persistence.models.document import DocumentEntity, DocumentType
+from langops.persistence.models.sentence import SentenceEntity
+from langops.persistence.repository.sentence_repo import SentenceRepository
+from langops.persistence.repository.work_queue_repo import WorkQueueRepository
+
+
+async def _add_document(session, content: str) -> int:
+    doc = DocumentEntity(title="t", content=content, doc_type=DocumentType.OTHER)
+    session.add(doc)
+    await session.flush()
+    return doc.id
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_sentences_dedupes_within_document(test_session):
+    doc_id = await _add_document(test_session, "A. B. A.")
+    repo = SentenceRepository()
+
+    inserted = await repo.bulk_insert_sentences(
+        test_session, doc_id, ["A.", "B.", "A."], chunk_size=1
+    )
+    assert inserted == 2
+
+    # re-running the split for the same document adds only new sentences
+    inserted = await repo.bulk_insert_sentences(test_session, doc_id, ["B.", "C."])
+    assert inserted == 1
+
+    count = await test_session.exec(select(func.count()).select_from(SentenceEntity))
+    assert count.scalar_one() == 3
+    assert await repo.get_text_hashes(test_session, doc_id) == {
+        repo.compute_hash(t) for t in ("A.", "B.", "C.")
+    }
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_sentences_enqueues_only_its_own_rows(
+    test_session, monkeypatch
+):
+    doc_id = await _add_document(test_session, "A. B. C. D.")
+    repo = SentenceRepository()
+    enqueued = []
+    enqueue_select = WorkQueueRepository.enqueue_select
+
+    async def spy(self, session, queue, ref_ids):
+        enqueued.append((await session.exec(ref_ids)).all())
+        return await enqueue_select(self, session, queue, ref_ids)
+
+    monkeypatch.setattr(WorkQueueRepository, "enqueue_select", spy)
+    # the splitter streams a long document in chunks
+    await repo.bulk_insert_sentences(test_session, doc_id, ["A.", "B."])
+    await repo.bulk_insert_sentences(test_session, doc_id, ["C.", "D."])
+
+    first, second = enqueued
+    assert len(first) == 2 and len(second) == 2
+    assert min(second) > max(first)
+
+
+@pytest.mark.asyncio
+async def test_iter_unprocessed_streams_pages_in_id_order(test_session):
+    doc_ids = [await _add_document(test_session, f"doc {i}") for i in range(7)]
+    repo = SentenceRepository()
+    # documents 2 and 5 already have sentences
+    for doc_id in (doc_ids[2], doc_ids[5]):
+        await repo.bulk_insert_sentences(test_session, doc_id, ["Done."])
+
+    pages = [
+        [doc.id for doc in page]
+        async for page in repo.iter_unprocessed(test_session, page_size=2)
+    ]
+
+    assert pages == [
+        [doc_ids[0], doc_ids[1]],
+        [doc_ids[3], doc_ids[4]],
+        [doc_ids[6]],
+    ]
+
+    sql = repo._unprocessed_stmt(2, after_id=3).compile(
+        dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    plan = await test_session.exec(text(f"EXPLAIN QUERY PLAN {sql}"))
+    # anti-join probes the fk index instead of scanning sentences
+    assert any("ix_sentences_doc_id" in row[-1] for row in plan.all())
@@ -0,0 +1,80 @@
+# tests/test_persistence/test_sentence_sentiment_repo.py
+import pytest
+from sqlalchemy import select
+
+from langops.persistence.models.document import DocumentEntity, DocumentType
+from langops.persistence.models.sentence import (
+    SentenceSentimentEntity,
+    SentenceSentimentResponseModel,
+    SentimentLabel,
+)
+from langops.persistence.repository.sentence_repo import SentenceRepository
+from langops.persistence.repository.sentence_sentiment_repo import (
+    SentenceSentimentRepository,
+)
+
+
+def _result(label: SentimentLabel, confidence: float = 0.9):
+    return SentenceSentimentResponseModel(
+        sentiment=label, sentiment_confidence=confidence
+    )
+
+
+async def _rows(session) -> dict[int, SentenceSentimentEntity]:
+    result = await session.exec(select(SentenceSentimentEntity))
+    return {row.sentence_id: row for row in result.scalars().all()}
+
+
+@pytest.mark.asyncio
+async def test_upsert_many_respects_override_and_stale_hashes(test_session):
+    doc = DocumentEntity(title="t", content="-", doc_type=DocumentType.OTHER)
+    test_session.add(doc)
+    await test_session.flush()
+    await SentenceRepository().bulk_insert_sentences(
+        test_session, doc.id, ["Good.", "Bad.", "Meh."]
+    )
+    repo = SentenceSentimentRepository()
+    h = repo.compute_hash
+    good, bad, meh = 1, 2, 3
+
+    stats = await repo.upsert_many(
+        test_session,
+        [
+            (good, h("Good."), _result(SentimentLabel.POSITIVE)),
+            (bad, h("Bad."), _result(SentimentLabel.NEGATIVE)),
+            (meh, h("old text"), _result(SentimentLabel.NEUTRAL)),
+        ],
+    )
+    assert stats == {"created": 2, "updated": 0, "skipped": 0, "stale": 1}
+
+    # without override, filled rows are kept
+    stats = await repo.upsert_many(
+        test_session, [(good, h("Good."), _result(SentimentLabel.NEGATIVE))]
+    )
+    assert stats["skipped"] == 1
+
+    # override rewrites and counts the call in SQL
+    stats = await repo.upsert_many(
+        test_session,
+        [(bad, h("Bad."), _result(SentimentLabel.NEUTRAL, 0.5))],
+        persist_override=True,
+    )
+    assert stats["updated"] == 1
+
+    # an empty sentiment row is filled without override (semantic override)
+    test_session.add(SentenceSentimentEntity(sentence_id=meh, sentiment=None))
+    await test_session.flush()
+    stats = await repo.upsert_many(
+        test_session, [(meh, h("Meh."), _result(SentimentLabel.NEUTRAL))]
+    )
+    assert stats["updated"] == 1
+
+    test_session.expire_all()
+    rows = await _rows(test_session)
+    assert set(rows) == {good, bad, meh}
+    assert rows[meh].sentiment == SentimentLabel.NEUTRAL
+    assert rows[good].sentiment == SentimentLabel.POSITIVE
+    assert rows[good].sentiment_calls == 1
+    assert rows[bad].sentiment == SentimentLabel.NEUTRAL
+    assert rows[bad].sentiment_confidence == 0.5
+    assert rows[bad].sentiment_calls == 2
@@ -0,0 +1,126 @@
+# tests/test_persistence/test_work_queue_repo.py
+import pytest
+from sqlalchemy import delete
+
+from langops.persistence.models.document import DocumentEntity, DocumentType
+from langops.persistence.models.sentence import (
+    SentenceSentimentResponseModel,
+    SentimentLabel,
+)
+from langops.persistence.models.work_queue import WorkItemEntity
+from langops.persistence.repository.sentence_repo import SentenceRepository
+from langops.persistence.repository.sentence_sentiment_repo import (
+    SentenceSentimentRepository,
+)
+from langops.persistence.repository.work_queue_repo import (
+    SENTIMENT_QUEUE,
+    WorkQueueRepository,
+)
+
+Q = SENTIMENT_QUEUE
+
+
+@pytest.mark.asyncio
+async def test_claim_ack_release_and_lease_expiry(test_session):
+    doc = DocumentEntity(title="t", content="-", doc_type=DocumentType.OTHER)
+    test_session.add(doc)
+    await test_session.flush()
+    # inserting sentences enqueues them
+    await SentenceRepository().bulk_insert_sentences(
+        test_session, doc.id, [f"S{i}." for i in range(5)]
+    )
+    queue = WorkQueueRepository()
+    assert (await queue.counts(test_session, Q))["pending"] == 5
+    # re-enqueueing and backfilling are no-ops for queued ids
+    assert await queue.enqueue(test_session, Q, [1, 2]) == 0
+    assert await queue.backfill(test_session, Q, SentenceSentimentRepository) == 0
+
+    a = await queue.claim(test_session, Q, "worker-a", limit=3)
+    # worker-b's lease is expired on arrival, as if it had died mid-page
+    b = await queue.claim(test_session, Q, "worker-b", limit=3, lease_seconds=-1)
+    assert a == [1, 2, 3]
+    assert b == [4, 5]
+
+    # only the lease holder can ack
+    assert await queue.ack(test_session, Q, a, "worker-b") == 0
+    assert await queue.ack(test_session, Q, a[:2], "worker-a") == 2
+    assert await queue.release(test_session, Q, [3], "worker-a", error="boom") == 1
+
+    # the released item and worker-b's expired leases are claimable again
+    assert await queue.claim(test_session, Q, "worker-c", limit=10) == [3, 4, 5]
+    assert await queue.ack(test_session, Q, b, "worker-b") == 0
+
+    counts = await queue.counts(test_session, Q)
+    assert counts == {"pending": 0, "claimed": 3, "done": 2, "failed": 0}
+
+    # out of attempts: released items fail instead of returning to pending
+    assert (
+        await queue.release(
+            test_session, Q, [3], "worker-c", error="boom", max_attempts=2
+        )
+        == 1
+    )
+    assert (await queue.counts(test_session, Q))["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_watermark_tracks_claimable_work(test_session):
+    queue = WorkQueueRepository()
+    assert await queue.watermark(test_session, Q) == (0, False)
+
+    await queue.enqueue(test_session, Q, [10, 11])
+    max_id, has_open = await queue.watermark(test_session, Q)
+    assert has_open and max_id == await queue.get_max_id(test_session)
+
+    # leased items are not claimable until released or expired
+    claimed = await queue.claim(test_session, Q, "worker", limit=10)
+    assert await queue.watermark(test_session, Q) == (max_id, False)
+    await queue.release(test_session, Q, claimed, "worker", error="boom")
+    assert await queue.watermark(test_session, Q) == (max_id, True)
+
+    claimed = await queue.claim(test_session, Q, "worker", limit=10)
+    await queue.ack(test_session, Q, claimed, "worker")
+    assert await queue.watermark(test_session, Q) == (max_id, False)
+
+
+@pytest.mark.asyncio
+async def test_claim_within_shard_range(test_session):
+    queue = WorkQueueRepository()
+    await queue.enqueue(test_session, Q, list(range(1, 11)))
+    assert await queue.open_ref_bounds(test_session, Q) == (1, 10)
+
+    shard = await queue.claim(test_session, Q, "w", limit=100, ref_range=(4, 7))
+    assert shard == [4, 5, 6]
+
+
+@pytest.mark.asyncio
+async def test_backfill_once_seeds_a_pre_queue_backlog(test_session):
+    doc = DocumentEntity(title="t", content="-", doc_type=DocumentType.OTHER)
+    test_session.add(doc)
+    await test_session.flush()
+    await SentenceRepository().bulk_insert_sentences(
+        test_session, doc.id, ["A.", "B.", "C."]
+    )
+    # sentences stored before the queue existed
+    await test_session.execute(delete(WorkItemEntity))
+    repo = SentenceSentimentRepository()
+    await repo.upsert_many(
+        test_session,
+        [
+            (
+                1,
+                repo.compute_hash("A."),
+                SentenceSentimentResponseModel(
+                    sentiment=SentimentLabel.POSITIVE, sentiment_confidence=0.9
+                ),
+            )
+        ],
+    )
+
+    queue = WorkQueueRepository()
+    assert await queue.backfill_once(test_session, Q, SentenceSentimentRepository) == 2
+    assert (
+        await queue.backfill_once(test_session, Q, SentenceSentimentRepository) is None
+    )
+    assert (await queue.counts(test_session, Q))["pending"] == 2
+    assert await repo.analysed_ids(test_session, [1, 2, 3]) == {1}
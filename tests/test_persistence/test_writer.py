@@ -0,0 +1,50 @@
+# tests/test_persistence/test_writer.py
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+from langops.persistence.models.document import DocumentEntity, DocumentType
+from langops.persistence.writer import WriteBehindWriter
+
+
+def _add(title: str):
+    async def write(session):
+        doc = DocumentEntity(title=title, content=title, doc_type=DocumentType.OTHER)
+        session.add(doc)
+        await session.flush()
+        if title == "bad":
+            raise ValueError("rejected")
+        return doc.id
+
+    return write
+
+
+@pytest.mark.asyncio
+async def test_writer_group_commits_and_isolates_failures(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'w.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    writer = WriteBehindWriter(engine, max_rows=100, max_delay=0.05)
+
+    ids = await asyncio.gather(*(writer.submit(_add(f"d{i}")) for i in range(40)))
+    assert sorted(ids) == list(range(1, 41))
+    assert writer.stats.commits < 5
+
+    results = await asyncio.gather(
+        writer.submit(_add("ok1")),
+        writer.submit(_add("bad")),
+        writer.submit(_add("ok2")),
+        return_exceptions=True,
+    )
+    assert isinstance(results[1], ValueError)
+    assert all(isinstance(r, int) for r in (results[0], results[2]))
+    assert writer.stats.replayed_groups == 1
+
+    await writer.aclose()
+    async with engine.connect() as conn:
+        count = await conn.execute(select(func.count()).select_from(DocumentEntity))
+    assert count.scalar_one() == 42
+    await engine.dispose()
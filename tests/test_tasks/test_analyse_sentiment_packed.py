@@ -0,0 +1,61 @@
+# tests/test_tasks/test_analyse_sentiment_packed.py
+from types import SimpleNamespace
+
+import pytest
+
+from langops.persistence.models.sentence import (
+    SentenceEntity,
+    SentenceSentimentBatchResponseModel,
+    SentenceSentimentResponseModel,
+)
+from langops.tasks import analyse_sentiment_sentence as task
+
+
+def _sentences(*texts: str) -> list[SentenceEntity]:
+    return [SentenceEntity(id=i, text=t, text_hash=t) for i, t in enumerate(texts, 1)]
+
+
+def test_pack_sentences_respects_item_and_token_budget():
+    sentences = _sentences("a" * 40, "b" * 40, "c" * 40, "d" * 400, "e" * 40)
+
+    packs = task.pack_sentences(sentences, max_items=2, max_tokens=50)
+
+    assert [[s.id for s in pack] for pack in packs] == [[1, 2], [3], [4], [5]]
+
+
+@pytest.mark.asyncio
+async def test_packed_results_map_by_position_and_fall_back(monkeypatch):
+    sentences = _sentences("Great.", "Awful.", "Fine.")
+    prompts = []
+
+    async def fake_run(self, user_role, prompt, **kwargs):
+        prompts.append(prompt)
+        # answered out of order, sentence 2 dropped
+        instance = SentenceSentimentBatchResponseModel.model_validate(
+            {
+                "items": [
+                    {"n": 3, "sentiment": "neutral", "sentiment_confidence": 0.6},
+                    {"n": 1, "sentiment": "positive", "sentiment_confidence": 0.9},
+                ]
+            }
+        )
+        return SimpleNamespace(response_llm_instance=instance)
+
+    async def fake_single(text, **kwargs):
+        assert kwargs["sentence_id"] == 2
+        model = SentenceSentimentResponseModel(
+            sentiment="negative", sentiment_confidence=0.8
+        )
+        return model, "created"
+
+    monkeypatch.setattr(task.GenericLLMTask, "run", fake_run)
+    monkeypatch.setattr(task, "run_sentiment_analysis", fake_single)
+
+    results = await task.run_sentiment_analysis_packed(sentences)
+
+    assert len(prompts) == 1
+    assert [model.sentiment.value for model, _ in results] == [
+        "positive",
+        "negative",
+        "neutral",
+    ]
@@ -0,0 +1,90 @@
+# tests/test_tasks/test_analyse_sentiment_queue.py
+import pytest
+import pytest_asyncio
+from sqlmodel import SQLModel
+
+from config import settings
+from langops.persistence import session as db_session
+from langops.persistence.models.document import DocumentEntity, DocumentType
+from langops.persistence.models.sentence import (
+    SentenceSentimentResponseModel,
+    SentimentLabel,
+)
+from langops.persistence.repository.sentence_repo import SentenceRepository
+from langops.persistence.repository.sentence_sentiment_repo import (
+    SentenceSentimentRepository,
+)
+from langops.persistence.repository.work_queue_repo import (
+    SENTIMENT_QUEUE,
+    WorkQueueRepository,
+)
+from langops.persistence.writer import close_writer
+from langops.tasks import analyse_sentiment_sentence as task
+
+POSITIVE = SentenceSentimentResponseModel(
+    sentiment=SentimentLabel.POSITIVE, sentiment_confidence=0.9
+)
+
+
+@pytest_asyncio.fixture
+async def app_db(tmp_path, monkeypatch):
+    """The module-level engine and writer, on a scratch SQLite file."""
+    monkeypatch.setattr(
+        settings, "database_url", f"sqlite+aiosqlite:///{tmp_path / 'app.db'}"
+    )
+    async with db_session.get_engine().begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    async with db_session.get_async_session() as session:
+        doc = DocumentEntity(title="t", content="-", doc_type=DocumentType.OTHER)
+        session.add(doc)
+        await session.flush()
+        await SentenceRepository().bulk_insert_sentences(
+            session, doc.id, ["Good.", "Old.", "New."]
+        )
+    yield
+    await close_writer()
+    await db_session.dispose_engine()
+
+
+async def _counts() -> dict[str, int]:
+    async with db_session.get_async_session() as session:
+        return await WorkQueueRepository().counts(session, SENTIMENT_QUEUE)
+
+
+@pytest.mark.asyncio
+async def test_queue_mode_acks_already_analysed_sentences(app_db, monkeypatch):
+    repo = SentenceSentimentRepository()
+    async with db_session.get_async_session() as session:
+        # analysed through the CLI after it was enqueued
+        await repo.upsert_many(session, [(2, repo.compute_hash("Old."), POSITIVE)])
+
+    sent = []
+
+    async def fake_run(text, **kwargs):
+        sent.append(text)
+        return POSITIVE, "created"
+
+    monkeypatch.setattr(task, "run_sentiment_analysis", fake_run)
+    stats = await task.analyse_unprocessed_sentences(page_size=10)
+
+    assert sent == ["Good.", "New."]
+    assert stats["analysed"] == 2 and stats["skipped"] == 1
+    assert (await _counts())["done"] == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_page_releases_its_claims(app_db, monkeypatch):
+    async def fake_run(text, **kwargs):
+        return POSITIVE, "created"
+
+    async def broken_upsert(self, session, items):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(task, "run_sentiment_analysis", fake_run)
+    monkeypatch.setattr(SentenceSentimentRepository, "upsert_many", broken_upsert)
+    with pytest.raises(RuntimeError):
+        await task.analyse_unprocessed_sentences(page_size=10)
+
+    # a retry, under a new worker id, can claim the page right away
+    counts = await _counts()
+    assert counts["pending"] == 3 and counts["claimed"] == 0
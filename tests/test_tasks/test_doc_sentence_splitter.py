@@ -0,0 +1,30 @@
+# tests/test_tasks/test_doc_sentence_splitter.py
+import pytest
+
+from langops.tasks.doc_sentence_splitter import (
+    SegmentationService,
+    _split_regex,
+    iter_text_chunks,
+)
+
+TEXT = "\n".join(
+    f"Sentence {i} ends here. Another one follows! Is it {i}?" for i in range(300)
+)
+
+
+def test_chunks_cover_text_and_end_on_boundaries():
+    chunks = list(iter_text_chunks(TEXT, max_chars=500))
+    assert "".join(chunks) == TEXT
+    assert all(len(c) <= 500 for c in chunks)
+    assert all(c[-1] in " \n" for c in chunks[:-1])
+
+
+@pytest.mark.asyncio
+async def test_pool_split_matches_inline_regex():
+    with SegmentationService(max_workers=2, chunk_chars=1_000, inline_chars=0) as svc:
+        streamed = [chunk async for chunk in svc.stream(TEXT)]
+        many = await svc.split_many([TEXT, "One. Two."])
+
+    assert len(streamed) > 1
+    assert [s for chunk in streamed for s in chunk] == _split_regex(TEXT)
+    assert many == [_split_regex(TEXT), ["One.", "Two."]]
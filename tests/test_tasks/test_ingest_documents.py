@@ -0,0 +1,43 @@
+# tests/test_tasks/test_ingest_documents.py
+import json
+
+import pytest
+from langops.persistence.models.document import DocumentEntity
+from langops.tasks import ingest_documents as ingest
+from sqlalchemy import func, select
+
+
+@pytest.mark.asyncio
+async def test_ingest_directory_and_jsonl_skips_duplicates(
+    tmp_path, test_session, monkeypatch
+):
+    async def _run_write(fn, rows=1):
+        return await fn(test_session)
+
+    monkeypatch.setattr(ingest, "run_write", _run_write)
+
+    docs_dir = tmp_path / "docs"
+    docs_dir.mkdir()
+    for i in range(3):
+        doc = {"title": f"t{i}", "content": f"content {i}", "doc_type": "report"}
+        (docs_dir / f"{i}.json").write_text(json.dumps(doc))
+    (docs_dir / "broken.json").write_text("{not json")
+
+    jsonl = tmp_path / "more.jsonl"
+    jsonl.write_text(
+        "\n".join(
+            json.dumps({"title": "x", "content": c})
+            for c in ("content 0", "content 9", "content 9")
+        )
+    )
+
+    stats = await ingest.ingest_documents(
+        [docs_dir, jsonl], chunk_size=2, max_workers=1
+    )
+
+    assert stats["seen"] == 7
+    assert stats["inserted"] == 4
+    assert stats["duplicates"] == 2
+    assert stats["failed"] == 1
+    count = await test_session.exec(select(func.count()).select_from(DocumentEntity))
+    assert count.scalar_one() == 4